@@ -0,0 +1,139 @@
+"""
+Benchmarks of the drawing of a colorbar across its configurations: orientation,
+tick location, size of the colormap, norm, label and output format.
+"""
+
+# Standard library modules.
+import io
+
+# Third party modules.
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import matplotlib.colors
+
+import numpy as np
+
+# Local modules.
+from matplotlib_colorbar.colorbar import Colorbar
+from matplotlib_colorbar import text, ticker
+
+# Globals and constants variables.
+
+NORMS = {
+    "linear": lambda: matplotlib.colors.Normalize(vmin=0.0, vmax=1000.0),
+    "log": lambda: matplotlib.colors.LogNorm(vmin=1.0, vmax=1000.0),
+    "boundary": lambda: matplotlib.colors.BoundaryNorm([0, 1, 10, 100, 1000], 256),
+}
+
+TICKLOCATIONS = {
+    "horizontal": ["auto", "bottom", "top"],
+    "vertical": ["auto", "left", "right"],
+}
+
+NCOLORS = [8, 256, 65536]
+
+#: File format of each backend
+FORMATS = {"agg": "png", "pdf": "pdf", "svg": "svg"}
+
+
+def _create_figure(orientation, ticklocation, ncolors, norm, label):
+    if ticklocation not in TICKLOCATIONS[orientation]:
+        raise NotImplementedError  # skipped
+    if norm == "boundary" and ncolors > 32767:
+        raise NotImplementedError  # colors indexed by 16-bit integers
+
+    figure, ax = plt.subplots()
+    data = np.random.RandomState(0).uniform(1.0, 1000.0, (16, 16))
+    cmap = plt.get_cmap("viridis", ncolors)
+    mappable = ax.imshow(data, norm=NORMS[norm](), cmap=cmap)
+
+    colorbar = Colorbar(
+        mappable,
+        orientation=orientation,
+        ticklocation=ticklocation,
+        label="Intensity" if label else None,
+        length_fraction=0.8,
+    )
+    ax.add_artist(colorbar)
+    return figure, colorbar
+
+
+class DrawSuite:
+    """
+    Draw of a colorbar, with its geometry cached or recomputed.
+    """
+
+    params = (
+        list(TICKLOCATIONS),
+        ["auto", "left", "right", "bottom", "top"],
+        NCOLORS,
+        list(NORMS),
+        [False, True],
+    )
+    param_names = ["orientation", "ticklocation", "ncolors", "norm", "label"]
+
+    def setup(self, *args):
+        self.figure, self.colorbar = _create_figure(*args)
+        self.figure.canvas.draw()
+        self.renderer = self.figure.canvas.get_renderer()
+
+    def teardown(self, *args):
+        plt.close(self.figure)
+
+    def time_draw(self, *args):
+        self.colorbar.draw(self.renderer)
+
+    def time_draw_invalidated(self, *args):
+        ticker.clear_cache()
+        text.clear_cache()
+        self.colorbar.invalidate()
+        self.colorbar.draw(self.renderer)
+
+    def time_calculate_colorbar(self, *args):
+        ticker.clear_cache()
+        self.colorbar._calculate_colorbar(0.8, self.colorbar.mappable)
+
+    def peakmem_draw_invalidated(self, *args):
+        self.time_draw_invalidated(*args)
+
+
+class SavefigSuite:
+    """
+    Export of a figure with a colorbar, by the Agg, PDF and SVG backends.
+    """
+
+    params = (list(FORMATS), list(TICKLOCATIONS), NCOLORS, list(NORMS), [False, True])
+    param_names = ["backend", "orientation", "ncolors", "norm", "label"]
+
+    def setup(self, backend, orientation, ncolors, norm, label):
+        self.figure, _colorbar = _create_figure(
+            orientation, "auto", ncolors, norm, label
+        )
+        self.format = FORMATS[backend]
+
+    def teardown(self, *args):
+        plt.close(self.figure)
+
+    def time_savefig(self, *args):
+        self.figure.savefig(io.BytesIO(), format=self.format)
+
+    def peakmem_savefig(self, *args):
+        self.figure.savefig(io.BytesIO(), format=self.format)
+
+
+class ImportSuite:
+    """
+    Import of the colorbar artist in a new interpreter, with and without
+    matplotlib already imported.
+    """
+
+    def timeraw_import(self):
+        return "from matplotlib_colorbar.colorbar import Colorbar"
+
+    def timeraw_import_after_matplotlib(self):
+        code = "from matplotlib_colorbar.colorbar import Colorbar"
+        setup = "import matplotlib; matplotlib.use('Agg'); import matplotlib.pyplot"
+        return code, setup
@@ -0,0 +1,56 @@
+"""
+Benchmarks of the export of figures with colorbars in several formats.
+"""
+
+# Standard library modules.
+import io
+
+# Third party modules.
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import matplotlib.colors
+
+import numpy as np
+
+# Local modules.
+from matplotlib_colorbar.colorbar import Colorbar
+
+# Globals and constants variables.
+
+#: Formats and resolutions of an export job
+EXPORTS = [("png", 100), ("png", 200), ("png", 300), ("pdf", 100), ("svg", 100)]
+
+NORMS = [
+    lambda: matplotlib.colors.Normalize(vmin=0.0, vmax=1.0),
+    lambda: matplotlib.colors.LogNorm(vmin=1e-3, vmax=1e4),
+    lambda: matplotlib.colors.SymLogNorm(1.0, vmin=-1e3, vmax=1e3),
+    lambda: matplotlib.colors.PowerNorm(0.5, vmin=0.0, vmax=1.0),
+]
+
+
+class ExportSuite:
+    """
+    Export of a figure with colorbars as PNG at three resolutions, PDF and SVG.
+    """
+
+    params = [1, 4]
+    param_names = ["grid"]
+
+    def setup(self, grid):
+        self.figure, axes = plt.subplots(grid, grid, figsize=(8, 8), squeeze=False)
+        data = np.random.RandomState(0).uniform(1e-3, 1.0, (16, 16))
+
+        for i, ax in enumerate(axes.flat):
+            mappable = ax.imshow(data, norm=NORMS[i % len(NORMS)]())
+            colorbar = Colorbar(mappable, label=r"Intensity ($\mu$A)")
+            ax.add_artist(colorbar)
+
+    def teardown(self, grid):
+        plt.close(self.figure)
+
+    def time_export(self, grid):
+        for format, dpi in EXPORTS:
+            self.figure.savefig(io.BytesIO(), format=format, dpi=dpi)
@@ -0,0 +1,85 @@
+"""
+Benchmarks of the interactive control of colorbars, replaying mouse events.
+"""
+
+# Standard library modules.
+import time
+
+# Third party modules.
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+from matplotlib.backend_bases import MouseEvent
+
+import numpy as np
+
+# Local modules.
+from matplotlib_colorbar.colorbar import Colorbar
+from matplotlib_colorbar.interactive import ClimDragger
+
+# Globals and constants variables.
+
+NFRAMES = 30
+
+
+class ClimDragSuite:
+    """
+    Drag of the maximum of a colorbar over a large image, one frame per
+    mouse event.
+    """
+
+    params = [1024, 4096]
+    param_names = ["size"]
+    timeout = 300
+
+    def setup(self, size):
+        self.figure, ax = plt.subplots(figsize=(8, 8))
+        data = np.random.RandomState(0).uniform(0.0, 1.0, (size, size))
+        mappable = ax.imshow(data)
+
+        self.colorbar = Colorbar(mappable, length_fraction=0.8)
+        ax.add_artist(self.colorbar)
+
+        self.dragger = ClimDragger(self.colorbar, max_fps=None)
+        self.dragger.connect()
+
+    def teardown(self, size):
+        self.dragger.disconnect()
+        plt.close(self.figure)
+
+    def _replay(self):
+        # Reset the limits, which moves the bar as its tick labels change
+        self.colorbar.mappable.set_clim(0.0, 1.0)
+        canvas = self.figure.canvas
+        canvas.draw()
+
+        x0, y0, x1, y1 = self.colorbar._hit_cache["bar_extent"]
+        xm = (x0 + x1) / 2
+        ys = np.linspace(y1 - 2, (y0 + y1) / 2, NFRAMES)
+
+        press = MouseEvent("button_press_event", canvas, xm, y1 - 1, button=1)
+        motions = [
+            MouseEvent("motion_notify_event", canvas, xm, y, button=1) for y in ys
+        ]
+        release = MouseEvent("button_release_event", canvas, xm, ys[-1], button=1)
+
+        callbacks = canvas.callbacks
+        callbacks.process(press.name, press)
+
+        start = time.perf_counter()
+        for event in motions:
+            callbacks.process(event.name, event)
+        elapsed = time.perf_counter() - start
+
+        callbacks.process(release.name, release)
+        return elapsed
+
+    def time_drag(self, size):
+        self._replay()
+
+    def track_fps(self, size):
+        return NFRAMES / self._replay()
+
+    track_fps.unit = "frames/s"
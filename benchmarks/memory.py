@@ -0,0 +1,55 @@
+"""
+Benchmarks of the memory used by colorbars.
+"""
+
+# Standard library modules.
+import tracemalloc
+
+# Third party modules.
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+
+import numpy as np
+
+# Local modules.
+from matplotlib_colorbar.colorbar import Colorbar
+
+# Globals and constants variables.
+
+COUNT = 2000
+
+
+class MemorySuite:
+    """
+    Memory of thousands of colorbars, as in the panels of a mosaic figure,
+    with the default parameters or a few parameters set.
+    """
+
+    params = [False, True]
+    param_names = ["custom"]
+
+    def setup(self, custom):
+        self.figure, ax = plt.subplots()
+        self.mappable = ax.imshow(np.zeros((3, 3)))
+        self.kwargs = dict(color="w", location="lower left") if custom else {}
+        Colorbar(self.mappable, **self.kwargs)
+
+    def teardown(self, custom):
+        plt.close(self.figure)
+
+    def track_bytes_per_colorbar(self, custom):
+        tracemalloc.start()
+        try:
+            before, _peak = tracemalloc.get_traced_memory()
+            colorbars = [Colorbar(self.mappable, **self.kwargs) for _ in range(COUNT)]
+            after, _peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        del colorbars
+        return (after - before) / COUNT
+
+    track_bytes_per_colorbar.unit = "bytes"
@@ -0,0 +1,64 @@
+"""
+Benchmarks of the hit testing of colorbars.
+"""
+
+# Standard library modules.
+
+# Third party modules.
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+from matplotlib.backend_bases import MouseEvent
+
+import numpy as np
+
+# Local modules.
+from matplotlib_colorbar.colorbar import Colorbar
+
+# Globals and constants variables.
+
+
+class PickingSuite:
+    """
+    Hit testing of mouse events over a grid of small images, each with its
+    own colorbar.
+    """
+
+    params = ([10, 20], [8, 256])
+    param_names = ["grid", "ncolors"]
+
+    def setup(self, grid, ncolors):
+        self.figure, axes = plt.subplots(grid, grid, figsize=(12, 12))
+        data = np.random.RandomState(0).uniform(0.0, 1.0, (16, 16))
+        cmap = plt.get_cmap("viridis", ncolors)
+
+        self.colorbars = []
+        for ax in axes.flat:
+            mappable = ax.imshow(data, cmap=cmap)
+            colorbar = Colorbar(mappable, length_fraction=0.8)
+            colorbar.set_picker(True)
+            ax.add_artist(colorbar)
+            self.colorbars.append(colorbar)
+
+        self.figure.canvas.draw()
+
+        width, height = self.figure.canvas.get_width_height()
+        xys = np.random.RandomState(1).uniform(0, 1, (100, 2)) * [width, height]
+        self.events = [
+            MouseEvent("motion_notify_event", self.figure.canvas, x, y) for x, y in xys
+        ]
+
+    def teardown(self, grid, ncolors):
+        plt.close(self.figure)
+
+    def time_contains(self, grid, ncolors):
+        for event in self.events:
+            for colorbar in self.colorbars:
+                colorbar.contains(event)
+
+    def time_get_value_at(self, grid, ncolors):
+        for event in self.events:
+            for colorbar in self.colorbars:
+                colorbar.get_value_at(event.x, event.y)
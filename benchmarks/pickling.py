@@ -0,0 +1,77 @@
+"""
+Benchmarks of the pickling of colorbars, as sent to worker processes.
+"""
+
+# Standard library modules.
+import pickle
+
+# Third party modules.
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+from matplotlib.artist import Artist
+from matplotlib.cm import ScalarMappable
+
+import numpy as np
+
+# Local modules.
+from matplotlib_colorbar.colorbar import Colorbar
+
+# Globals and constants variables.
+
+
+def _dumps_naive(colorbar):
+    # Whole state of the artist, with its mappable and caches
+    state = Artist.__getstate__(colorbar)
+    state.update((name, getattr(colorbar, name)) for name in Colorbar.__slots__)
+    return pickle.dumps(state)
+
+
+def _loads_naive(data):
+    colorbar = Colorbar.__new__(Colorbar)
+    for name, value in pickle.loads(data).items():
+        object.__setattr__(colorbar, name, value)
+    return colorbar
+
+
+class PickleSuite:
+    """
+    Pickle of a drawn colorbar whose mappable is a :class:`ScalarMappable`
+    outside of the figure, compared to a naive pickle of its whole state.
+    """
+
+    params = ([100, 1000], ["compact", "naive"])
+    param_names = ["size", "method"]
+
+    def setup(self, size, method):
+        self.figure, ax = plt.subplots()
+        data = np.random.RandomState(0).uniform(0.0, 1.0, (size, size))
+        mappable = ScalarMappable(cmap="viridis")
+        mappable.set_array(data)
+
+        self.colorbar = Colorbar(mappable, label="Intensity")
+        ax.add_artist(self.colorbar)
+        self.figure.canvas.draw()
+
+        # Pickled without the figure
+        self.colorbar.remove()
+        self.colorbar.figure = None
+        self.colorbar.axes = None
+
+        if method == "compact":
+            self.dumps, self.loads = pickle.dumps, pickle.loads
+        else:
+            self.dumps, self.loads = _dumps_naive, _loads_naive
+
+    def teardown(self, size, method):
+        plt.close(self.figure)
+
+    def time_roundtrip(self, size, method):
+        self.loads(self.dumps(self.colorbar))
+
+    def track_size(self, size, method):
+        return len(self.dumps(self.colorbar))
+
+    track_size.unit = "bytes"
@@ -0,0 +1,102 @@
+"""
+Benchmarks of the warm-up of worker processes drawing colorbars, with and
+without the shared memory cache.
+"""
+
+# Standard library modules.
+import multiprocessing
+import time
+
+# Third party modules.
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import matplotlib.colors
+
+import numpy as np
+
+# Local modules.
+from matplotlib_colorbar.colorbar import Colorbar
+from matplotlib_colorbar import sharedcache, ticker, text
+
+# Globals and constants variables.
+
+NORMS = [
+    lambda: matplotlib.colors.Normalize(vmin=0.0, vmax=1.0),
+    lambda: matplotlib.colors.LogNorm(vmin=1e-3, vmax=1e4),
+    lambda: matplotlib.colors.BoundaryNorm(np.linspace(0.0, 1.0, 65), 4096),
+    lambda: matplotlib.colors.PowerNorm(0.5, vmin=0.0, vmax=1.0),
+]
+
+
+def _warm_up(cache, queue):
+    sharedcache.set_cache(cache)
+    ticker.clear_cache()
+    text.clear_cache()
+
+    figure, axes = plt.subplots(4, 4, figsize=(8, 8))
+    data = np.random.RandomState(0).uniform(1e-3, 1.0, (16, 16))
+    cmap = plt.get_cmap("viridis", 4096)
+    mappables = [
+        ax.imshow(data, norm=NORMS[i % len(NORMS)](), cmap=cmap)
+        for i, ax in enumerate(axes.flat)
+    ]
+    figure.canvas.draw()
+    renderer = figure.canvas.get_renderer()
+
+    colorbars = []
+    for mappable in mappables:
+        colorbar = Colorbar(mappable)
+        mappable.axes.add_artist(colorbar)
+        colorbars.append(colorbar)
+
+    start = time.process_time()
+    for colorbar in colorbars:
+        colorbar.draw(renderer)
+    queue.put(time.process_time() - start)
+
+    plt.close(figure)
+
+
+class SharedCacheSuite:
+    """
+    Warm-up time summed over the workers, i.e. the CPU time of the first draw
+    of 16 colorbars in each worker.
+    The first worker fills the shared memory cache, before the others start
+    concurrently.
+    """
+
+    params = ([1, 2, 4, 8, 16, 32], [False, True])
+    param_names = ["workers", "shared"]
+    timeout = 300
+
+    def setup(self, workers, shared):
+        methods = multiprocessing.get_all_start_methods()
+        method = "fork" if "fork" in methods else "spawn"
+        self.context = multiprocessing.get_context(method)
+
+    def _run(self, cache, nworkers):
+        queue = self.context.Queue()
+        processes = [
+            self.context.Process(target=_warm_up, args=(cache, queue))
+            for _ in range(nworkers)
+        ]
+        for process in processes:
+            process.start()
+        durations = [queue.get() for _ in processes]
+        for process in processes:
+            process.join()
+        return durations
+
+    def track_warmup(self, workers, shared):
+        cache = sharedcache.SharedCache() if shared else None
+        try:
+            durations = self._run(cache, 1) + self._run(cache, workers - 1)
+        finally:
+            if cache is not None:
+                cache.unlink()
+        return sum(durations) * 1e3
+
+    track_warmup.unit = "ms"
@@ -0,0 +1,65 @@
+"""
+Benchmarks of the light and dark themes of colorbars.
+"""
+
+# Standard library modules.
+
+# Third party modules.
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+
+import numpy as np
+
+# Local modules.
+from matplotlib_colorbar.colorbar import Colorbar
+
+# Globals and constants variables.
+
+LIGHT = dict(color="k", box_color="w", box_alpha=1.0)
+DARK = dict(color="w", box_color="k", box_alpha=0.8)
+
+
+class ThemeSuite:
+    """
+    Draw of new colorbars in a light and a dark theme, either as theme
+    variants of one colorbar or as two independent colorbars.
+    """
+
+    params = ([2, 4], [256, 4096])
+    param_names = ["grid", "ncolors"]
+
+    def setup(self, grid, ncolors):
+        self.figure, axes = plt.subplots(grid, grid, figsize=(8, 8), squeeze=False)
+        data = np.random.RandomState(0).uniform(0.0, 1.0, (16, 16))
+        cmap = plt.get_cmap("viridis", ncolors)
+
+        self.mappables = [ax.imshow(data, cmap=cmap) for ax in axes.flat]
+
+        self.figure.canvas.draw()
+        self.renderer = self.figure.canvas.get_renderer()
+
+    def teardown(self, grid, ncolors):
+        plt.close(self.figure)
+
+    def _add_colorbar(self, mappable, **kwargs):
+        colorbar = Colorbar(mappable, label="Intensity", **kwargs)
+        mappable.axes.add_artist(colorbar)
+        return colorbar
+
+    def time_theme_variants(self, grid, ncolors):
+        for mappable in self.mappables:
+            colorbar = self._add_colorbar(mappable, **LIGHT)
+            colorbar.draw(self.renderer)
+            with colorbar.theme(**DARK):
+                colorbar.draw(self.renderer)
+            colorbar.remove()
+
+    def time_independent_colorbars(self, grid, ncolors):
+        for mappable in self.mappables:
+            for theme in [LIGHT, DARK]:
+                colorbar = self._add_colorbar(mappable, **theme)
+                colorbar.draw(self.renderer)
+                colorbar.remove()
@@ -0,0 +1,73 @@
+"""
+Benchmarks of the drawing of independent figures with colorbars in a pool of
+threads.
+"""
+
+# Standard library modules.
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Third party modules.
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.colors
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+import numpy as np
+
+# Local modules.
+from matplotlib_colorbar.colorbar import Colorbar
+
+# Globals and constants variables.
+
+COUNT = 32
+
+
+def _create_figure(index):
+    figure = Figure(figsize=(3, 2), dpi=72)
+    FigureCanvasAgg(figure)
+    ax = figure.add_subplot(111)
+
+    data = np.random.RandomState(index).uniform(1.0, 1000.0, (16, 16))
+    if index % 2:
+        norm = matplotlib.colors.LogNorm(1.0, 1000.0)
+    else:
+        norm = matplotlib.colors.BoundaryNorm([1, 10, 100, 500, 1000], 256)
+    mappable = ax.imshow(data, norm=norm)
+    ax.add_artist(Colorbar(mappable, label="Intensity", length_fraction=0.8))
+
+    return figure
+
+
+def _draw(figure):
+    figure.canvas.draw()
+
+
+class ThreadSuite:
+    """
+    Drawing of figures with a colorbar each, by a pool of *nthreads* threads.
+    """
+
+    params = [1, 2, 4, 8]
+    param_names = ["nthreads"]
+
+    def setup(self, nthreads):
+        self.figures = [_create_figure(index) for index in range(COUNT)]
+        self.executor = ThreadPoolExecutor(nthreads)
+        list(self.executor.map(_draw, self.figures))
+
+    def teardown(self, nthreads):
+        self.executor.shutdown()
+
+    def time_draw(self, nthreads):
+        list(self.executor.map(_draw, self.figures))
+
+    def track_throughput(self, nthreads):
+        start = time.perf_counter()
+        list(self.executor.map(_draw, self.figures))
+        return COUNT / (time.perf_counter() - start)
+
+    track_throughput.unit = "figures/s"
@@ -0,0 +1,59 @@
+"""
+Benchmarks of the colorbar ticks.
+"""
+
+# Standard library modules.
+
+# Third party modules.
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import matplotlib.colors
+
+import numpy as np
+
+# Local modules.
+from matplotlib_colorbar.colorbar import Colorbar
+
+# Globals and constants variables.
+
+NORMS = {
+    "linear": lambda: matplotlib.colors.Normalize(vmin=0.0, vmax=1.0),
+    "log": lambda: matplotlib.colors.LogNorm(vmin=1e-3, vmax=1e4),
+}
+
+
+class SmallMultiplesSuite:
+    """
+    Draw of a grid of small images, each with its own colorbar.
+    """
+
+    params = ([2, 6, 10], list(NORMS), [8, 256])
+    param_names = ["grid", "norm", "ncolors"]
+
+    def setup(self, grid, norm, ncolors):
+        self.figure, axes = plt.subplots(grid, grid, figsize=(8, 8))
+        data = np.random.RandomState(0).uniform(1e-3, 1.0, (16, 16))
+        cmap = plt.get_cmap("viridis", ncolors)
+
+        self.colorbars = []
+        for ax in axes.flat:
+            mappable = ax.imshow(data, norm=NORMS[norm](), cmap=cmap)
+            colorbar = Colorbar(mappable, length_fraction=0.8)
+            ax.add_artist(colorbar)
+            self.colorbars.append(colorbar)
+
+        self.figure.canvas.draw()
+        self.renderer = self.figure.canvas.get_renderer()
+
+    def teardown(self, grid, norm, ncolors):
+        plt.close(self.figure)
+
+    def time_draw(self, grid, norm, ncolors):
+        self.figure.canvas.draw()
+
+    def time_draw_colorbars(self, grid, norm, ncolors):
+        for colorbar in self.colorbars:
+            colorbar.draw(self.renderer)
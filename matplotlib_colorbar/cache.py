@@ -0,0 +1,90 @@
+"""
+Caches shared by the colorbar artist.
+"""
+
+# Standard library modules.
+import collections
+import threading
+
+# Third party modules.
+
+# Local modules.
+
+# Globals and constants variables.
+
+__all__ = ["LRUCache"]
+
+
+class LRUCache:
+    """
+    Mapping of bounded size, discarding the least recently used items first.
+    The number of hits and misses is recorded.
+    The cache can be used from several threads.
+    """
+
+    def __init__(self, maxsize=128):
+        """
+        Creates a new cache.
+
+        :arg maxsize: maximum number of items kept in the cache
+        """
+        self.maxsize = maxsize
+        self._data = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        """
+        Returns the value of *key* and marks it as recently used,
+        or *default* if *key* is not in the cache.
+        """
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        """
+        Stores *value* under *key*, evicting the least recently used item
+        if the cache is full.
+        """
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        """
+        Removes all items and resets the statistics.
+        """
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def get_stats(self):
+        """
+        Returns a :class:`dict` with the number of ``hits``, ``misses``,
+        the current ``size`` and the ``maxsize`` of the cache.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+            }
@@ -24,13 +24,20 @@ The following parameters are available for customization in the matplotlibrc:
     - colorbar.box_color
     - colorbar.box_alpha
     - colorbar.ticklocation
+    - colorbar.ticklabel_thinning
 
 See the class documentation (:class:`.Colorbar`) for a description of the
 parameters.
 """
 
 # Standard library modules.
+import contextlib
+import numbers
+import sys
+import threading
+import time
 import warnings
+import weakref
 
 # Third party modules.
 import matplotlib
@@ -43,16 +50,45 @@ from matplotlib.rcsetup import (
     validate_color,
 )
 from matplotlib.artist import Artist
-from matplotlib.offsetbox import AnchoredOffsetbox, AuxTransformBox, VPacker, HPacker
-from matplotlib.patches import Rectangle
-from matplotlib.collections import PatchCollection, LineCollection
-from matplotlib.text import Text
-from matplotlib.font_manager import FontProperties
+from matplotlib.patches import Rectangle, FancyBboxPatch
+from matplotlib.transforms import Affine2D, Bbox
+from matplotlib.collections import PolyCollection, PatchCollection, LineCollection
+from matplotlib.font_manager import FontProperties, findfont
 from matplotlib.colorbar import colorbar_factory
+from matplotlib.colors import to_rgba
+from matplotlib.contour import ContourSet
+from matplotlib.cm import ScalarMappable
+from matplotlib.backends.backend_agg import RendererAgg
 
 import numpy as np
 
 # Local modules.
+from .ticker import (
+    RCPARAMS,
+    calculate_colorbar,
+    limit_locator,
+    thin_ticks,
+    find_visible_ticklabels,
+)
+from .text import (
+    CachedText,
+    estimate_text_extents,
+    cached_text_rendering,
+    font_key,
+    renderer_key,
+)
+from .cache import LRUCache
+from .spec import DEFAULT_SPEC
+from .timing import DrawTimings, start_timer
+from . import metrics
+from .fingerprint import hash_colormap, hash_norm, calculate_fingerprint
+from .diskcache import get_cache as get_disk_cache
+from .layout import (
+    calculate_layout,
+    calculate_occupancy,
+    get_content_key,
+    find_best_location,
+)
 
 # Globals and constants variables.
 
@@ -78,6 +114,7 @@ defaultParams.update(
         "colorbar.color": ["k", validate_color],
         "colorbar.box_color": ["w", validate_color],
         "colorbar.box_alpha": [1.0, validate_float],
+        "colorbar.ticklabel_thinning": [False, validate_bool],
     }
 )
 
@@ -88,12 +125,111 @@ matplotlib.rcParams.validate = dict(
     if key not in matplotlib._all_deprecated
 )
 
+#: rcParams read by the artists of the colorbar when they are rendered
+RENDER_RCPARAMS = (
+    "lines.linewidth",
+    "lines.antialiased",
+    "patch.linewidth",
+    "patch.antialiased",
+    "path.snap",
+    "text.antialiased",
+    "text.hinting",
+    "text.hinting_factor",
+    "legend.fontsize",
+    "text.usetex",
+    "mathtext.fontset",
+)
+
+# Figure and axes of the dummy matplotlib colorbars, one per thread
+_scratch = threading.local()
+
+
+def _get_shared_cache():
+    # Imported only when a shared cache is set, as it needs Python 3.8+
+    sharedcache = sys.modules.get(__package__ + ".sharedcache")
+    return sharedcache.get_cache() if sharedcache is not None else None
+
+
+def _get_scratch_axes():
+    ax = getattr(_scratch, "axes", None)
+    if ax is None:
+        figure = matplotlib.figure.Figure()
+        ax = _scratch.axes = figure.add_axes([0.0, 0.0, 1.0, 1.0])
+    return ax
+
+
+# Whether the colorbars of the thread are drawn with the reference engines
+_reference = threading.local()
+
+
+def _use_reference():
+    return getattr(_reference, "enabled", False)
+
+
+@contextlib.contextmanager
+def reference_engines():
+    """
+    Context manager within which the colorbars drawn by the current thread
+    use the reference engines: the geometry is always calculated from a
+    dummy matplotlib colorbar (:meth:`Colorbar._calculate_colorbar_dummy`)
+    and the bar is a :class:`PatchCollection` of one rectangle per color.
+    The shared and on-disk caches are bypassed.
+    Used to check the fast engines against the reference output
+    (see :mod:`matplotlib_colorbar.equivalence`).
+    """
+    previous = _use_reference()
+    _reference.enabled = True
+    try:
+        yield
+    finally:
+        _reference.enabled = previous
+
 
 class Colorbar(Artist):
 
     zorder = 5
 
+    # Kept out of the instance dictionary, which is then shared with the
+    # other artists as long as it holds only the attributes of Artist
+    __slots__ = (
+        "_spec",
+        "_font_properties",
+        "_mappable",
+        "_mappable_cid",
+        "_weak_mappable",
+        "_mappable_summary",
+        "_computing",
+        "_best_location",
+        "_hit_cache",
+        "_dirty",
+        "_geometry",
+        "_ncomputes",
+        "_nskipped",
+        "_artists",
+        "_extents",
+        "_nbuilds",
+        "_nmeasures",
+        "_timings",
+    )
+
+    _DEFAULTS = {
+        "orientation": "vertical",
+        "length_fraction": 0.2,
+        "width_fraction": 0.01,
+        "location": "upper right",
+        "pad": 0.2,
+        "border_pad": 0.1,
+        "sep": 5,
+        "frameon": True,
+        "color": "k",
+        "box_color": "w",
+        "box_alpha": 1.0,
+        "ticklocation": "auto",
+        "ticklabel_thinning": False,
+    }
+
     _LOCATIONS = {
+        "best": 0,
         "upper right": 1,
         "upper left": 2,
         "lower left": 3,
@@ -125,6 +261,8 @@ class Colorbar(Artist):
         ticks=None,
         ticklabels=None,
         ticklocation=None,
+        ticklabel_thinning=None,
+        weak_mappable=False,
     ):
         """
         Creates a new color bar.
@@ -142,7 +280,8 @@ class Colorbar(Artist):
         :arg width_fraction: width of the color bar as a fraction of the
             axes's height (horizontal) or width (vertical) depending on the
             orientation (default: rcParams['colorbar.width_fraction'] or ``0.02``
-        :arg location: a location code (same as legend)
+        :arg location: a location code (same as legend); ``best`` places the
+            color bar where it overlaps the least content of the axes
             (default: rcParams['colorbar.location'] or ``upper right``)
         :arg pad: fraction of the font size
             (default: rcParams['colorbar.pad'] or ``0.2``)
@@ -158,13 +297,13 @@ class Colorbar(Artist):
             (default: rcParams['colorbar.box_color'] or ``w``)
         :arg box_alpha: transparency of box
             (default: rcParams['colorbar.box_alpha'] or ``1.0``)
-        
+
         :arg font_properties: font properties of the label text, specified
             either as dict or `fontconfig <http://www.fontconfig.org/>`_
             pattern (XML).
         :type font_properties: :class:`matplotlib.font_manager.FontProperties`,
             :class:`str` or :class:`dict`
-        
+
         :arg ticks: ticks location
             (default: minimal and maximal values)
         :arg ticklabels: a list of tick labels (same length as ``ticks`` argument)
@@ -173,9 +312,26 @@ class Colorbar(Artist):
             oriented colorbar, or ``auto`` for automatic adjustment (``right``
             for vertical and ``bottom`` for horizontal oriented colorbar).
             (default: rcParams['colorbar.ticklocation'] or ``auto``)
+        :arg ticklabel_thinning: if True, tick labels overlapping a previous
+            one are not drawn
+            (default: rcParams['colorbar.ticklabel_thinning'] or ``False``)
+        :arg weak_mappable: if True, the mappable is only weakly referenced,
+            so that its data can be freed while the colorbar is kept.
+            Once the mappable is garbage collected, the colorbar is drawn
+            from the norm and colormap of the mappable at its last draw.
+            A colorbar must also be removed from its axes to release its
+            figure (default: ``False``)
         """
         Artist.__init__(self)
 
+        self._spec = DEFAULT_SPEC
+        self._mappable = None
+        self._mappable_cid = None
+        self._weak_mappable = weak_mappable
+        self._mappable_summary = None
+        self._computing = False
+        self._reset_caches()
+
         self.mappable = mappable
         self.label = label
         self.orientation = orientation
@@ -206,77 +362,636 @@ class Colorbar(Artist):
         self.ticks = ticks
         self.ticklabels = ticklabels
         self.ticklocation = ticklocation
+        self.ticklabel_thinning = ticklabel_thinning
+
+    def _reset_caches(self):
+        self._best_location = None
+        self._hit_cache = None
+        self._dirty = True
+        self._geometry = None
+        self._ncomputes = 0
+        self._nskipped = 0
+        self._artists = None
+        self._extents = None
+        self._nbuilds = 0
+        self._nmeasures = 0
+        self._timings = None
+
+    def __getstate__(self):
+        """
+        Returns the parameters of the colorbar, without its caches.
+        A mappable outside the figure of the colorbar is replaced by a
+        summary of its norm and colormap, without its data.
+        The caches are rebuilt at the next draw.
+        """
+        state = Artist.__getstate__(self)
+        state["_spec"] = self._spec if self._spec is not DEFAULT_SPEC else None
+        state["_font_properties"] = self._font_properties
+        state["_mappable"] = self._get_mappable_summary()
+        state["_weak_mappable"] = self._weak_mappable
+
+        if self.axes is None:
+            # Left by a removed axes, set again when added to another one
+            state["clipbox"] = None
+            state["_transform"] = None
+            state["_transformSet"] = False
+
+        return state
+
+    def __setstate__(self, state):
+        state = dict(state)
+        self._spec = state.pop("_spec") or DEFAULT_SPEC
+        self._font_properties = state.pop("_font_properties")
+        mappable = state.pop("_mappable")
+        weak_mappable = state.pop("_weak_mappable")
+        self.__dict__.update(state)
+
+        self._mappable = None
+        self._mappable_cid = None
+        self._weak_mappable = weak_mappable
+        self._mappable_summary = None
+        self._computing = False
+        self._reset_caches()
+        self.set_mappable(mappable)
+
+    def _set_param(self, name, value):
+        """
+        Sets parameter *name* in the spec of this colorbar, which is copied
+        first if it is shared.
+        """
+        spec = self._spec
+        if spec is DEFAULT_SPEC:
+            if value is None:
+                return
+            spec = self._spec = spec.copy()
+        setattr(spec, name, value)
+
+    def _get_mappable_summary(self):
+        """
+        Returns the mappable to pickle with the colorbar.
+        """
+        mappable = self.get_mappable()
+        if mappable is None or isinstance(mappable, ContourSet):
+            return mappable
+
+        # Pickled with the figure anyway
+        figure = getattr(mappable, "figure", None)
+        if figure is not None and figure is self.figure:
+            return mappable
+
+        summary = ScalarMappable(mappable.norm, mappable.get_cmap())
+        array = mappable.get_array()
+        if not mappable.norm.scaled() and array is not None and array.size:
+            # Same limits once the norm is autoscaled
+            array = np.ma.asarray(array)
+            summary.set_array(np.ma.array([array.min(), array.max()]))
+        return summary
+
+    def _get_value(self, attr):
+        """
+        Returns the value of parameter *attr*, or its value in the rcParams,
+        or its default value.
+        """
+        from matplotlib import rcParams  # late import
+
+        value = getattr(self._spec, attr)
+        if value is None:
+            value = rcParams.get("colorbar." + attr, self._DEFAULTS[attr])
+        return value
 
     def draw(self, renderer, *args, **kwargs):
         if not self.get_visible():
             return
-        if not self.get_mappable():
+        mappable = self.get_mappable()
+        if not mappable:
+            self._hit_cache = None
             return
+        if self._weak_mappable:
+            # Drawn from them once the mappable is garbage collected
+            self._mappable_summary = (mappable.norm, mappable.get_cmap())
 
-        # Get parameters
-        from matplotlib import rcParams  # late import
-
-        def _get_value(attr, default):
-            value = getattr(self, attr)
-            if value is None:
-                value = rcParams.get("colorbar." + attr, default)
-            return value
+        start = time.perf_counter()
+        timer = start_timer(self)
 
-        orientation = _get_value("orientation", "vertical")
-        length_fraction = _get_value("length_fraction", 0.2)
-        width_fraction = _get_value("width_fraction", 0.01)
-        location = _get_value("location", "upper right")
+        # Get parameters
+        orientation = self._get_value("orientation")
+        length_fraction = self._get_value("length_fraction")
+        width_fraction = self._get_value("width_fraction")
+        location = self._get_value("location")
         if isinstance(location, str):
             location = self._LOCATIONS[location]
-        pad = _get_value("pad", 0.2)
-        border_pad = _get_value("border_pad", 0.1)
-        sep = _get_value("sep", 5)
-        frameon = _get_value("frameon", True)
-        color = _get_value("color", "k")
-        box_color = _get_value("box_color", "w")
-        box_alpha = _get_value("box_alpha", 1.0)
+        pad = self._get_value("pad")
+        border_pad = self._get_value("border_pad")
+        sep = self._get_value("sep")
+        frameon = self._get_value("frameon")
+        color = self._get_value("color")
+        box_color = self._get_value("box_color")
+        box_alpha = self._get_value("box_alpha")
         font_properties = self.font_properties
-        ticklocation = _get_value("ticklocation", "auto")
+        ticklocation = self._get_value("ticklocation")
         if ticklocation == "auto":
             ticklocation = "bottom" if orientation == "horizontal" else "right"
+        ticklabel_thinning = self._get_value("ticklabel_thinning")
 
-        mappable = self.mappable
-        cmap = self.mappable.get_cmap()
-        norm = self.mappable.norm
         label = self.label
         ticks = self.ticks
         ticklabels = self.ticklabels
 
         ax = self.axes
 
+        # Caches shared with other processes, keyed by fingerprint
+        disk_cache = get_disk_cache()
+        geometry_caches = [
+            cache for cache in (_get_shared_cache(), disk_cache) if cache is not None
+        ]
+        fingerprint = None
+        if geometry_caches and mappable.norm.scaled() and not _use_reference():
+            fingerprint = self.fingerprint()
+        if fingerprint is None:
+            # Limits still to be autoscaled from data, which may change
+            # before the norm is scaled
+            disk_cache = None
+            geometry_caches = []
+
+        if timer is not None:
+            timer.mark("config")
+
+        # Draw from the on-disk cache of rendered rasters, keyed on the
+        # fingerprint, which covers the rcParams and font used to render
+        if disk_cache is not None:
+            rasterize = isinstance(renderer, RendererAgg)
+            layout_key = (fingerprint, renderer_key(renderer), self.get_figure().dpi)
+            if rasterize and self._draw_cached_raster(
+                renderer,
+                disk_cache,
+                layout_key,
+                location,
+                ticklocation,
+                pad,
+                border_pad,
+                sep,
+            ):
+                if timer is not None:
+                    timer.mark("render")
+                    timer.stop()
+                metrics.increment("raster_hits")
+                metrics.record_draw(self, time.perf_counter() - start)
+                return
+
         # Calculate colorbar
+        key = self._get_geometry_key(
+            length_fraction, mappable, ticks, ticklabels, orientation, font_properties
+        ) + (_use_reference(),)
+        if self._dirty or self._geometry is None or self._geometry[0] != key:
+            # From the shared memory, then the disk, filling the caches missed
+            geometry = None
+            missed = []
+            for cache in geometry_caches:
+                geometry = self._load_geometry(cache, (fingerprint,))
+                if geometry is not None:
+                    metrics.increment("geometry_hits")
+                    break
+                missed.append(cache)
+
+            if geometry is None:
+                self._computing = True
+                try:
+                    geometry = self._calculate_geometry(
+                        length_fraction,
+                        mappable,
+                        ticks,
+                        ticklabels,
+                        orientation,
+                        font_properties,
+                    )
+                finally:
+                    self._computing = False
+                self._ncomputes += 1
+                metrics.increment("geometry_misses")
+
+            for cache in missed:
+                self._save_geometry(cache, (fingerprint,), geometry)
+
+            self._geometry = (key, geometry)
+            self._dirty = False
+        else:
+            metrics.increment("geometry_hits")
+
         (
             color_positions,
             color_values,
             ticks,
             ticklabels,
             offset_string,
-        ) = self._calculate_colorbar(length_fraction, mappable, ticks, ticklabels)
+        ) = self._geometry[1]
 
-        # Create colorbar
-        colorbarbox = AuxTransformBox(ax.transAxes)
+        if ticklabel_thinning:
+            ticklabels = self._thin_ticklabels(
+                orientation, ticks, ticklabels, offset_string, font_properties
+            )
 
-        widths = np.diff(color_positions)
+        if timer is not None:
+            timer.mark("geometry")
+
+        # Create artists, in axes coordinates, independently of the renderer
+        key = (
+            ax,
+            orientation,
+            width_fraction,
+            ticklocation,
+            font_key(font_properties),
+            label,
+            tuple(ticks),
+            tuple(ticklabels),
+            offset_string,
+        )
+        if (
+            self._artists is None
+            or self._artists[0] is not self._geometry
+            or self._artists[1] != key
+        ):
+            artists = self._create_artists(
+                orientation,
+                length_fraction,
+                width_fraction,
+                color,
+                font_properties,
+                ticklocation,
+                color_positions,
+                color_values,
+                ticks,
+                ticklabels,
+                offset_string,
+                label,
+                timer,
+            )
+            self._artists = (self._geometry, key, artists, to_rgba(color))
+            self._extents = LRUCache(maxsize=8)
+            self._nbuilds += 1
+            metrics.increment("artist_rebuilds")
 
-        patches = []
-        for color_position, color_width in zip(color_positions[:-1], widths):
-            if orientation == "horizontal":
-                patch = Rectangle((color_position, 0.0), color_width, width_fraction)
+        (
+            colorbar_artists,
+            label_artists,
+            outline,
+            ticklines,
+            ticktexts,
+        ) = self._artists[2]
+
+        # Colors are re-applied, without creating the artists again
+        if self._artists[3] != to_rgba(color):
+            outline.set_edgecolor(color)
+            for artist in colorbar_artists[2:] + label_artists:
+                artist.set_color(color)  # tick lines and texts
+            self._artists = self._artists[:3] + (to_rgba(color),)
+
+        if timer is not None:
+            timer.mark("ticks")
+
+        # Calculate extents, at the resolution of the renderer
+        key = (renderer_key(renderer), self.get_figure().dpi, ax.bbox.bounds)
+        extents = self._extents.get(key)
+        if extents is None:
+            extents = self._calculate_extents(
+                renderer, outline, ticklines, ticktexts, label_artists
+            )
+            self._extents.set(key, extents)
+            self._nmeasures += 1
+            metrics.increment("text_metric_misses")
+        else:
+            metrics.increment("text_metric_hits")
+
+        bboxes, label_extent = extents
+        boxes = [(colorbar_artists, Bbox.union(bboxes))]
+        colorbar_index = 0
+
+        if label_artists:
+            labelbox = (label_artists, label_extent)
+            if ticklocation in ["bottom", "right"]:
+                boxes.append(labelbox)
             else:
-                patch = Rectangle((0.0, color_position), width_fraction, color_width)
-            patches.append(patch)
+                boxes.insert(0, labelbox)
+                colorbar_index = 1
+
+        # Calculate layout
+        sizes = tuple((extent.width, extent.height) for _artists, extent in boxes)
+        fontsize, layout_args = self._get_layout_args(
+            renderer, sizes, ticklocation, pad, border_pad, sep
+        )
+        frame, corners = self._calculate_frame(layout_args, location)
+
+        if timer is not None:
+            timer.mark("layout")
+
+        # Draw
+        draw_args = (frame, boxes, corners, frameon, fontsize, box_color, box_alpha)
+        if disk_cache is not None and rasterize:
+            margin = self._get_raster_margin(renderer)
+            raster = self._render_raster(renderer, margin, *draw_args)
+            self._draw_raster(renderer, raster, frame, margin)
+        else:
+            self._draw_boxes(renderer, *draw_args)
+
+        # Cache extents for hit testing
+        x, y = corners[colorbar_index]
+        extent = boxes[colorbar_index][1]
+        transform = (
+            ax.transAxes
+            + Affine2D().translate(-extent.x0, -extent.y0)
+            + Affine2D().translate(x, y)
+        )
+        ticklabel_extents = np.reshape([bbox.extents for bbox in bboxes[1:]], (-1, 4))
+        ticklabel_extents += np.tile([x - extent.x0, y - extent.y0], 2)
+
+        self._update_hit_cache(
+            transform,
+            orientation,
+            outline,
+            color_positions,
+            color_values,
+            ticklabel_extents,
+            [ticktext.get_text() for ticktext in ticktexts],
+        )
+
+        if disk_cache is not None and rasterize:
+            self._save_raster(disk_cache, layout_key, sizes, frame, margin, raster)
+
+        if timer is not None:
+            timer.mark("render")
+            timer.stop()
+        metrics.record_draw(self, time.perf_counter() - start)
+
+    def _get_layout_args(self, renderer, sizes, ticklocation, pad, border_pad, sep):
+        """
+        Returns the font size of the legends in pixels and the arguments of
+        :func:`calculate_layout <matplotlib_colorbar.layout.calculate_layout>`
+        for boxes of *sizes*, except the location and parent bbox.
+        """
+        from matplotlib import rcParams  # late import
+
+        fontsize = renderer.points_to_pixels(
+            FontProperties(size=rcParams["legend.fontsize"]).get_size_in_points()
+        )
+        layout_args = (
+            sizes,
+            ticklocation in ["bottom", "top"],
+            pad * fontsize,
+            border_pad * fontsize,
+            sep * renderer.points_to_pixels(1.0),
+        )
+        return fontsize, layout_args
 
+    def _calculate_frame(self, layout_args, location):
+        """
+        Returns the frame and the lower left corners of the boxes in display
+        units, at *location* or at the best location.
+        """
+        if location == self._LOCATIONS["best"]:
+            location = self._find_best_location(layout_args)
+
+        sizes, vertical, pad, border_pad, sep = layout_args
+        return calculate_layout(
+            sizes, vertical, location, pad, border_pad, sep, self.axes.bbox
+        )
+
+    def _draw_boxes(
+        self,
+        renderer,
+        frame,
+        boxes,
+        corners,
+        frameon,
+        fontsize,
+        box_color,
+        box_alpha,
+        offset=(0, 0),
+    ):
+        """
+        Draws the frame and the boxes at their *corners*, translated by
+        *offset* in display units.
+        """
+        dx, dy = offset
+
+        if frameon:
+            patch = FancyBboxPatch(
+                (frame.x0 + dx, frame.y0 + dy),
+                frame.width,
+                frame.height,
+                boxstyle="square,pad=0",
+                mutation_scale=fontsize,
+                snap=True,
+            )
+            patch.set_color(box_color)
+            patch.set_alpha(box_alpha)
+            patch.draw(renderer)
+
+        with cached_text_rendering(renderer):
+            for (artists, extent), (x, y) in zip(boxes, corners):
+                transform = (
+                    self.axes.transAxes
+                    + Affine2D().translate(-extent.x0, -extent.y0)
+                    + Affine2D().translate(x + dx, y + dy)
+                )
+                for artist in artists:
+                    artist.set_transform(transform)
+                    artist.draw(renderer)
+
+    def _get_raster_margin(self, renderer):
+        # Pixels around the frame, for its edge and the antialiasing
+        from matplotlib import rcParams  # late import
+
+        linewidth = renderer.points_to_pixels(rcParams["patch.linewidth"])
+        return int(np.ceil(linewidth)) + 2
+
+    def _render_raster(self, renderer, margin, frame, *args):
+        """
+        Returns the frame and the boxes rendered in a separate RGBA raster,
+        with *margin* pixels around the frame and its first row at the bottom.
+        """
+        x0 = int(np.floor(frame.x0)) - margin
+        y0 = int(np.floor(frame.y0)) - margin
+        width = int(np.ceil(frame.x1)) + margin - x0
+        height = int(np.ceil(frame.y1)) + margin - y0
+
+        offscreen = RendererAgg(width, height, renderer.dpi)
+        self._draw_boxes(offscreen, frame, *args, offset=(-x0, -y0))
+        return np.asarray(offscreen.buffer_rgba())[::-1]
+
+    def _draw_raster(self, renderer, raster, frame, margin):
+        x0 = int(np.floor(frame.x0)) - margin
+        y0 = int(np.floor(frame.y0)) - margin
+        gc = renderer.new_gc()
+        renderer.draw_image(gc, x0, y0, raster)
+        gc.restore()
+
+    def _get_raster_key(self, layout_key, frame):
+        # Rasters depend on the position of the frame within a pixel
+        fraction = np.round(np.mod(frame.p0, 1.0), 4)
+        return ("raster",) + layout_key + tuple(fraction.tolist())
+
+    def _draw_cached_raster(
+        self,
+        renderer,
+        disk_cache,
+        layout_key,
+        location,
+        ticklocation,
+        pad,
+        border_pad,
+        sep,
+    ):
+        """
+        Draws the colorbar from a raster of the on-disk cache and restores its
+        hit testing information.
+        Returns whether the raster was found.
+        """
+        layout = disk_cache.get_arrays(("layout",) + layout_key)
+        if layout is None:
+            return False
+
+        sizes = tuple(map(tuple, layout["sizes"].tolist()))
+        _fontsize, layout_args = self._get_layout_args(
+            renderer, sizes, ticklocation, pad, border_pad, sep
+        )
+        frame, _corners = self._calculate_frame(layout_args, location)
+
+        raster = disk_cache.get_array(self._get_raster_key(layout_key, frame))
+        if raster is None:
+            return False
+
+        self._draw_raster(renderer, raster, frame, int(layout["margin"]))
+
+        # Positions were saved relative to the frame
+        x0, y0 = frame.p0
+        self._hit_cache = {
+            "orientation": str(layout["orientation"]),
+            "bar_extent": layout["bar_extent"] + [x0, y0, x0, y0],
+            "boundaries": layout["boundaries"] + (x0 if layout["horizontal"] else y0),
+            "values": layout["values"],
+            "ticklabel_extents": layout["ticklabel_extents"] + [x0, y0, x0, y0],
+            "ticklabels": layout["ticklabels"].tolist(),
+        }
+        return True
+
+    def _save_raster(self, disk_cache, layout_key, sizes, frame, margin, raster):
+        """
+        Saves the raster of the colorbar and its layout in the on-disk cache.
+        """
+        hit_cache = self._hit_cache
+        x0, y0 = frame.p0
+        horizontal = hit_cache["orientation"] == "horizontal"
+
+        disk_cache.set_arrays(
+            ("layout",) + layout_key,
+            sizes=np.asarray(sizes, dtype=float),
+            margin=margin,
+            orientation=hit_cache["orientation"],
+            horizontal=horizontal,
+            bar_extent=hit_cache["bar_extent"] - [x0, y0, x0, y0],
+            boundaries=hit_cache["boundaries"] - (x0 if horizontal else y0),
+            values=np.asarray(hit_cache["values"], dtype=float),
+            ticklabel_extents=hit_cache["ticklabel_extents"] - [x0, y0, x0, y0],
+            ticklabels=np.array(hit_cache["ticklabels"], dtype=str),
+        )
+        disk_cache.set_array(self._get_raster_key(layout_key, frame), raster)
+
+    def _load_geometry(self, disk_cache, key):
+        arrays = disk_cache.get_arrays(("geometry",) + key)
+        if arrays is None:
+            return None
+
+        return (
+            arrays["color_positions"],
+            arrays["color_values"],
+            arrays["ticks"],
+            arrays["ticklabels"].tolist(),
+            str(arrays["offset_string"]),
+        )
+
+    def _save_geometry(self, disk_cache, key, geometry):
+        color_positions, color_values, ticks, ticklabels, offset_string = geometry
+        disk_cache.set_arrays(
+            ("geometry",) + key,
+            color_positions=np.asarray(color_positions, dtype=float),
+            color_values=np.asarray(color_values, dtype=float),
+            ticks=np.asarray(ticks, dtype=float),
+            ticklabels=np.array(list(ticklabels), dtype=str),
+            offset_string=offset_string,
+        )
+
+    def _create_artists(
+        self,
+        orientation,
+        length_fraction,
+        width_fraction,
+        color,
+        font_properties,
+        ticklocation,
+        color_positions,
+        color_values,
+        ticks,
+        ticklabels,
+        offset_string,
+        label,
+        timer=None,
+    ):
+        """
+        Returns the artists of the colorbar box, the artists of the label box,
+        the outline, the tick lines and the tick texts, in axes coordinates.
+        The artists do not depend on the renderer and are reused across
+        draws, resolutions and output formats.
+        The construction of the segments is marked on *timer*, if any.
+        """
+        ax = self.axes
+        cmap = self.mappable.get_cmap()
+        norm = self.mappable.norm
+
+        # Create colorbar
         edgecolors = "none"  # if self.drawedges else 'none'
         # FIXME: drawedge property
         # FIXME: Filled property
-        col = PatchCollection(patches, cmap=cmap, edgecolors=edgecolors, norm=norm)
+        if _use_reference():
+            # One rectangle per color
+            patches = []
+            for color_position, color_width in zip(
+                color_positions[:-1], np.diff(color_positions)
+            ):
+                if orientation == "horizontal":
+                    patch = Rectangle(
+                        (color_position, 0.0), color_width, width_fraction
+                    )
+                else:
+                    patch = Rectangle(
+                        (0.0, color_position), width_fraction, color_width
+                    )
+                patches.append(patch)
+
+            col = PatchCollection(patches, cmap=cmap, edgecolors=edgecolors, norm=norm)
+        else:
+            # Same vertices as rectangles, without creating a patch per color
+            starts = np.asarray(color_positions[:-1])[:, np.newaxis]
+            widths = np.diff(color_positions)[:, np.newaxis]
+            if orientation == "horizontal":
+                xs = starts + widths * [0.0, 1.0, 1.0, 0.0]
+                ys = np.broadcast_to(
+                    width_fraction * np.array([0.0, 0.0, 1.0, 1.0]), xs.shape
+                )
+            else:
+                ys = starts + widths * [0.0, 0.0, 1.0, 1.0]
+                xs = np.broadcast_to(
+                    width_fraction * np.array([0.0, 1.0, 1.0, 0.0]), ys.shape
+                )
+            verts = np.stack([xs, ys], axis=-1)
+
+            # Closed by repeating their first vertex, rather than by the
+            # PolyCollection, which would copy the vertices of each color
+            verts = np.concatenate([verts, verts[:, :1]], axis=1)
+
+            col = PolyCollection(
+                verts, closed=False, cmap=cmap, edgecolors=edgecolors, norm=norm
+            )
         col.set_array(color_values[:, 0])
-        colorbarbox.add_artist(col)
+        colorbar_artists = [col]
 
         # Create outline
         if orientation == "horizontal":
@@ -287,7 +1002,10 @@ class Colorbar(Artist):
             outline = Rectangle(
                 (0, 0), width_fraction, length_fraction, fill=False, ec=color
             )
-        colorbarbox.add_artist(outline)
+        colorbar_artists.append(outline)
+
+        if timer is not None:
+            timer.mark("segments")
 
         # Create ticks and tick labels
         w10th = width_fraction / 10.0
@@ -325,8 +1043,11 @@ class Colorbar(Artist):
 
             ticklines.append([(x0, y0), (x1, y1)])
 
+            if not ticklabel:
+                continue
+
             ticklabel = offset_string + ticklabel
-            ticktext = Text(
+            ticktext = CachedText(
                 xtext,
                 ytext,
                 ticklabel,
@@ -334,21 +1055,19 @@ class Colorbar(Artist):
                 fontproperties=font_properties,
                 horizontalalignment=ha,
                 verticalalignment=va,
+                transform=ax.transAxes,
             )
             ticktexts.append(ticktext)
 
         col = LineCollection(ticklines, color=color)
-        colorbarbox.add_artist(col)
-
-        for ticktext in ticktexts:
-            colorbarbox.add_artist(ticktext)
+        colorbar_artists.append(col)
+        colorbar_artists.extend(ticktexts)
 
         # Create label
+        label_artists = []
         if label:
-            labelbox = AuxTransformBox(ax.transAxes)
-
             va = "baseline" if orientation == "horizontal" else "center"
-            text = Text(
+            text = CachedText(
                 0,
                 0,
                 label,
@@ -356,49 +1075,490 @@ class Colorbar(Artist):
                 verticalalignment=va,
                 rotation=orientation,
                 color=color,
+                transform=ax.transAxes,
+            )
+            label_artists.append(text)
+
+        figure = self.get_figure()
+        for artist in colorbar_artists + label_artists:
+            artist.set_figure(figure)
+            artist.axes = ax
+
+        return colorbar_artists, label_artists, outline, ticklines, ticktexts
+
+    def _calculate_extents(
+        self, renderer, outline, ticklines, ticktexts, label_artists
+    ):
+        """
+        Returns the extents in display units of the bar and ticks followed by
+        each tick label, and the extent of the label (``None`` if no label),
+        as measured by *renderer*.
+        """
+        ax = self.axes
+        for artist in ticktexts + label_artists:
+            artist.set_transform(ax.transAxes)
+
+        # Colorbar from the corners of the bar and ticks, then tick labels
+        points = np.concatenate(
+            [[outline.get_xy(), (outline.get_width(), outline.get_height())]]
+            + [np.reshape(ticklines, (-1, 2))]
+        )
+        points = ax.transAxes.transform(points)
+        bboxes = [Bbox([points.min(axis=0), points.max(axis=0)])]
+        bboxes += [ticktext.get_window_extent(renderer) for ticktext in ticktexts]
+
+        label_extent = None
+        if label_artists:
+            label_extent = label_artists[0].get_window_extent(renderer)
+
+        return bboxes, label_extent
+
+    def _update_hit_cache(
+        self,
+        transform,
+        orientation,
+        outline,
+        color_positions,
+        color_values,
+        ticklabel_extents,
+        ticklabels,
+    ):
+        corners = [outline.get_xy(), (outline.get_width(), outline.get_height())]
+        bar_extent = transform.transform(corners).ravel()
+
+        if orientation == "horizontal":
+            points = np.column_stack([color_positions, np.zeros_like(color_positions)])
+            boundaries = transform.transform(points)[:, 0]
+        else:
+            points = np.column_stack([np.zeros_like(color_positions), color_positions])
+            boundaries = transform.transform(points)[:, 1]
+
+        self._hit_cache = {
+            "orientation": orientation,
+            "bar_extent": bar_extent,
+            "boundaries": boundaries,
+            "values": color_values[:, 0],
+            "ticklabel_extents": ticklabel_extents,
+            "ticklabels": ticklabels,
+        }
+
+    def _find_value(self, position):
+        boundaries = self._hit_cache["boundaries"]
+        values = self._hit_cache["values"]
+        index = np.searchsorted(boundaries, position, side="right") - 1
+        return values[min(max(index, 0), len(values) - 1)]
+
+    def get_value_at(self, x, y):
+        """
+        Returns the data value of the color under the display coordinates
+        *x* and *y*, or ``None`` if they are outside the bar.
+        The value is looked up with a binary search over the boundaries of
+        the colors, as last drawn.
+        """
+        if self._hit_cache is None:
+            return None
+
+        x0, y0, x1, y1 = self._hit_cache["bar_extent"]
+        if not (x0 <= x <= x1 and y0 <= y <= y1):
+            return None
+
+        if self._hit_cache["orientation"] == "horizontal":
+            return self._find_value(x)
+        else:
+            return self._find_value(y)
+
+    def contains(self, mouseevent):
+        """
+        Tests whether the mouse event occurred on the bar or a tick label,
+        as last drawn.
+        The details contain the data ``value`` of the color under the mouse
+        event or at the tick, and the ``ticklabel`` text if a tick label was
+        hit.
+        """
+        inside, info = self._default_contains(mouseevent, self.figure)
+        if inside is not None:
+            return inside, info
+
+        if not self.get_visible() or self._hit_cache is None:
+            return False, {}
+
+        x, y = mouseevent.x, mouseevent.y
+        if x is None or y is None:
+            return False, {}
+
+        value = self.get_value_at(x, y)
+        if value is not None:
+            return True, {"value": value}
+
+        extents = self._hit_cache["ticklabel_extents"]
+        hits = np.flatnonzero(
+            (extents[:, 0] <= x)
+            & (x <= extents[:, 2])
+            & (extents[:, 1] <= y)
+            & (y <= extents[:, 3])
+        )
+        if not len(hits):
+            return False, {}
+
+        index = hits[0]
+        if self._hit_cache["orientation"] == "horizontal":
+            position = (extents[index, 0] + extents[index, 2]) / 2
+        else:
+            position = (extents[index, 1] + extents[index, 3]) / 2
+
+        info = {
+            "value": self._find_value(position),
+            "ticklabel": self._hit_cache["ticklabels"][index],
+        }
+        return True, info
+
+    def _get_geometry_key(
+        self, length_fraction, mappable, ticks, ticklabels, orientation, font_properties
+    ):
+        """
+        Returns a key of the inputs of the geometry which may change without
+        the colorbar being invalidated, such as the limits of the norm.
+        The automatic ticks also depend on the length of the colorbar in
+        points and on the font, which limit how many tick labels fit.
+        """
+        from matplotlib import rcParams  # late import
+
+        norm = mappable.norm
+        cmap = mappable.get_cmap()
+        norm_state = tuple(
+            sorted(
+                (name, value)
+                for name, value in vars(norm).items()
+                if isinstance(value, (numbers.Number, str, type(None)))
             )
-            labelbox.add_artist(text)
+        )
+        return (
+            length_fraction,
+            type(norm),
+            norm_state,
+            cmap.name,
+            cmap.N,
+            getattr(cmap, "colorbar_extend", False),
+            tuple(ticks) if ticks else None,
+            tuple(ticklabels) if ticklabels else None,
+            None if ticks else self._get_budget_key(orientation, font_properties),
+            tuple(str(rcParams[name]) for name in RCPARAMS),
+        )
+
+    def _get_budget_key(self, orientation, font_properties):
+        length = self._get_axes_length(orientation)
+        return (orientation, round(length, 3), font_key(font_properties))
+
+    def _get_axes_length(self, orientation):
+        """
+        Returns the width (horizontal) or height (vertical) of the axes in
+        points.
+        """
+        if orientation == "horizontal":
+            length = self.axes.bbox.width
         else:
-            labelbox = None
-
-        # Create final offset box
-        if ticklocation == "bottom":
-            children = [colorbarbox, labelbox] if labelbox else [colorbarbox]
-            child = VPacker(children=children, align="center", pad=0, sep=sep)
-        elif ticklocation == "top":
-            children = [labelbox, colorbarbox] if labelbox else [colorbarbox]
-            child = VPacker(children=children, align="center", pad=0, sep=sep)
-        elif ticklocation == "left":
-            children = [labelbox, colorbarbox] if labelbox else [colorbarbox]
-            child = HPacker(children=children, align="center", pad=0, sep=sep)
-        elif ticklocation == "right":
-            children = [colorbarbox, labelbox] if labelbox else [colorbarbox]
-            child = HPacker(children=children, align="center", pad=0, sep=sep)
-        #
-        box = AnchoredOffsetbox(
-            loc=location, pad=pad, borderpad=border_pad, child=child, frameon=frameon
+            length = self.axes.bbox.height
+        return length * 72.0 / self.get_figure().dpi
+
+    def invalidate(self):
+        """
+        Marks the geometry of the colorbar (colors and ticks) as out of date.
+        It is recomputed once, at the next draw, however many times the
+        colorbar is invalidated before.
+        The colorbar is invalidated when its mappable changes.
+        """
+        if self._computing:
+            return
+        if self._dirty and self._geometry is not None:
+            self._nskipped += 1
+            metrics.increment("skipped_recomputes")
+        self._dirty = True
+        self.stale = True
+
+    def fingerprint(self):
+        """
+        Returns a hash of the inputs of the colorbar, which is the same for
+        colorbars rendering identically, in any process or run.
+        The hash covers the class and parameters of the norm, the colors of
+        the colormap, the ticks and tick labels, the label, the parameters
+        (or their values in the rcParams), the rcParams read when the artists
+        are rendered, the font properties and the font file they resolve to,
+        and the size of the axes.
+        The limits of an unscaled norm are taken from the data of the
+        mappable; ``None`` is returned if they cannot be determined.
+        """
+        from matplotlib import rcParams  # late import
+
+        spec = {attr: self._get_value(attr) for attr in self._DEFAULTS}
+        spec["color"] = to_rgba(spec["color"])
+        spec["box_color"] = to_rgba(spec["box_color"])
+        if isinstance(spec["location"], str):
+            spec["location"] = self._LOCATIONS[spec["location"]]
+        if spec["ticklocation"] == "auto":
+            vertical = spec["orientation"] == "vertical"
+            spec["ticklocation"] = "right" if vertical else "bottom"
+
+        spec["label"] = self.label
+        spec["ticks"] = [float(tick) for tick in self.ticks] if self.ticks else None
+        spec["ticklabels"] = list(self.ticklabels) if self.ticklabels else None
+        spec["font"] = font_key(self.font_properties)
+        spec["font_file"] = findfont(self.font_properties)
+        names = RCPARAMS + RENDER_RCPARAMS
+        spec["rcparams"] = [str(rcParams[name]) for name in names]
+
+        mappable = self.mappable
+        if mappable is not None:
+            spec["mappable"] = type(mappable).__name__
+            spec["norm"] = hash_norm(mappable.norm, mappable.get_array())
+            if spec["norm"] is None:
+                return None
+            spec["cmap"] = hash_colormap(mappable.get_cmap())
+            if isinstance(mappable, ContourSet):
+                spec["levels"] = np.asarray(mappable.levels, dtype=float)
+
+        if self.axes is not None:
+            # Rounded, as the size varies slightly with the resolution
+            size = self.axes.bbox.size * 72.0 / self.get_figure().dpi
+            spec["axes"] = np.round(size, 3)
+
+        return calculate_fingerprint(spec)
+
+    def get_geometry_stats(self):
+        """
+        Returns a :class:`dict` with the number of times the geometry was
+        computed (``computes``) and the number of invalidations coalesced
+        into an already pending computation (``skipped``).
+        """
+        return {"computes": self._ncomputes, "skipped": self._nskipped}
+
+    @contextlib.contextmanager
+    def theme(self, color=None, box_color=None, box_alpha=None):
+        """
+        Context manager within which the colorbar is drawn with other colors,
+        for instance to render a dark variant of a figure::
+
+            >>> fig.savefig("light.png")
+            >>> with colorbar.theme(color="w", box_color="k"):
+            ...     fig.savefig("dark.png")
+
+        Only the colors are re-applied: the geometry, the artists and the
+        extents of the texts computed for one theme are reused by the others.
+        The arguments left to ``None`` keep their current value.
+
+        :arg color: color of the colorbar, ticks and labels
+        :arg box_color: background color of the box
+        :arg box_alpha: transparency of the box
+        """
+        previous = (self.color, self.box_color, self.box_alpha)
+        if color is not None:
+            self.set_color(color)
+        if box_color is not None:
+            self.set_box_color(box_color)
+        if box_alpha is not None:
+            self.set_box_alpha(box_alpha)
+        self.stale = True
+
+        try:
+            yield self
+        finally:
+            self.color, self.box_color, self.box_alpha = previous
+            self.stale = True
+
+    @property
+    def timings(self):
+        """
+        :class:`DrawTimings <matplotlib_colorbar.timing.DrawTimings>` of the
+        phases of the draws of this colorbar, recorded while the timings are
+        enabled (see :mod:`matplotlib_colorbar.timing`).
+        """
+        if self._timings is None:
+            self._timings = DrawTimings()
+        return self._timings
+
+    def get_layout_stats(self):
+        """
+        Returns a :class:`dict` with the number of times the artists of the
+        colorbar were created (``builds``) and the number of times their
+        extents were measured (``measures``).
+        The artists are created in axes coordinates and reused at all
+        resolutions, while the extents are measured once per resolution and
+        output format.
+        """
+        return {"builds": self._nbuilds, "measures": self._nmeasures}
+
+    def remove(self):
+        Artist.remove(self)
+
+        # Artists bound to the axes, which they would keep alive
+        self._artists = None
+        self._extents = None
+
+    def _on_mappable_changed(self, mappable):
+        self.invalidate()
+
+    def _find_best_location(self, layout_args):
+        """
+        Returns the location code where the colorbar overlaps the least
+        content of the axes.
+        The location is cached until the content, limits or size of the axes,
+        or the size of the colorbar change.
+        """
+        ax = self.axes
+        key = (layout_args, get_content_key(ax, exclude=[self]))
+        if self._best_location is not None and self._best_location[0] == key:
+            return self._best_location[1]
+
+        occupancy = calculate_occupancy(ax, exclude=[self])
+        location = find_best_location(*layout_args, ax.bbox, occupancy)
+        self._best_location = (key, location)
+        return location
+
+    def _get_ticklabel_sizes(
+        self, orientation, ticks, ticklabels, offset_string, font_properties
+    ):
+        """
+        Returns the indexes of the labelled ticks, and the positions and
+        sizes in points along the colorbar of their labels.
+        The sizes are estimated from the font metrics.
+        """
+        indexes = [index for index, ticklabel in enumerate(ticklabels) if ticklabel]
+        strings = [offset_string + ticklabels[index] for index in indexes]
+        widths, heights, _descents = estimate_text_extents(strings, font_properties)
+
+        sizes = widths if orientation == "horizontal" else heights
+        length = self._get_axes_length(orientation)
+        positions = np.asarray(ticks, dtype=float)[indexes] * length
+        return indexes, positions, sizes
+
+    def _calculate_numticks(
+        self, orientation, length_fraction, geometry, font_properties
+    ):
+        """
+        Returns the maximum number of ticks whose labels fit along the
+        colorbar, or ``None`` if the labels of the ticks of *geometry*
+        already fit without overlapping.
+        Each tick label then takes its largest size plus a fifth of the font
+        size.
+        """
+        _positions, _values, ticks, ticklabels, offset_string = geometry
+        indexes, positions, sizes = self._get_ticklabel_sizes(
+            orientation, ticks, ticklabels, offset_string, font_properties
+        )
+        if len(indexes) < 2 or find_visible_ticklabels(positions, sizes).all():
+            return None
+
+        length = self._get_axes_length(orientation) * length_fraction
+        gap = 0.2 * font_properties.get_size_in_points()
+        return max(2, int((length + gap) // (np.max(sizes) + gap)))
+
+    def _thin_ticklabels(
+        self, orientation, ticks, ticklabels, offset_string, font_properties
+    ):
+        """
+        Returns the tick labels, where the labels overlapping a previous one
+        are replaced by an empty string.
+        """
+        indexes, positions, sizes = self._get_ticklabel_sizes(
+            orientation, ticks, ticklabels, offset_string, font_properties
         )
+        if len(indexes) < 2:
+            return ticklabels
 
-        box.axes = ax
-        box.set_figure(self.get_figure())
-        box.patch.set_color(box_color)
-        box.patch.set_alpha(box_alpha)
-        box.draw(renderer)
+        visible = find_visible_ticklabels(positions, sizes)
+
+        ticklabels = list(ticklabels)
+        for index, keep in zip(indexes, visible):
+            if not keep:
+                ticklabels[index] = ""
+        return ticklabels
+
+    def _calculate_geometry(
+        self, length_fraction, mappable, ticks, ticklabels, orientation, font_properties
+    ):
+        """
+        Returns the geometry of the colorbar, as :meth:`_calculate_colorbar`.
+        When the labels of the automatic ticks overlap, the locator is limited
+        to the number of ticks whose labels fit along the colorbar, so that
+        the labels beyond it are never created.
+        """
+        geometry = self._calculate_colorbar(
+            length_fraction, mappable, ticks, ticklabels
+        )
+        if ticks:
+            return geometry
+
+        numticks = self._calculate_numticks(
+            orientation, length_fraction, geometry, font_properties
+        )
+        if numticks is None:
+            return geometry
+
+        color_positions, color_values, ticks, ticklabels, offset_string = (
+            self._calculate_colorbar(
+                length_fraction, mappable, ticks, ticklabels, numticks
+            )
+        )
+        ticks, ticklabels = thin_ticks(ticks, ticklabels, numticks)
+        return color_positions, color_values, ticks, ticklabels, offset_string
 
     def _calculate_colorbar(
-        self, length_fraction, mappable, ticks=None, ticklabels=None,
+        self, length_fraction, mappable, ticks=None, ticklabels=None, numticks=None
     ):
         """
-        Returns the positions, colors of all intervals inside the colorbar, 
+        Returns the positions, colors of all intervals inside the colorbar,
         and tick and ticklabels.
+        If *numticks* is specified, the automatic tick locator yields at most
+        *numticks* ticks.
+        """
+        # Analytic tick engine for log, symmetrical log and power norms
+        cmap = mappable.get_cmap()
+        if (
+            not _use_reference()
+            and not isinstance(mappable, ContourSet)
+            and getattr(cmap, "colorbar_extend", False) is False
+        ):
+            result = calculate_colorbar(
+                mappable.norm, cmap.N, ticks, ticklabels, numticks
+            )
+            if result is not None:
+                color_positions, color_values, ticks, ticklabels, offset_string = result
+                return (
+                    color_positions * length_fraction,
+                    color_values[:, np.newaxis],
+                    ticks * length_fraction,
+                    ticklabels,
+                    offset_string,
+                )
+
+        return self._calculate_colorbar_dummy(
+            length_fraction, mappable, ticks, ticklabels, numticks
+        )
+
+    def _calculate_colorbar_dummy(
+        self, length_fraction, mappable, ticks=None, ticklabels=None, numticks=None
+    ):
+        """
+        Same as :meth:`_calculate_colorbar`, but always from a dummy
+        matplotlib colorbar.
+        The dummy colorbar is created in the scratch axes of the thread,
+        which are cleared afterwards, so that nothing refers to the mappable
+        once the geometry is returned.
         """
-        # Create dummy figure, axes and colorbar
-        fig_dummy = matplotlib.figure.Figure()
+        ax_dummy = _get_scratch_axes()
+        colorbar_dummy = None
 
         try:
-            # Create dummy colorbar
-            ax_dummy = fig_dummy.add_axes([0.0, 0.0, 1.0, 1.0])
+            # Create dummy colorbar, neither registered as the colorbar of the
+            # mappable nor updated when the mappable changes
+            colorbar = getattr(mappable, "colorbar", None)
+            colorbar_cid = getattr(mappable, "colorbar_cid", None)
             colorbar_dummy = colorbar_factory(ax_dummy, mappable)
+            mappable.callbacksSM.disconnect(mappable.colorbar_cid)
+            mappable.colorbar = colorbar
+            if colorbar_cid is None:
+                del mappable.colorbar_cid
+            else:
+                mappable.colorbar_cid = colorbar_cid
 
             # Set ticks
             if ticks:
@@ -415,6 +1575,8 @@ class Colorbar(Artist):
 
             # Extract ticks
             locator, formatter = colorbar_dummy._get_ticker_locator_formatter()
+            if not ticks and numticks is not None:
+                limit_locator(locator, numticks)
             ticks, ticklabels, offset_string = colorbar_dummy._ticker(
                 locator, formatter
             )
@@ -433,16 +1595,71 @@ class Colorbar(Artist):
 
             return color_positions, color_values, ticks, ticklabels, offset_string
         finally:
-            del fig_dummy
+            # Freed without the garbage collector, although the dummy colorbar
+            # and its locator refer to each other
+            if colorbar_dummy is not None:
+                vars(colorbar_dummy).clear()
+            ax_dummy.cla()
 
     def get_mappable(self):
-        return self._mappable
+        mappable = self._mappable
+        if isinstance(mappable, weakref.ref):
+            mappable = mappable()
+            if mappable is None:
+                mappable = self._replace_collected_mappable()
+        return mappable
 
     def set_mappable(self, mappable):
+        if self._mappable_cid is not None:
+            previous = self.get_mappable()
+            if previous is not None:
+                previous.callbacksSM.disconnect(self._mappable_cid)
+            self._mappable_cid = None
+
         self._mappable = mappable
+        self._mappable_summary = None
+        if self._weak_mappable and mappable is not None:
+            self._mappable = weakref.ref(mappable)
+            self._mappable_summary = (mappable.norm, mappable.get_cmap())
+
+        if hasattr(mappable, "callbacksSM"):
+            self._mappable_cid = mappable.callbacksSM.connect(
+                "changed", self._on_mappable_changed
+            )
+        self.invalidate()
 
     mappable = property(get_mappable, set_mappable)
 
+    def _replace_collected_mappable(self):
+        """
+        Replaces the garbage collected mappable by a mappable with its last
+        norm and colormap, and returns it.
+        The geometry computed from the collected mappable is kept, as it only
+        depends on the norm and colormap.
+        """
+        self._mappable = None
+        self._mappable_cid = None
+        if self._mappable_summary is None:
+            return None
+
+        norm, cmap = self._mappable_summary
+        summary = ScalarMappable(norm, cmap)
+        self._mappable = summary
+        self._mappable_cid = summary.callbacksSM.connect(
+            "changed", self._on_mappable_changed
+        )
+        return summary
+
+    def get_weak_mappable(self):
+        return self._weak_mappable
+
+    def set_weak_mappable(self, weak):
+        mappable = self.get_mappable()
+        self._weak_mappable = weak
+        self.set_mappable(mappable)
+
+    weak_mappable = property(get_weak_mappable, set_weak_mappable)
+
     def get_label(self):
         return self._label
 
@@ -452,109 +1669,110 @@ class Colorbar(Artist):
     label = property(get_label, set_label)
 
     def get_orientation(self):
-        return self._orientation
+        return self._spec.orientation
 
     def set_orientation(self, orientation):
         if orientation is not None and orientation not in ["vertical", "horizontal"]:
             raise ValueError("Unknown orientation: %s" % orientation)
         self._check_ticklocation(orientation=orientation)
-        self._orientation = orientation
+        self._set_param("orientation", orientation)
 
     orientation = property(get_orientation, set_orientation)
 
     def get_length_fraction(self):
-        return self._length_fraction
+        return self._spec.length_fraction
 
     def set_length_fraction(self, fraction):
         if fraction is not None:
             fraction = float(fraction)
             if fraction <= 0.0 or fraction > 1.0:
                 raise ValueError("Length fraction must be between ]0.0, 1.0]")
-        self._length_fraction = fraction
+        self._set_param("length_fraction", fraction)
+        self.invalidate()
 
     length_fraction = property(get_length_fraction, set_length_fraction)
 
     def get_width_fraction(self):
-        return self._width_fraction
+        return self._spec.width_fraction
 
     def set_width_fraction(self, fraction):
         if fraction is not None:
             fraction = float(fraction)
             if fraction <= 0.0 or fraction > 1.0:
                 raise ValueError("Width fraction must be between ]0.0, 1.0]")
-        self._width_fraction = fraction
+        self._set_param("width_fraction", fraction)
 
     width_fraction = property(get_width_fraction, set_width_fraction)
 
     def get_location(self):
-        return self._location
+        return self._spec.location
 
     def set_location(self, loc):
         if isinstance(loc, str):
             if loc not in self._LOCATIONS:
                 raise ValueError("Unknown location code: %s" % loc)
             loc = self._LOCATIONS[loc]
-        self._location = loc
+        self._set_param("location", loc)
 
     location = property(get_location, set_location)
 
     def get_pad(self):
-        return self._pad
+        return self._spec.pad
 
     def set_pad(self, pad):
-        self._pad = pad
+        self._set_param("pad", pad)
 
     pad = property(get_pad, set_pad)
 
     def get_border_pad(self):
-        return self._border_pad
+        return self._spec.border_pad
 
     def set_border_pad(self, pad):
-        self._border_pad = pad
+        self._set_param("border_pad", pad)
 
     border_pad = property(get_border_pad, set_border_pad)
 
     def get_sep(self):
-        return self._sep
+        return self._spec.sep
 
     def set_sep(self, sep):
-        self._sep = sep
+        self._set_param("sep", sep)
 
     sep = property(get_sep, set_sep)
 
     def get_frameon(self):
-        return self._frameon
+        return self._spec.frameon
 
     def set_frameon(self, on):
-        self._frameon = on
+        self._set_param("frameon", on)
 
     frameon = property(get_frameon, set_frameon)
 
     def get_color(self):
-        return self._color
+        return self._spec.color
 
     def set_color(self, color):
-        self._color = color
+        self._set_param("color", color)
 
     color = property(get_color, set_color)
 
     def get_box_color(self):
-        return self._box_color
+        return self._spec.box_color
 
     def set_box_color(self, color):
-        self._box_color = color
+        self._set_param("box_color", color)
 
     box_color = property(get_box_color, set_box_color)
 
     def get_box_alpha(self):
-        return self._box_alpha
+        return self._spec.box_alpha
 
     def set_box_alpha(self, alpha):
         if alpha is not None:
             alpha = float(alpha)
             if alpha < 0.0 or alpha > 1.0:
                 raise ValueError("Alpha must be between [0.0, 1.0]")
-        self._box_alpha = alpha
+        self._set_param("box_alpha", alpha)
 
     box_alpha = property(get_box_alpha, set_box_alpha)
 
@@ -567,21 +1785,23 @@ class Colorbar(Artist):
     font_properties = property(get_font_properties, set_font_properties)
 
     def get_ticks(self):
-        return self._ticks
+        return self._spec.ticks
 
     def set_ticks(self, ticks):
-        self._ticks = ticks
+        self._set_param("ticks", ticks)
+        self.invalidate()
 
     ticks = property(get_ticks, set_ticks)
 
     def get_ticklabels(self):
-        return self._ticklabels
+        return self._spec.ticklabels
 
     def set_ticklabels(self, ticklabels):
         if ticklabels is not None:
             if self.ticks and len(self.ticks) != len(ticklabels):
                 raise ValueError("Ticklabels must be the same length as " "ticks")
-        self._ticklabels = ticklabels
+        self._set_param("ticklabels", ticklabels)
+        self.invalidate()
 
     ticklabels = property(get_ticklabels, set_ticklabels)
 
@@ -603,14 +1823,22 @@ class Colorbar(Artist):
             )
 
     def get_ticklocation(self):
-        return self._ticklocation
+        return self._spec.ticklocation
 
     def set_ticklocation(self, loc):
         self._check_ticklocation(loc=loc)
-        self._ticklocation = loc
+        self._set_param("ticklocation", loc)
 
     ticklocation = property(get_ticklocation, set_ticklocation)
 
+    def get_ticklabel_thinning(self):
+        return self._spec.ticklabel_thinning
+
+    def set_ticklabel_thinning(self, on):
+        self._set_param("ticklabel_thinning", on)
+
+    ticklabel_thinning = property(get_ticklabel_thinning, set_ticklabel_thinning)
+
 
 def ColorBar(*args, **kwargs):  # pragma: no cover
     warnings.warn("Class is deprecated. Use Colorbar(...) instead", DeprecationWarning)
@@ -0,0 +1,200 @@
+"""
+Persistent on-disk cache of the rendered rasters and the geometry of the
+colorbar artist, shared by processes and runs.
+
+Each entry is a NumPy file named after the hash of its key.
+Files are written to a temporary file and renamed, so that concurrent
+processes never read a partial entry.
+Rasters are read as memory maps.
+The least recently used entries, according to their modification time, are
+removed when the size of the directory exceeds its limit.
+"""
+
+# Standard library modules.
+import hashlib
+import os
+import tempfile
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+
+# Globals and constants variables.
+
+__all__ = ["DiskCache", "set_cache_dir", "get_cache"]
+
+#: Default maximum size of the cache directory in bytes
+MAXSIZE = 256 * 1024 * 1024
+
+_EXTENSIONS = (".npy", ".npz")
+
+_cache = None
+
+
+class DiskCache:
+    """
+    Cache of arrays in a directory, bounded in size and evicting the least
+    recently used entries first.
+    """
+
+    def __init__(self, dirpath, maxsize=MAXSIZE):
+        """
+        Creates a new cache.
+
+        :arg dirpath: directory of the cache, created if it does not exist
+        :arg maxsize: maximum size of the entries in bytes
+        """
+        os.makedirs(dirpath, exist_ok=True)
+        self.dirpath = dirpath
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+    def _get_path(self, key, extension):
+        digest = hashlib.sha256(repr(key).encode("utf8")).hexdigest()
+        return os.path.join(self.dirpath, digest + extension)
+
+    def _read(self, filepath, func):
+        try:
+            value = func(filepath)
+            os.utime(filepath)  # mark as recently used
+        except (OSError, ValueError):
+            # Missing, evicted by another process or unreadable
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return value
+
+    def _write(self, filepath, func):
+        fd, tmppath = tempfile.mkstemp(suffix=".tmp", dir=self.dirpath)
+        try:
+            with os.fdopen(fd, "wb") as fp:
+                func(fp)
+            os.replace(tmppath, filepath)
+        except OSError:
+            if os.path.exists(tmppath):
+                os.remove(tmppath)
+            return
+
+        self.writes += 1
+        self.evict()
+
+    def get_array(self, key):
+        """
+        Returns the array stored under *key*, as a read-only memory map,
+        or ``None`` if *key* is not in the cache.
+        """
+        filepath = self._get_path(key, ".npy")
+        return self._read(filepath, lambda path: np.load(path, mmap_mode="r"))
+
+    def set_array(self, key, array):
+        """
+        Stores *array* under *key*.
+        """
+        filepath = self._get_path(key, ".npy")
+        self._write(filepath, lambda fp: np.save(fp, np.asarray(array)))
+
+    def get_arrays(self, key):
+        """
+        Returns the :class:`dict` of arrays stored under *key*,
+        or ``None`` if *key* is not in the cache.
+        """
+
+        def _load(path):
+            with np.load(path) as data:
+                return dict(data)
+
+        filepath = self._get_path(key, ".npz")
+        return self._read(filepath, _load)
+
+    def set_arrays(self, key, **arrays):
+        """
+        Stores the arrays given as keyword arguments under *key*.
+        """
+        filepath = self._get_path(key, ".npz")
+        self._write(filepath, lambda fp: np.savez(fp, **arrays))
+
+    def _scan(self):
+        entries = []
+        with os.scandir(self.dirpath) as it:
+            for entry in it:
+                if not entry.name.endswith(_EXTENSIONS):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def evict(self):
+        """
+        Removes the least recently used entries until the size of the cache
+        is below its maximum size.
+        """
+        entries = self._scan()
+        size = sum(entry[1] for entry in entries)
+
+        for _mtime, filesize, filepath in sorted(entries):
+            if size <= self.maxsize:
+                break
+            try:
+                os.remove(filepath)
+            except OSError:
+                pass  # Removed by another process or in use
+            else:
+                self.evictions += 1
+            size -= filesize
+
+    def clear(self):
+        """
+        Removes all entries and resets the statistics.
+        """
+        for _mtime, _size, filepath in self._scan():
+            try:
+                os.remove(filepath)
+            except OSError:
+                pass
+
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+    def get_stats(self):
+        """
+        Returns a :class:`dict` with the number of ``hits``, ``misses``,
+        ``writes`` and ``evictions`` of this process, the current ``size``
+        in bytes of the cache and its ``maxsize``.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "size": sum(entry[1] for entry in self._scan()),
+            "maxsize": self.maxsize,
+        }
+
+
+def set_cache_dir(dirpath, maxsize=MAXSIZE):
+    """
+    Sets the directory where the rendered rasters and the geometry of the
+    colorbars are cached, so that they are reused across processes.
+    ``None`` disables the on-disk cache (default).
+
+    :arg maxsize: maximum size of the cache in bytes
+    """
+    global _cache
+    _cache = DiskCache(dirpath, maxsize) if dirpath is not None else None
+
+
+def get_cache():
+    """
+    Returns the on-disk :class:`DiskCache`, or ``None`` if it is disabled.
+    """
+    return _cache
@@ -0,0 +1,213 @@
+"""
+Differential checks of the fast engines of the colorbar against the
+reference engines (see :func:`reference_engines
+<matplotlib_colorbar.colorbar.reference_engines>`).
+
+A colorbar is drawn with both engines and compared: the tick positions, the
+tick labels and the offset string must be equal, and the rendered pixels
+equal within a tolerance.
+The time of both engines is reported, without the cache of the analytic
+tick engine, which is cleared.
+
+Example::
+
+   >>> report = compare(colorbar)
+   >>> report.errors
+   []
+   >>> report.speedup
+
+The colorbar must be in a figure with an Agg canvas.
+See also the pytest plugin :mod:`matplotlib_colorbar.pytest_plugin`.
+"""
+
+# Standard library modules.
+import time
+
+# Third party modules.
+from matplotlib.testing.compare import calculate_rms
+
+import numpy as np
+
+# Local modules.
+from .colorbar import reference_engines
+from .ticker import clear_cache as clear_ticker_cache
+
+# Globals and constants variables.
+
+__all__ = ["DEFAULT_TOLERANCE", "EquivalenceReport", "compare", "assert_equivalent"]
+
+#: Default tolerance of the root mean square difference of the pixels
+DEFAULT_TOLERANCE = 0.0
+
+
+class EquivalenceReport:
+    """
+    Comparison of a colorbar drawn with the reference and fast engines.
+    The times are the shortest of the repeated draws, in seconds.
+    """
+
+    def __init__(
+        self,
+        reference_geometry,
+        fast_geometry,
+        rms,
+        tolerance,
+        reference_geometry_time,
+        fast_geometry_time,
+        reference_draw_time,
+        fast_draw_time,
+    ):
+        self.reference_geometry = reference_geometry
+        self.fast_geometry = fast_geometry
+        self.rms = rms
+        self.tolerance = tolerance
+        self.reference_geometry_time = reference_geometry_time
+        self.fast_geometry_time = fast_geometry_time
+        self.reference_draw_time = reference_draw_time
+        self.fast_draw_time = fast_draw_time
+
+    def __repr__(self):
+        return "<{}(rms={:.3f}, geometry_speedup={:.1f}, speedup={:.1f})>".format(
+            type(self).__name__, self.rms, self.geometry_speedup, self.speedup
+        )
+
+    @property
+    def errors(self):
+        """
+        Messages of the differences between the engines, empty if they are
+        equivalent.
+        """
+        _, _, reference_ticks, reference_ticklabels, reference_offset = (
+            self.reference_geometry
+        )
+        _, _, fast_ticks, fast_ticklabels, fast_offset = self.fast_geometry
+
+        errors = []
+        if not np.array_equal(reference_ticks, fast_ticks):
+            errors.append(
+                "Tick positions differ: {} != {}".format(reference_ticks, fast_ticks)
+            )
+        if list(reference_ticklabels) != list(fast_ticklabels):
+            errors.append(
+                "Tick labels differ: {} != {}".format(
+                    reference_ticklabels, fast_ticklabels
+                )
+            )
+        if reference_offset != fast_offset:
+            errors.append(
+                "Offset strings differ: {!r} != {!r}".format(
+                    reference_offset, fast_offset
+                )
+            )
+        if self.rms > self.tolerance:
+            errors.append(
+                "Pixels differ: RMS {:.3f} > {:.3f}".format(self.rms, self.tolerance)
+            )
+        return errors
+
+    @property
+    def geometry_speedup(self):
+        """
+        Ratio of the time of the reference and fast calculations of the
+        geometry.
+        """
+        return self.reference_geometry_time / self.fast_geometry_time
+
+    @property
+    def speedup(self):
+        """
+        Ratio of the time of the reference and fast draws of the colorbar,
+        from its geometry to the rendering of its artists.
+        """
+        return self.reference_draw_time / self.fast_draw_time
+
+
+def _calculate_geometry(colorbar):
+    return colorbar._calculate_geometry(
+        colorbar._get_value("length_fraction"),
+        colorbar.get_mappable(),
+        colorbar.ticks,
+        colorbar.ticklabels,
+        colorbar._get_value("orientation"),
+        colorbar.font_properties,
+    )
+
+
+def _render(figure):
+    figure.canvas.draw()
+    return np.array(figure.canvas.buffer_rgba())[..., :3].astype(float)
+
+
+def _time(func, repeat):
+    times = []
+    for _ in range(repeat):
+        clear_ticker_cache()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def _time_draw(colorbar, renderer, repeat):
+    def draw():
+        colorbar.invalidate()
+        colorbar.draw(renderer)
+
+    return _time(draw, repeat)
+
+
+def _compare(colorbar, tolerance, repeat):
+    figure = colorbar.get_figure()
+
+    # Caches of texts filled before the draws are timed
+    fast_pixels = _render(figure)
+    renderer = figure.canvas.get_renderer()
+    fast_geometry = _calculate_geometry(colorbar)
+    fast_geometry_time = _time(lambda: _calculate_geometry(colorbar), repeat)
+    fast_draw_time = _time_draw(colorbar, renderer, repeat)
+
+    with reference_engines():
+        reference_pixels = _render(figure)
+        reference_geometry = _calculate_geometry(colorbar)
+        reference_geometry_time = _time(lambda: _calculate_geometry(colorbar), repeat)
+        reference_draw_time = _time_draw(colorbar, renderer, repeat)
+
+    return EquivalenceReport(
+        reference_geometry,
+        fast_geometry,
+        calculate_rms(reference_pixels, fast_pixels),
+        tolerance,
+        reference_geometry_time,
+        fast_geometry_time,
+        reference_draw_time,
+        fast_draw_time,
+    )
+
+
+def compare(colorbar, tolerance=DEFAULT_TOLERANCE, repeat=3):
+    """
+    Draws *colorbar* with the fast and reference engines, and returns an
+    :class:`EquivalenceReport`.
+    The figure of the colorbar is drawn again with the fast engines
+    afterwards.
+
+    :arg colorbar: colorbar in a figure with an Agg canvas
+    :arg tolerance: maximum root mean square difference of the pixels
+    :arg repeat: number of times each engine is timed
+    """
+    try:
+        return _compare(colorbar, tolerance, repeat)
+    finally:
+        colorbar.get_figure().canvas.draw()
+
+
+def assert_equivalent(colorbar, tolerance=DEFAULT_TOLERANCE, repeat=3):
+    """
+    Same as :func:`compare`, but raises an :exc:`AssertionError` listing the
+    differences if the engines are not equivalent.
+    """
+    report = compare(colorbar, tolerance, repeat)
+    errors = report.errors
+    if errors:
+        raise AssertionError("\n".join(errors))
+    return report
@@ -0,0 +1,123 @@
+"""
+Content fingerprints of colorbars, stable across processes and runs.
+
+The inputs of a colorbar are canonicalized into nested tuples of strings,
+numbers and ``None``, whose representation is hashed with SHA-256.
+The hash of the lookup table of a colormap is memoized per colormap object.
+"""
+
+# Standard library modules.
+import copy
+import hashlib
+import numbers
+import threading
+import weakref
+
+# Third party modules.
+import matplotlib
+
+import numpy as np
+
+# Local modules.
+
+# Globals and constants variables.
+
+__all__ = ["canonicalize", "hash_colormap", "hash_norm", "calculate_fingerprint"]
+
+_PRIMITIVES = (type(None), bool, float, str)
+
+_colormap_hashes = {}
+_colormap_hashes_lock = threading.Lock()
+
+
+def _hash_bytes(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def canonicalize(value):
+    """
+    Returns *value* as nested tuples of strings, numbers and ``None``, whose
+    representation is the same in every process.
+    Numbers are converted to :class:`float`, so that equal integers and
+    floats are the same.
+    Arrays are replaced by their data type, shape and hash.
+
+    :raise TypeError: if *value* cannot be canonicalized
+    """
+    if type(value) in _PRIMITIVES:
+        return value
+    if isinstance(value, (list, tuple)):
+        return tuple(canonicalize(v) for v in value)
+    if isinstance(value, np.generic):
+        value = value.item()
+    if value is None or isinstance(value, (bool, str)):
+        return value
+    if isinstance(value, np.ndarray):
+        value = np.ascontiguousarray(value)
+        return ("array", value.dtype.str, value.shape, _hash_bytes(value.tobytes()))
+    if isinstance(value, numbers.Real):
+        return float(value)
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), canonicalize(v)) for k, v in value.items()))
+
+    raise TypeError("Cannot canonicalize {!r}".format(value))
+
+
+def hash_colormap(cmap):
+    """
+    Returns the hash of the lookup table of the colors of *cmap*, followed by
+    its under, over and bad colors.
+    The hash of the lookup table is computed once per colormap object.
+    """
+    if not cmap._isinit:
+        cmap._init()
+
+    key = id(cmap)
+    with _colormap_hashes_lock:
+        digest = _colormap_hashes.get(key)
+        if digest is None:
+            lut = np.ascontiguousarray(cmap._lut[: cmap.N], dtype=np.float64)
+            digest = _hash_bytes(lut.tobytes())
+            _colormap_hashes[key] = digest
+            weakref.finalize(cmap, _colormap_hashes.pop, key, None)
+
+    # Under, over and bad colors are changed in place in the lookup table
+    extremes = np.asarray(cmap._lut[cmap.N :], dtype=np.float64)
+    return (digest, tuple(extremes.ravel().tolist()))
+
+
+def hash_norm(norm, array=None):
+    """
+    Returns the class and parameters of *norm*.
+    Only the numbers, strings and arrays of its attributes are considered.
+    If *norm* is not scaled, its limits are taken from *array*, as when it is
+    drawn, or ``None`` is returned without *array*.
+    """
+    if not norm.scaled():
+        if array is None:
+            return None
+        norm = copy.copy(norm)
+        norm.autoscale_None(array)
+        if not norm.scaled():
+            return None
+
+    cls = type(norm)
+    params = []
+    for name, value in sorted(vars(norm).items()):
+        if isinstance(value, np.ma.MaskedArray):
+            value = value.filled(np.nan)
+        if isinstance(value, (numbers.Number, str, type(None), np.ndarray)):
+            params.append((name, canonicalize(value)))
+    return ("{}.{}".format(cls.__module__, cls.__qualname__), tuple(params))
+
+
+def calculate_fingerprint(spec):
+    """
+    Returns the hexadecimal SHA-256 hash of *spec*, a :class:`dict` of the
+    inputs of a colorbar.
+    The versions of this package and matplotlib are part of the hash.
+    """
+    from . import __version__  # late import
+
+    spec = dict(spec, versions=(__version__, matplotlib.__version__))
+    return _hash_bytes(repr(canonicalize(spec)).encode("utf8"))
@@ -0,0 +1,251 @@
+"""
+Interactive control of the colorbar artist.
+"""
+
+# Standard library modules.
+import time
+
+# Third party modules.
+from matplotlib.image import AxesImage
+from matplotlib.transforms import Bbox
+
+import numpy as np
+
+# Local modules.
+
+# Globals and constants variables.
+
+__all__ = ["ClimDragger"]
+
+
+class ClimDragger:
+    """
+    Changes the color limits of the mappable of a colorbar by dragging the
+    ends of the bar with the mouse.
+    Pressing over the lower (or left) half of the bar drags the minimum,
+    over the upper (or right) half, the maximum.
+
+    During a drag, only the mappable and the colorbar are redrawn, over a
+    saved background (blitting), and the color limits are updated at most
+    once per frame.
+    An image is redrawn from a copy subsampled to the resolution of its axes,
+    and at full resolution once the drag ends.
+    """
+
+    def __init__(self, colorbar, max_fps=60.0, button=1):
+        """
+        Creates a new controller. Call :meth:`connect` to start handling
+        the mouse events of the canvas.
+
+        :arg colorbar: :class:`Colorbar <matplotlib_colorbar.colorbar.Colorbar>`
+        :arg max_fps: maximum number of updates of the color limits per
+            second (``None``, no limit)
+        :arg button: mouse button to drag with
+        """
+        self.colorbar = colorbar
+        self.max_fps = max_fps
+        self.button = button
+        self.nupdates = 0
+
+        self._clock = time.perf_counter
+        self._cids = []
+        self._drag = None
+        self._pending = None
+        self._last_update = float("-inf")
+        self._timer = None
+        self._background = None
+        self._blit_bbox = None
+        self._artists = []
+        self._states = []
+
+    def connect(self):
+        """
+        Connects the controller to the mouse events of the canvas.
+        """
+        canvas = self.colorbar.figure.canvas
+        self._cids = [
+            canvas.mpl_connect("button_press_event", self._on_press),
+            canvas.mpl_connect("motion_notify_event", self._on_motion),
+            canvas.mpl_connect("button_release_event", self._on_release),
+        ]
+
+    def disconnect(self):
+        """
+        Disconnects the controller from the canvas.
+        """
+        canvas = self.colorbar.figure.canvas
+        for cid in self._cids:
+            canvas.mpl_disconnect(cid)
+        self._cids = []
+
+    def is_dragging(self):
+        """
+        Returns whether an end of the colorbar is being dragged.
+        """
+        return self._drag is not None
+
+    def _on_press(self, event):
+        if event.button != self.button or self._drag is not None:
+            return
+        if event.x is None or self.colorbar.get_value_at(event.x, event.y) is None:
+            return
+
+        hit_cache = self.colorbar._hit_cache
+        x0, y0, x1, y1 = hit_cache["bar_extent"]
+        horizontal = hit_cache["orientation"] == "horizontal"
+        low, high, position = (x0, x1, event.x) if horizontal else (y0, y1, event.y)
+        end = "vmin" if position - low < (high - low) / 2 else "vmax"
+
+        # Values at the ends and centers of the colors of the bar, as drawn
+        # before the drag, whatever the norm
+        boundaries = hit_cache["boundaries"]
+        vmin, vmax = self.colorbar.mappable.get_clim()
+        positions = np.concatenate(
+            [boundaries[:1], (boundaries[:-1] + boundaries[1:]) / 2, boundaries[-1:]]
+        )
+        values = np.concatenate([[vmin], hit_cache["values"], [vmax]])
+
+        self._drag = (end, horizontal, positions, values)
+        self._start_blit()
+
+    def _on_motion(self, event):
+        if self._drag is None or event.x is None:
+            return
+
+        self._pending = self._find_value(event)
+
+        if self.max_fps is None:
+            self._flush()
+            return
+
+        interval = 1.0 / self.max_fps
+        elapsed = self._clock() - self._last_update
+        if elapsed >= interval:
+            self._flush()
+        elif self._timer is None:
+            self._timer = self.colorbar.figure.canvas.new_timer(
+                interval=int((interval - elapsed) * 1000)
+            )
+            self._timer.single_shot = True
+            self._timer.add_callback(self._flush)
+            self._timer.start()
+
+    def _on_release(self, event):
+        if self._drag is None or event.button != self.button:
+            return
+
+        if event.x is not None:
+            self._pending = self._find_value(event)
+        self._flush()
+        self._stop_blit()
+        self._drag = None
+
+        self.colorbar.figure.canvas.draw_idle()
+
+    def _find_value(self, event):
+        # Interpolated between the values of the bar, extrapolated from the
+        # nearest end outside of it
+        _end, horizontal, positions, values = self._drag
+        position = event.x if horizontal else event.y
+
+        if position < positions[0]:
+            index = 0
+        elif position > positions[-1]:
+            index = len(positions) - 2
+        else:
+            return float(np.interp(position, positions, values))
+
+        p0, p1 = positions[index], positions[index + 1]
+        v0, v1 = values[index], values[index + 1]
+        if p1 == p0:
+            return float(v0)
+        return float(v0 + (position - p0) * (v1 - v0) / (p1 - p0))
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.stop()
+            self._timer = None
+
+        if self._drag is None or self._pending is None:
+            return
+
+        value = self._pending
+        self._pending = None
+
+        mappable = self.colorbar.mappable
+        vmin, vmax = mappable.get_clim()
+        if self._drag[0] == "vmin":
+            vmin = value
+        else:
+            vmax = value
+        if not vmin < vmax:
+            return
+
+        mappable.set_clim(vmin, vmax)
+        self.nupdates += 1
+        self._last_update = self._clock()
+        self._blit()
+
+    def _create_preview(self, image):
+        ax = image.axes
+        array = image.get_array()
+        rowstep = max(1, int(round(array.shape[0] / max(1.0, ax.bbox.height))))
+        columnstep = max(1, int(round(array.shape[1] / max(1.0, ax.bbox.width))))
+
+        preview = AxesImage(
+            ax,
+            cmap=image.get_cmap(),
+            norm=image.norm,
+            interpolation="nearest",
+            origin=image.origin,
+            extent=image.get_extent(),
+        )
+        preview.update_from(image)
+        preview.set_figure(image.figure)
+        preview.set_data(array[::rowstep, ::columnstep])
+        return preview
+
+    def _start_blit(self):
+        colorbar = self.colorbar
+        mappable = colorbar.mappable
+        canvas = colorbar.figure.canvas
+
+        # Artists to hide from the background, with their state to restore
+        self._states = [
+            (colorbar, colorbar.get_visible(), colorbar.get_animated()),
+            (mappable, mappable.get_visible(), mappable.get_animated()),
+        ]
+
+        if isinstance(mappable, AxesImage):
+            preview = self._create_preview(mappable)
+            mappable.set_visible(False)
+            self._artists = [preview, colorbar]
+        else:
+            mappable.set_animated(True)
+            self._artists = [mappable, colorbar]
+        colorbar.set_animated(True)
+
+        canvas.draw()
+        self._background = canvas.copy_from_bbox(colorbar.figure.bbox)
+        self._blit_bbox = Bbox.union([mappable.axes.bbox, colorbar.axes.bbox])
+        self._blit()
+
+    def _stop_blit(self):
+        for artist, visible, animated in self._states:
+            artist.set_visible(visible)
+            artist.set_animated(animated)
+
+        self._states = []
+        self._artists = []
+        self._background = None
+        self._blit_bbox = None
+
+    def _blit(self):
+        if self._background is None:
+            return
+
+        canvas = self.colorbar.figure.canvas
+        canvas.restore_region(self._background)
+        for artist in self._artists:
+            artist.axes.draw_artist(artist)
+        canvas.blit(self._blit_bbox)
@@ -0,0 +1,269 @@
+"""
+Analytic layout engine for the colorbar artist.
+
+The colorbar box (bar, ticks and tick labels) and the label box are packed
+and anchored in the axes in a single pass from their extents, following the
+same geometry as matplotlib's :class:`VPacker <matplotlib.offsetbox.VPacker>`,
+:class:`HPacker <matplotlib.offsetbox.HPacker>` and
+:class:`AnchoredOffsetbox <matplotlib.offsetbox.AnchoredOffsetbox>`,
+which measure their children several times per draw.
+
+The ``best`` location is found by scoring the candidate locations against a
+coarse occupancy grid of the axes content.
+"""
+
+# Standard library modules.
+
+# Third party modules.
+from matplotlib.transforms import Bbox
+
+import numpy as np
+
+# Local modules.
+
+# Globals and constants variables.
+
+__all__ = [
+    "calculate_layout",
+    "calculate_occupancy",
+    "get_content_key",
+    "find_best_location",
+]
+
+#: Number of cells along each side of the occupancy grid
+GRIDSIZE = 32
+
+_ANCHORS = {
+    1: "NE",
+    2: "NW",
+    3: "SW",
+    4: "SE",
+    5: "E",
+    6: "W",
+    7: "E",
+    8: "S",
+    9: "N",
+    10: "C",
+}
+
+
+def _pack_vertical(sizes, sep):
+    # Same as VPacker with align="center" and boxes without descent
+    widths, heights = zip(*sizes)
+
+    width = max(widths)
+    xoffsets = [(width - w) * 0.5 for w in widths]
+
+    offsets_ = np.cumsum([0] + [h + sep for h in heights])
+    height = offsets_[-1] - sep
+    yoffsets = offsets_[:-1] + heights
+    ydescent = height - yoffsets[0]
+    yoffsets = height - yoffsets - ydescent
+
+    return width, height, 0.0, ydescent, list(zip(xoffsets, yoffsets))
+
+
+def _pack_horizontal(sizes, sep):
+    # Same as HPacker with align="center" and boxes without descent
+    widths, heights = zip(*sizes)
+
+    height = max(heights)
+    yoffsets = [(height - h) * 0.5 for h in heights]
+
+    offsets_ = np.cumsum([0] + [w + sep for w in widths])
+    width = offsets_[-1] - sep
+    xoffsets = offsets_[:-1]
+
+    return width, height, 0.0, 0.0, list(zip(xoffsets, yoffsets))
+
+
+def calculate_layout(sizes, vertical, loc, pad, borderpad, sep, parentbbox):
+    """
+    Returns the frame and the lower left corners of boxes packed and anchored
+    in *parentbbox*, all in display units.
+
+    :arg sizes: widths and heights of the boxes, from top to bottom if
+        *vertical*, otherwise from left to right
+    :arg vertical: whether the boxes are packed vertically or horizontally
+    :arg loc: location code of the anchored boxes (1 to 10)
+    :arg pad: padding between the frame and the boxes
+    :arg borderpad: padding between the frame and *parentbbox*
+    :arg sep: separation between the boxes
+    :arg parentbbox: :class:`Bbox <matplotlib.transforms.Bbox>` in which the
+        boxes are anchored
+    """
+    if vertical:
+        width, height, xdescent, ydescent, offsets = _pack_vertical(sizes, sep)
+    else:
+        width, height, xdescent, ydescent, offsets = _pack_horizontal(sizes, sep)
+
+    width += 2 * pad
+    height += 2 * pad
+    xdescent += pad
+    ydescent += pad
+
+    container = parentbbox.padded(-borderpad)
+    bbox = Bbox.from_bounds(0, 0, width, height)
+    anchored_bbox = bbox.anchored(_ANCHORS[loc], container=container)
+    px = anchored_bbox.x0 + xdescent
+    py = anchored_bbox.y0 + ydescent
+
+    frame = Bbox.from_bounds(px - xdescent, py - ydescent, width, height)
+    corners = [(px + ox, py + oy) for ox, oy in offsets]
+
+    return frame, corners
+
+
+def _get_content(ax, exclude):
+    lines = [a for a in ax.lines if a.get_visible() and a not in exclude]
+    patches = [a for a in ax.patches if a.get_visible() and a not in exclude]
+    collections = [a for a in ax.collections if a.get_visible() and a not in exclude]
+    images = [a for a in ax.images if a.get_visible() and a not in exclude]
+    return lines, patches, collections, images
+
+
+def get_content_key(ax, exclude=()):
+    """
+    Returns a hashable key of the content and limits of *ax*, which changes
+    when the data of its lines, patches, collections or images are replaced,
+    or when the view limits or size of the axes change.
+
+    :arg exclude: artists to ignore
+    """
+    lines, patches, collections, images = _get_content(ax, exclude)
+    return (
+        ax.viewLim.bounds,
+        ax.bbox.bounds,
+        tuple((id(a), id(a.get_xydata())) for a in lines),
+        tuple((id(a), a.get_extents().bounds) for a in patches),
+        tuple((id(a), id(a.get_offsets())) for a in collections),
+        tuple((id(a), id(a.get_array())) for a in images),
+    )
+
+
+def _bin(values, start, length, gridsize):
+    return np.floor((values - start) / length * gridsize).astype(int)
+
+
+def calculate_occupancy(ax, exclude=(), gridsize=GRIDSIZE):
+    """
+    Returns the occupancy grid of the content of *ax*, as an array of shape
+    ``(gridsize, gridsize)`` indexed by row (from the bottom) and column
+    (from the left) of the cells dividing the axes.
+    Each cell counts the vertices of lines, the offsets of collections,
+    the patches overlapping it and whether it shows unmasked image pixels.
+
+    :arg exclude: artists to ignore
+    """
+    lines, patches, collections, images = _get_content(ax, exclude)
+    x0, y0, width, height = ax.bbox.bounds
+    occupancy = np.zeros((gridsize, gridsize))
+
+    if width <= 0 or height <= 0:
+        return occupancy
+
+    # Points
+    points = [line.get_transform().transform(line.get_xydata()) for line in lines]
+    for collection in collections:
+        offsets = collection.get_offsets()
+        if len(offsets):
+            points.append(collection.get_offset_transform().transform(offsets))
+
+    if points:
+        points = np.concatenate(points)
+        points = points[np.isfinite(points).all(axis=1)]
+        occupancy += np.histogram2d(
+            points[:, 1],
+            points[:, 0],
+            bins=gridsize,
+            range=[[y0, y0 + height], [x0, x0 + width]],
+        )[0]
+
+    # Patches inside the axes, added to a grid of differences
+    extents = np.array(
+        [
+            patch.get_path().get_extents(patch.get_transform()).extents
+            for patch in patches
+        ]
+    ).reshape(-1, 4)
+    extents = extents[
+        (extents[:, 0] <= x0 + width)
+        & (extents[:, 2] >= x0)
+        & (extents[:, 1] <= y0 + height)
+        & (extents[:, 3] >= y0)
+    ]
+    if len(extents):
+        columns = np.clip(_bin(extents[:, 0::2], x0, width, gridsize), 0, gridsize - 1)
+        rows = np.clip(_bin(extents[:, 1::2], y0, height, gridsize), 0, gridsize - 1)
+
+        differences = np.zeros((gridsize + 1, gridsize + 1))
+        np.add.at(differences, (rows[:, 0], columns[:, 0]), 1)
+        np.add.at(differences, (rows[:, 0], columns[:, 1] + 1), -1)
+        np.add.at(differences, (rows[:, 1] + 1, columns[:, 0]), -1)
+        np.add.at(differences, (rows[:, 1] + 1, columns[:, 1] + 1), 1)
+        occupancy += differences.cumsum(axis=0).cumsum(axis=1)[:-1, :-1]
+
+    # Images, sampled at the center of the cells
+    centers = (np.arange(gridsize) + 0.5) / gridsize
+    for image in images:
+        array = image.get_array()
+        if array is None or array.ndim < 2:
+            continue
+
+        xs = x0 + centers * width
+        ys = y0 + centers * height
+        xs, ys = np.meshgrid(xs, ys)
+        xys = ax.transData.inverted().transform(
+            np.column_stack([xs.ravel(), ys.ravel()])
+        )
+
+        left, right, bottom, top = image.get_extent()
+        columns = _bin(xys[:, 0], left, right - left, array.shape[1])
+        if image.origin == "upper":
+            rows = _bin(xys[:, 1], top, bottom - top, array.shape[0])
+        else:
+            rows = _bin(xys[:, 1], bottom, top - bottom, array.shape[0])
+
+        inside = (
+            (columns >= 0)
+            & (columns < array.shape[1])
+            & (rows >= 0)
+            & (rows < array.shape[0])
+        )
+        mask = np.ma.getmaskarray(array)
+        if mask.ndim > 2:
+            mask = mask.all(axis=tuple(range(2, mask.ndim)))
+        inside[inside] = ~mask[rows[inside], columns[inside]]
+        occupancy += inside.reshape(gridsize, gridsize)
+
+    return occupancy
+
+
+def find_best_location(sizes, vertical, pad, borderpad, sep, parentbbox, occupancy):
+    """
+    Returns the location code (1 to 10) where the packed boxes overlap the
+    least content, according to the *occupancy* grid of *parentbbox*
+    (see :func:`calculate_occupancy`).
+    As for legends, the first location in order of code wins ties.
+    The other arguments are the same as :func:`calculate_layout`.
+    """
+    rows, columns = occupancy.shape
+    integral = np.zeros((rows + 1, columns + 1))
+    integral[1:, 1:] = occupancy.cumsum(axis=0).cumsum(axis=1)
+
+    x0, y0, width, height = parentbbox.bounds
+    frames = [
+        calculate_layout(sizes, vertical, loc, pad, borderpad, sep, parentbbox)[0]
+        for loc in _ANCHORS
+    ]
+    extents = np.array([frame.extents for frame in frames])
+
+    c0 = np.clip(np.floor((extents[:, 0] - x0) / width * columns), 0, columns)
+    c1 = np.clip(np.ceil((extents[:, 2] - x0) / width * columns), 0, columns)
+    r0 = np.clip(np.floor((extents[:, 1] - y0) / height * rows), 0, rows)
+    r1 = np.clip(np.ceil((extents[:, 3] - y0) / height * rows), 0, rows)
+    c0, c1, r0, r1 = (a.astype(int) for a in (c0, c1, r0, r1))
+
+    scores = integral[r1, c1] - integral[r0, c1] - integral[r1, c0] + integral[r0, c0]
+
+    return list(_ANCHORS)[int(np.argmin(scores))]
@@ -0,0 +1,149 @@
+"""
+Metrics of the draws of all colorbars, to check how the caches behave in
+production.
+
+The counters are:
+    - ``draws``: number of draws
+    - ``raster_hits``: draws from a raster of the on-disk cache
+    - ``geometry_hits``: draws reusing a geometry (colors and ticks), from
+      the colorbar itself, the shared memory or the disk
+    - ``geometry_misses``: draws computing the geometry
+    - ``text_metric_hits``: draws reusing the measured extents of the texts
+    - ``text_metric_misses``: draws measuring the extents of the texts
+    - ``artist_rebuilds``: draws creating the artists of the colorbar
+    - ``skipped_recomputes``: invalidations coalesced into an already
+      pending computation of the geometry
+
+The durations of the draws are counted in the buckets of
+:data:`DRAW_TIME_BUCKETS`.
+A hook can be called when a draw is slower than a threshold (see
+:func:`set_slow_draw_hook`).
+
+Example::
+
+   >>> from matplotlib_colorbar import metrics
+   >>> metrics.set_slow_draw_hook(0.05)  # logs draws over 50 ms
+   >>> fig.savefig("figure.png")
+   >>> metrics.get_metrics()["geometry_hits"]
+"""
+
+# Standard library modules.
+import logging
+import threading
+
+# Third party modules.
+
+# Local modules.
+
+# Globals and constants variables.
+
+__all__ = [
+    "COUNTERS",
+    "DRAW_TIME_BUCKETS",
+    "increment",
+    "record_draw",
+    "get_metrics",
+    "clear",
+    "set_slow_draw_hook",
+]
+
+logger = logging.getLogger(__name__)
+
+#: Names of the counters
+COUNTERS = (
+    "draws",
+    "raster_hits",
+    "geometry_hits",
+    "geometry_misses",
+    "text_metric_hits",
+    "text_metric_misses",
+    "artist_rebuilds",
+    "skipped_recomputes",
+)
+
+#: Upper bounds of the buckets of the histogram of the draw times, in seconds
+DRAW_TIME_BUCKETS = (0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0)
+
+_lock = threading.Lock()
+_counters = dict.fromkeys(COUNTERS, 0)
+_draw_times = [0] * (len(DRAW_TIME_BUCKETS) + 1)  # last bucket is unbounded
+
+_slow_draw_threshold = None
+_slow_draw_callback = None
+
+
+def _log_slow_draw(colorbar, seconds):
+    logger.warning(
+        "Draw of colorbar %r took %.1f ms", colorbar.get_label(), seconds * 1e3
+    )
+
+
+def increment(name, count=1):
+    """
+    Adds *count* to the counter *name*.
+    """
+    with _lock:
+        _counters[name] += count
+
+
+def record_draw(colorbar, seconds):
+    """
+    Records a draw of *colorbar* which took *seconds*, and calls the slow
+    draw hook if it is over the threshold.
+    """
+    index = 0
+    while index < len(DRAW_TIME_BUCKETS) and seconds > DRAW_TIME_BUCKETS[index]:
+        index += 1
+
+    with _lock:
+        _counters["draws"] += 1
+        _draw_times[index] += 1
+        threshold, callback = _slow_draw_threshold, _slow_draw_callback
+
+    if threshold is not None and seconds > threshold:
+        callback(colorbar, seconds)
+
+
+def get_metrics():
+    """
+    Returns a :class:`dict` with the value of each counter of
+    :data:`COUNTERS` and the histogram of the draw times (``draw_times``),
+    a :class:`dict` of the number of draws up to each bound of
+    :data:`DRAW_TIME_BUCKETS` (and over the last bound, with key ``inf``).
+    """
+    bounds = DRAW_TIME_BUCKETS + (float("inf"),)
+    with _lock:
+        metrics = dict(_counters)
+        metrics["draw_times"] = dict(zip(bounds, _draw_times))
+    return metrics
+
+
+def clear():
+    """
+    Resets all the counters and the histogram.
+    The slow draw hook is kept.
+    """
+    with _lock:
+        _counters.update(dict.fromkeys(COUNTERS, 0))
+        _draw_times[:] = [0] * len(_draw_times)
+
+
+def set_slow_draw_hook(threshold, callback=None):
+    """
+    Sets the hook called when a draw of a colorbar is slower than
+    *threshold*.
+
+    :arg threshold: duration in seconds, or ``None`` to disable the hook
+    :arg callback: function called with the colorbar and the duration of its
+        draw in seconds. By default, a warning is logged to the
+        ``matplotlib_colorbar.metrics`` logger.
+    """
+    global _slow_draw_threshold, _slow_draw_callback
+    if threshold is not None and threshold < 0:
+        raise ValueError("Threshold must be positive")
+    if callback is None:
+        callback = _log_slow_draw
+
+    with _lock:
+        _slow_draw_threshold = threshold
+        _slow_draw_callback = callback
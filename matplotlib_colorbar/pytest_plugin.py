@@ -0,0 +1,81 @@
+"""
+Pytest plugin checking the fast engines of colorbars against the reference
+engines, with :mod:`matplotlib_colorbar.equivalence`.
+
+Enabled with ``-p matplotlib_colorbar.pytest_plugin`` or in a
+``conftest.py``::
+
+   pytest_plugins = ["matplotlib_colorbar.pytest_plugin"]
+
+It provides the fixture ``colorbar_equivalence``, a function asserting that
+a colorbar is drawn the same by both engines::
+
+   def test_lognorm(colorbar_equivalence):
+       ...
+       colorbar_equivalence(colorbar)
+
+The speedups of the fast engines are reported at the end of the session.
+The tolerance of the pixels is set with the option
+``--colorbar-tolerance``.
+"""
+
+# Standard library modules.
+import math
+
+# Third party modules.
+import pytest
+
+# Local modules.
+from .equivalence import DEFAULT_TOLERANCE, assert_equivalent
+
+# Globals and constants variables.
+
+_reports_key = pytest.StashKey()
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--colorbar-tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="RMS tolerance of the pixels of colorbars drawn with the fast "
+        "and reference engines",
+    )
+
+
+def pytest_configure(config):
+    config.stash[_reports_key] = []
+
+
+@pytest.fixture
+def colorbar_equivalence(request):
+    config = request.config
+    tolerance = config.getoption("--colorbar-tolerance")
+
+    def check(colorbar, repeat=3):
+        report = assert_equivalent(colorbar, tolerance, repeat)
+        config.stash[_reports_key].append((request.node.nodeid, report))
+        return report
+
+    return check
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    reports = config.stash.get(_reports_key, [])
+    if not reports:
+        return
+
+    terminalreporter.section("colorbar equivalence")
+    for nodeid, report in reports:
+        terminalreporter.write_line(
+            "{}: geometry {:.1f}x, draw {:.1f}x, rms {:.3f}".format(
+                nodeid, report.geometry_speedup, report.speedup, report.rms
+            )
+        )
+
+    # Geometric means, as the speedups are ratios
+    for name in ["geometry_speedup", "speedup"]:
+        mean = math.exp(
+            sum(math.log(getattr(report, name)) for _, report in reports) / len(reports)
+        )
+        terminalreporter.write_line("mean {}: {:.1f}x".format(name, mean))
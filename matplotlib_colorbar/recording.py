@@ -0,0 +1,118 @@
+"""
+Recording of the draw primitives emitted to a renderer, to profile the
+artists of a colorbar.
+
+Example::
+
+   >>> with RecordingRenderer(renderer) as recorder:
+   ...     colorbar.draw(renderer)
+   >>> recorder.get_stats()["draw_path"]
+
+The methods of the primitives are replaced on the renderer itself, so that
+it keeps its type, and restored on exit.
+Only the calls of the artists are counted, not the calls made by the
+renderer to implement another primitive (for instance, a collection drawn
+path by path).
+"""
+
+# Standard library modules.
+
+# Third party modules.
+
+# Local modules.
+
+# Globals and constants variables.
+
+__all__ = ["PRIMITIVES", "RecordingRenderer"]
+
+#: Draw primitives recorded
+PRIMITIVES = (
+    "draw_path",
+    "draw_path_collection",
+    "draw_image",
+    "draw_text",
+    "draw_markers",
+)
+
+
+def _path_collection_nbytes(gc, master_transform, paths, *args, **kwargs):
+    return sum(path.vertices.nbytes for path in paths)
+
+
+#: Bytes of vertices of the paths of each primitive, from its arguments
+_VERTEX_BYTES = {
+    "draw_path": lambda gc, path, *args, **kwargs: path.vertices.nbytes,
+    "draw_path_collection": _path_collection_nbytes,
+    "draw_markers": lambda gc, marker_path, marker_trans, path, *args, **kwargs: (
+        marker_path.vertices.nbytes + path.vertices.nbytes
+    ),
+}
+
+
+class RecordingRenderer:
+    """
+    Context manager counting the calls of the draw primitives of a renderer,
+    and the bytes of vertices of the paths they draw.
+    """
+
+    def __init__(self, renderer):
+        """
+        Creates a recorder.
+
+        :arg renderer: any renderer, including mixed mode renderers
+        """
+        self.renderer = renderer
+        self._originals = None
+        self._depth = 0
+        self.clear()
+
+    def __enter__(self):
+        renderer = self.renderer
+        self._originals = {}
+        for name in PRIMITIVES:
+            if not hasattr(renderer, name):
+                continue
+
+            # Instance attributes (bound by some renderers) are restored too
+            self._originals[name] = renderer.__dict__.get(name)
+            setattr(renderer, name, self._wrap(name, getattr(renderer, name)))
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        for name, original in self._originals.items():
+            if original is None:
+                del self.renderer.__dict__[name]
+            else:
+                setattr(self.renderer, name, original)
+        self._originals = None
+
+    def _wrap(self, name, method):
+        nbytes = _VERTEX_BYTES.get(name)
+
+        def record(*args, **kwargs):
+            if self._depth == 0:
+                self.counts[name] += 1
+                if nbytes is not None:
+                    self.vertex_bytes += nbytes(*args, **kwargs)
+
+            self._depth += 1
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self._depth -= 1
+
+        return record
+
+    def clear(self):
+        """
+        Resets the counts.
+        """
+        self.counts = dict.fromkeys(PRIMITIVES, 0)
+        self.vertex_bytes = 0
+
+    def get_stats(self):
+        """
+        Returns a :class:`dict` with the number of calls of each primitive
+        and the bytes of vertices drawn (``vertex_bytes``).
+        """
+        return dict(self.counts, vertex_bytes=self.vertex_bytes)
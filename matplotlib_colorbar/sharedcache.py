@@ -0,0 +1,257 @@
+"""
+Cache of the geometry of the colorbar artist in shared memory, for the
+processes of a pool of workers.
+
+Each entry is a segment of shared memory named after the namespace of the
+cache and the hash of its key.
+A process creating an entry writes its arrays, then sets a flag in the first
+byte of the segment.
+Readers never wait: an entry which does not exist or is not complete is a
+miss, and its arrays are otherwise returned as read-only views of the shared
+memory, without copy.
+"""
+
+# Standard library modules.
+import hashlib
+import json
+import os
+import secrets
+import sys
+import threading
+from multiprocessing import shared_memory, resource_tracker
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+
+# Globals and constants variables.
+
+__all__ = ["SharedCache", "set_cache", "get_cache"]
+
+_HEADER_OFFSET = 16
+_ALIGNMENT = 64
+
+_cache = None
+
+
+def _open(name, create=False, size=0):
+    # Segments outlive the process creating them, which may be a worker of a
+    # pool, until they are unlinked with SharedCache.unlink()
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name, create, size, track=False)
+
+    shm = shared_memory.SharedMemory(name, create, size)
+    try:
+        resource_tracker.unregister(shm._name, "shared_memory")
+    except Exception:  # pragma: no cover
+        pass
+    return shm
+
+
+class _SegmentView:
+    # Array in a segment, which keeps the segment open while it is in use.
+    # The view of the memory is released before the segment, which could
+    # otherwise not be closed once garbage collected
+    __slots__ = ("_array", "_shm")
+
+    def __init__(self, array, shm):
+        self._array = array
+        self._shm = shm
+
+    @property
+    def __array_interface__(self):
+        return self._array.__array_interface__
+
+
+def _unlink(shm):
+    if sys.version_info < (3, 13):
+        # Unlinking unregisters the segment from the resource tracker
+        resource_tracker.register(shm._name, "shared_memory")
+    shm.unlink()
+
+
+def _align(offset):
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+class SharedCache:
+    """
+    Cache of arrays in shared memory, identified by a namespace shared by
+    all the processes using it.
+    Instances can be pickled, to be passed to the workers of a pool.
+    """
+
+    def __init__(self, namespace=None):
+        """
+        Creates a new cache.
+
+        :arg namespace: prefix of the names of the shared memory segments
+            (default: a random prefix)
+        """
+        if namespace is None:
+            namespace = "cb" + secrets.token_hex(4)
+        self.namespace = namespace
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self._segments = {}
+        self._lock = threading.Lock()  # of the segments opened by the threads
+
+    def __getstate__(self):
+        return {"namespace": self.namespace}
+
+    def __setstate__(self, state):
+        self.__init__(state["namespace"])
+
+    def _get_name(self, key):
+        digest = hashlib.sha256(repr(key).encode("utf8")).hexdigest()
+        return "{}_{}".format(self.namespace, digest[:16])
+
+    def _attach(self, name):
+        with self._lock:
+            shm = self._segments.get(name)
+            if shm is not None:
+                return shm
+
+            try:
+                shm = _open(name)
+            except (FileNotFoundError, ValueError):
+                return None  # Not created yet or still empty
+
+            if shm.buf[0] != 1:
+                shm.close()  # Still being written
+                return None
+
+            self._segments[name] = shm
+            return shm
+
+    def get_arrays(self, key):
+        """
+        Returns the :class:`dict` of arrays stored under *key*, as read-only
+        views of the shared memory, or ``None`` if *key* is not in the cache.
+        """
+        shm = self._attach(self._get_name(key))
+        if shm is None:
+            self.misses += 1
+            return None
+
+        buf = shm.buf
+        length = int(np.frombuffer(buf, np.uint64, 1, 8)[0])
+        header = json.loads(bytes(buf[_HEADER_OFFSET : _HEADER_OFFSET + length]))
+        start = _align(_HEADER_OFFSET + length)
+
+        arrays = {}
+        for name, (dtype, shape, offset) in header.items():
+            dtype = np.dtype(dtype)
+            count = int(np.prod(shape, dtype=np.int64))
+            array = np.frombuffer(buf, dtype, count, start + offset)
+            array = np.asarray(_SegmentView(array.reshape(tuple(shape)), shm))
+            array.flags.writeable = False
+            arrays[name] = array
+
+        self.hits += 1
+        return arrays
+
+    def set_arrays(self, key, **arrays):
+        """
+        Stores the arrays given as keyword arguments under *key*, unless
+        another process already stores them.
+        """
+        name = self._get_name(key)
+        if name in self._segments:
+            return
+
+        arrays = {k: np.asarray(v, order="C") for k, v in arrays.items()}
+
+        # Header of the data type, shape and offset of each array, followed by
+        # the arrays
+        header = {}
+        size = 0
+        for k, array in arrays.items():
+            header[k] = (array.dtype.str, array.shape, size)
+            size = _align(size + array.nbytes)
+        header_bytes = json.dumps(header).encode("utf8")
+        start = _align(_HEADER_OFFSET + len(header_bytes))
+
+        try:
+            shm = _open(name, create=True, size=start + max(size, 1))
+        except FileExistsError:
+            return  # Created by another process
+
+        buf = shm.buf
+        buf[0] = 0
+        buf[8:16] = np.uint64(len(header_bytes)).tobytes()
+        buf[_HEADER_OFFSET : _HEADER_OFFSET + len(header_bytes)] = header_bytes
+        for k, array in arrays.items():
+            offset = start + header[k][2]
+            buf[offset : offset + array.nbytes] = array.tobytes()
+        buf[0] = 1  # complete, written last
+
+        with self._lock:
+            self._segments[name] = shm
+            self.writes += 1
+
+    def close(self):
+        """
+        Closes the segments opened by this process.
+        The segments of arrays still in use stay open, until they are closed
+        by a later call once the arrays are garbage collected.
+        """
+        with self._lock:
+            for name, shm in list(self._segments.items()):
+                try:
+                    shm.close()
+                except BufferError:
+                    continue  # Arrays refer to it
+                del self._segments[name]
+
+    def unlink(self):
+        """
+        Closes and removes all the segments of the namespace, usually from
+        the process which created the cache, once the workers are done.
+        """
+        names = set(self._segments)
+        if os.path.isdir("/dev/shm"):
+            prefix = self.namespace + "_"
+            names.update(n for n in os.listdir("/dev/shm") if n.startswith(prefix))
+
+        self.close()
+        for name in names:
+            try:
+                shm = _open(name)
+            except (FileNotFoundError, ValueError):
+                continue
+            _unlink(shm)
+            shm.close()
+
+    def get_stats(self):
+        """
+        Returns a :class:`dict` with the number of ``hits``, ``misses`` and
+        ``writes`` of this process, and the number of segments it opened
+        (``size``).
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "size": len(self._segments),
+        }
+
+
+def set_cache(cache):
+    """
+    Sets the :class:`SharedCache` where the geometry of the colorbars is
+    shared by processes, typically in the initializer of the workers of a
+    pool.
+    ``None`` disables the shared cache (default).
+    """
+    global _cache
+    _cache = cache
+
+
+def get_cache():
+    """
+    Returns the :class:`SharedCache`, or ``None`` if it is disabled.
+    """
+    return _cache
@@ -0,0 +1,66 @@
+"""
+Compact representation of the parameters of a colorbar.
+
+The parameters left unset (``None``) are taken from the rcParams or the
+defaults when the colorbar is drawn.
+Colorbars without any parameter set share :data:`DEFAULT_SPEC`, and get
+their own spec the first time one of their parameters is set.
+"""
+
+# Standard library modules.
+
+# Third party modules.
+
+# Local modules.
+
+# Globals and constants variables.
+
+__all__ = ["ColorbarSpec", "DEFAULT_SPEC"]
+
+
+class ColorbarSpec:
+    """
+    Parameters of a colorbar, ``None`` when unset.
+    """
+
+    __slots__ = (
+        "orientation",
+        "length_fraction",
+        "width_fraction",
+        "location",
+        "pad",
+        "border_pad",
+        "sep",
+        "frameon",
+        "color",
+        "box_color",
+        "box_alpha",
+        "ticks",
+        "ticklabels",
+        "ticklocation",
+        "ticklabel_thinning",
+    )
+
+    def __init__(self, **kwargs):
+        for name in self.__slots__:
+            setattr(self, name, kwargs.pop(name, None))
+        if kwargs:
+            raise TypeError("Unknown parameters: {}".format(", ".join(kwargs)))
+
+    def __repr__(self):
+        params = [
+            "{}={!r}".format(name, getattr(self, name))
+            for name in self.__slots__
+            if getattr(self, name) is not None
+        ]
+        return "{}({})".format(type(self).__name__, ", ".join(params))
+
+    def copy(self):
+        """
+        Returns a copy of this spec.
+        """
+        return type(self)(**{name: getattr(self, name) for name in self.__slots__})
+
+
+#: Spec shared by the colorbars without any parameter set, never modified
+DEFAULT_SPEC = ColorbarSpec()
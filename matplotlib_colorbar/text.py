@@ -0,0 +1,338 @@
+"""
+Measurement and rendering caches of the texts of the colorbar artist.
+"""
+
+# Standard library modules.
+import contextlib
+import hashlib
+import os
+import tempfile
+import threading
+
+# Third party modules.
+import matplotlib.cbook
+import matplotlib.textpath
+from matplotlib.text import Text
+from matplotlib.backends.backend_mixed import MixedModeRenderer
+
+import numpy as np
+
+# Local modules.
+from .cache import LRUCache
+
+# Globals and constants variables.
+
+__all__ = [
+    "CachedText",
+    "renderer_key",
+    "estimate_text_extents",
+    "cached_text_rendering",
+    "set_tex_cache_dir",
+    "clear_cache",
+    "get_cache_stats",
+]
+
+_estimate_cache = LRUCache(maxsize=4096)
+_layout_cache = LRUCache(maxsize=4096)
+_mathtext_cache = LRUCache(maxsize=1024)
+_tex_cache = LRUCache(maxsize=1024)
+
+_tex_cache_dir = None
+
+# Installation of the proxies on the renderers
+_proxies_lock = threading.Lock()
+
+#: Parameters of the rcParams used to parse math texts
+MATHTEXT_RCPARAMS = (
+    "mathtext.fontset",
+    "mathtext.default",
+    "mathtext.rm",
+    "mathtext.it",
+    "mathtext.bf",
+    "mathtext.sf",
+    "mathtext.tt",
+    "mathtext.cal",
+    "mathtext.fallback_to_cm",
+    "mathtext.fallback",
+)
+
+
+def font_key(font_properties):
+    """
+    Returns a hashable key of *font_properties*, with the same fields as
+    :meth:`FontProperties.__hash__ <matplotlib.font_manager.FontProperties.__hash__>`.
+    """
+    return (
+        tuple(font_properties.get_family()),
+        font_properties.get_slant(),
+        font_properties.get_variant(),
+        font_properties.get_weight(),
+        font_properties.get_stretch(),
+        font_properties.get_size_in_points(),
+        font_properties.get_file(),
+    )
+
+
+def renderer_key(renderer):
+    """
+    Returns a hashable key of the type and resolution of *renderer*.
+    The renderer of a mixed mode renderer (PDF, PS and SVG backends) is used,
+    so that the vector formats are distinguished.
+    """
+    if isinstance(renderer, MixedModeRenderer):
+        renderer = renderer._renderer
+    return (type(renderer).__name__, renderer.points_to_pixels(1.0))
+
+
+def _measure(s, font_properties, usetex):
+    if usetex:
+        ismath = "TeX"
+    elif matplotlib.cbook.is_math_text(s):
+        ismath = True
+    else:
+        s = s.replace(r"\$", "$")
+        ismath = False
+
+    return matplotlib.textpath.text_to_path.get_text_width_height_descent(
+        s, font_properties, ismath
+    )
+
+
+def estimate_text_extents(strings, font_properties):
+    """
+    Returns the widths, heights and descents in points of *strings* drawn
+    with *font_properties*, as three arrays.
+    The extents are estimated from the font metrics, independently of the
+    renderer, and cached per string and font.
+    """
+    from matplotlib import rcParams  # late import
+
+    usetex = rcParams["text.usetex"]
+    fkey = font_key(font_properties)
+
+    extents = {}
+    for s in set(strings):
+        key = (s, fkey, usetex)
+        extent = _estimate_cache.get(key)
+        if extent is None:
+            extent = _measure(s, font_properties, usetex)
+            _estimate_cache.set(key, extent)
+        extents[s] = extent
+
+    if not extents:
+        return np.zeros(0), np.zeros(0), np.zeros(0)
+
+    widths, heights, descents = np.array([extents[s] for s in strings], dtype=float).T
+    return widths, heights, descents
+
+
+class CachedText(Text):
+    """
+    Text whose layout (extent, lines and descent) is cached by string, font,
+    rotation, alignment and dpi, independently of its position.
+    Texts with the same string and font share their measurement, even when
+    they are created anew at each draw.
+    """
+
+    def _get_layout_key(self, renderer):
+        return (
+            self.get_text(),
+            font_key(self._fontproperties),
+            self.get_rotation(),
+            self.get_rotation_mode(),
+            self._horizontalalignment,
+            self._verticalalignment,
+            self._multialignment,
+            self._linespacing,
+            self.get_usetex(),
+            self.figure.dpi,
+            renderer_key(renderer),
+        )
+
+    def _get_layout(self, renderer):
+        key = self._get_layout_key(renderer)
+        layout = _layout_cache.get(key)
+        if layout is None:
+            layout = super()._get_layout(renderer)
+            _layout_cache.set(key, layout)
+        return layout
+
+
+class _RendererProxy:
+    """
+    Proxy of an attribute of a renderer, installed as long as it is used.
+    """
+
+    def __init__(self, wrapped):
+        self._wrapped = wrapped
+        self._users = 0
+
+    def __getattr__(self, name):
+        return getattr(self._wrapped, name)
+
+
+class _CachedMathTextParser(_RendererProxy):
+    """
+    Proxy of the math text parser of a renderer, whose parsed math texts are
+    kept in a cache shared by all renderers.
+    """
+
+    def __init__(self, parser):
+        super().__init__(parser)
+        self._rckey = None
+
+    def parse(self, s, dpi=72, prop=None):
+        if self._rckey is None:
+            from matplotlib import rcParams  # late import
+
+            self._rckey = tuple(dict.get(rcParams, name) for name in MATHTEXT_RCPARAMS)
+
+        key = (
+            self._wrapped._output,
+            s,
+            dpi,
+            font_key(prop) if prop is not None else None,
+            self._rckey,
+        )
+        result = _mathtext_cache.get(key)
+        if result is None:
+            result = self._wrapped.parse(s, dpi, prop)
+            _mathtext_cache.set(key, result)
+        return result
+
+
+class _CachedTexManager(_RendererProxy):
+    """
+    Proxy of the TeX manager of a renderer, whose metrics and rasters are kept
+    in a cache shared by all renderers and, optionally, on disk.
+    """
+
+    def _get(self, key, func):
+        key += (
+            self._wrapped.get_font_config(),
+            self._wrapped.get_custom_preamble(),
+        )
+        value = _tex_cache.get(key)
+        if value is not None:
+            return value
+
+        filepath = None
+        if _tex_cache_dir is not None:
+            digest = hashlib.sha256(repr(key).encode("utf8")).hexdigest()
+            filepath = os.path.join(_tex_cache_dir, digest + ".npy")
+            if os.path.exists(filepath):
+                value = np.load(filepath)
+
+        if value is None:
+            value = func()
+
+            if filepath is not None:
+                fd, tmppath = tempfile.mkstemp(suffix=".npy", dir=_tex_cache_dir)
+                try:
+                    with os.fdopen(fd, "wb") as fp:
+                        np.save(fp, np.asarray(value))
+                    os.replace(tmppath, filepath)
+                except OSError:
+                    if os.path.exists(tmppath):
+                        os.remove(tmppath)
+
+        _tex_cache.set(key, value)
+        return value
+
+    def get_text_width_height_descent(self, tex, fontsize, renderer=None):
+        dpi_fraction = renderer.points_to_pixels(1.0) if renderer else 1
+        key = ("metrics", tex, fontsize, dpi_fraction)
+        func = lambda: self._wrapped.get_text_width_height_descent(
+            tex, fontsize, renderer
+        )
+        return tuple(float(value) for value in self._get(key, func))
+
+    def get_grey(self, tex, fontsize=None, dpi=None):
+        key = ("grey", tex, fontsize, dpi)
+        func = lambda: self._wrapped.get_grey(tex, fontsize, dpi)
+        return self._get(key, func)
+
+
+def _install_proxy(renderer, name, cls):
+    with _proxies_lock:
+        proxy = renderer.__dict__.get(name)
+        if proxy is None:
+            return None
+        if not isinstance(proxy, cls):
+            proxy = cls(proxy)
+            setattr(renderer, name, proxy)
+        proxy._users += 1
+        return proxy
+
+
+def _uninstall_proxy(renderer, name, proxy):
+    with _proxies_lock:
+        proxy._users -= 1
+        if proxy._users == 0 and renderer.__dict__.get(name) is proxy:
+            setattr(renderer, name, proxy._wrapped)
+
+
+@contextlib.contextmanager
+def cached_text_rendering(renderer):
+    """
+    Context manager within which the math texts parsed and the TeX texts
+    rendered by *renderer* are taken from caches shared by all renderers.
+    The TeX texts are also cached on disk if a directory was specified with
+    :func:`set_tex_cache_dir`.
+    The context can be nested, or entered from several threads drawing with
+    the same renderer; the renderer is restored when the last one exits.
+    """
+    from matplotlib import rcParams  # late import
+
+    if isinstance(renderer, MixedModeRenderer):
+        renderer = renderer._renderer
+
+    names = {"mathtext_parser": _CachedMathTextParser}
+    if rcParams["text.usetex"] and hasattr(renderer, "get_texmanager"):
+        renderer.get_texmanager()  # created on first use
+        names["_texmanager"] = _CachedTexManager
+
+    proxies = {name: _install_proxy(renderer, name, cls) for name, cls in names.items()}
+
+    try:
+        yield
+    finally:
+        for name, proxy in proxies.items():
+            if proxy is not None:
+                _uninstall_proxy(renderer, name, proxy)
+
+
+def set_tex_cache_dir(dirpath):
+    """
+    Sets the directory where the metrics and rasters of TeX texts are cached,
+    so that they are reused across processes.
+    ``None`` disables the on-disk cache (default).
+    """
+    global _tex_cache_dir
+    if dirpath is not None:
+        os.makedirs(dirpath, exist_ok=True)
+    _tex_cache_dir = dirpath
+
+
+def clear_cache():
+    """
+    Clears the in-memory caches of the text extents, layouts and renderings.
+    """
+    _estimate_cache.clear()
+    _layout_cache.clear()
+    _mathtext_cache.clear()
+    _tex_cache.clear()
+
+
+def get_cache_stats():
+    """
+    Returns the statistics of the caches of the text extents (``estimates``),
+    the text layouts (``layouts``), the parsed math texts (``mathtext``) and
+    the TeX texts (``tex``).
+    """
+    return {
+        "estimates": _estimate_cache.get_stats(),
+        "layouts": _layout_cache.get_stats(),
+        "mathtext": _mathtext_cache.get_stats(),
+        "tex": _tex_cache.get_stats(),
+    }
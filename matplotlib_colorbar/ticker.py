@@ -0,0 +1,557 @@
+"""
+Analytic tick engine for the colorbar artist.
+
+For the linear, log, symmetrical log and power norms, the positions of the
+color intervals and the ticks are computed directly in normalized space from
+the norm, instead of from a dummy matplotlib figure and colorbar.
+The locators and formatters matplotlib's colorbar uses for these norms are
+reproduced with NumPy, so the results are identical.
+Results are cached by norm parameters and tick density.
+"""
+
+# Standard library modules.
+import copy
+import math
+
+# Third party modules.
+import matplotlib.colors
+import matplotlib.ticker
+import matplotlib.transforms
+
+import numpy as np
+
+# Local modules.
+from .cache import LRUCache
+
+# Globals and constants variables.
+
+__all__ = ["calculate_colorbar", "clear_cache", "get_cache_stats"]
+
+#: Number of ticks matplotlib's colorbar aims for (see ``_DummyAxis``)
+DEFAULT_NUMTICKS = 9
+
+#: Number of ticks of matplotlib's symmetrical log locator
+DEFAULT_SYMLOG_NUMTICKS = 15
+
+#: rcParams affecting the ticks or their labels
+RCPARAMS = (
+    "axes.autolimit_mode",
+    "axes.formatter.limits",
+    "axes.formatter.min_exponent",
+    "axes.formatter.offset_threshold",
+    "axes.formatter.use_locale",
+    "axes.formatter.use_mathtext",
+    "axes.formatter.useoffset",
+    "axes.unicode_minus",
+    "text.usetex",
+)
+
+# Extended staircase of the steps of matplotlib's colorbar locator,
+# i.e. [1, 2, 2.5, 5, 10]
+_LINEAR_STEPS = np.array([0.1, 0.2, 0.25, 0.5, 1.0, 2.0, 2.5, 5.0, 10.0, 20.0])
+
+_SYMLOG_SUBS = np.arange(1, 10)
+
+_cache = LRUCache(maxsize=256)
+
+
+def _norm_key(norm):
+    """
+    Returns a hashable key of the parameters of *norm*, or ``None`` if
+    the norm is not supported by the engine.
+    """
+    norm_type = type(norm)
+    if norm_type is matplotlib.colors.Normalize:
+        params = ()
+    elif norm_type is matplotlib.colors.LogNorm:
+        params = ()
+    elif norm_type is matplotlib.colors.SymLogNorm:
+        params = (norm.linthresh, norm._linscale_adj, getattr(norm, "_base", None))
+    elif norm_type is matplotlib.colors.PowerNorm:
+        params = (norm.gamma,)
+    else:
+        return None
+
+    if not norm.scaled():
+        return None
+
+    vmin = float(norm.vmin)
+    vmax = float(norm.vmax)
+    if vmin >= vmax:
+        return None
+    if norm_type is matplotlib.colors.LogNorm and vmin <= 0.0:
+        return None
+
+    # matplotlib's colorbar would modify the limits of the norm
+    if matplotlib.transforms.nonsingular(vmin, vmax, expander=0.1) != (vmin, vmax):
+        return None
+
+    return (norm_type.__name__, vmin, vmax) + params
+
+
+def _edge_le(x, step, offset):
+    """
+    Returns the largest n such as n * step <= x, taking into account the
+    floating point precision (see ``matplotlib.ticker._Edge_integer``).
+    """
+    d, m = divmod(x, step)
+    if abs(m / step - 1) < _edge_tolerance(step, offset):
+        return d + 1
+    return d
+
+
+def _edge_ge(x, step, offset):
+    """
+    Returns the smallest n such as n * step >= x, taking into account the
+    floating point precision (see ``matplotlib.ticker._Edge_integer``).
+    """
+    d, m = divmod(x, step)
+    if abs(m / step) < _edge_tolerance(step, offset):
+        return d
+    return d + 1
+
+
+def _edge_tolerance(step, offset):
+    offset = abs(offset)
+    if offset > 0:
+        digits = np.log10(offset / step)
+        return min(0.4999, max(1e-10, 10 ** (digits - 12)))
+    return 1e-10
+
+
+def linear_tick_values(vmin, vmax, nbins=DEFAULT_NUMTICKS, autolimit_mode="data"):
+    """
+    Returns at most *nbins* + 1 ticks at nice locations between *vmin* and
+    *vmax*, as matplotlib's colorbar auto locator.
+    """
+    if vmin > vmax:
+        vmin, vmax = vmax, vmin
+    clip_vmin, clip_vmax = vmin, vmax
+    vmin, vmax = matplotlib.transforms.nonsingular(
+        vmin, vmax, expander=1e-13, tiny=1e-14
+    )
+
+    scale, offset = matplotlib.ticker.scale_range(vmin, vmax, nbins)
+    _vmin = vmin - offset
+    _vmax = vmax - offset
+    raw_step = (_vmax - _vmin) / nbins
+    steps = _LINEAR_STEPS * scale
+    istep = np.nonzero(steps >= raw_step)[0][0]
+
+    if autolimit_mode == "round_numbers":
+        for istep in range(istep, len(steps)):
+            step = steps[istep]
+            best_vmin = (_vmin // step) * step
+            best_vmax = best_vmin + step * nbins
+            if best_vmax >= _vmax:
+                break
+
+    for istep in reversed(range(istep + 1)):
+        step = steps[istep]
+        best_vmin = (_vmin // step) * step
+        low = _edge_le(_vmin - best_vmin, step, offset)
+        high = _edge_ge(_vmax - best_vmin, step, offset)
+        ticks = np.arange(low, high + 1) * step + best_vmin
+        nticks = ((ticks <= _vmax) & (ticks >= _vmin)).sum()
+        if nticks >= 2:
+            break
+    ticks = ticks + offset
+
+    rtol = (clip_vmax - clip_vmin) * 1e-10
+    return ticks[(ticks >= clip_vmin - rtol) & (ticks <= clip_vmax + rtol)]
+
+
+def log_tick_values(vmin, vmax, numticks=DEFAULT_NUMTICKS, base=10.0):
+    """
+    Returns the ticks at integer powers of *base* between *vmin* and *vmax*,
+    as matplotlib's colorbar log locator.
+    """
+    if vmin > vmax:
+        vmin, vmax = vmax, vmin
+    log_vmin = math.log(vmin) / math.log(base)
+    log_vmax = math.log(vmax) / math.log(base)
+
+    numdec = math.floor(log_vmax) - math.ceil(log_vmin)
+    stride = (numdec + 1) // numticks + 1
+    decades = np.arange(
+        math.floor(log_vmin) - stride, math.ceil(log_vmax) + 2 * stride, stride
+    )
+    ticks = base**decades
+
+    log_ticks = np.log10(ticks)
+    rtol = (np.log10(vmax) - np.log10(vmin)) * 1e-10
+    return ticks[
+        (log_ticks >= np.log10(vmin) - rtol) & (log_ticks <= np.log10(vmax) + rtol)
+    ]
+
+
+def symlog_tick_values(
+    vmin, vmax, linthresh, numticks=DEFAULT_SYMLOG_NUMTICKS, base=10.0
+):
+    """
+    Returns the ticks at integer multiples of the powers of *base* between
+    *vmin* and *vmax*, and 0 if the linear range is present,
+    as matplotlib's colorbar symmetrical log locator.
+    """
+    if vmax < vmin:
+        vmin, vmax = vmax, vmin
+
+    if -linthresh < vmin < vmax < linthresh:
+        return np.array([vmin, vmax])
+
+    has_a = vmin < -linthresh
+    has_c = vmax > linthresh
+    has_b = (has_a and vmax > -linthresh) or (has_c and vmin < linthresh)
+
+    def get_log_range(lo, hi):
+        lo = np.floor(np.log(lo) / np.log(base))
+        hi = np.ceil(np.log(hi) / np.log(base))
+        return lo, hi
+
+    a_lo, a_hi = (0, 0)
+    if has_a:
+        a_lo, a_hi = get_log_range(abs(min(-linthresh, vmax)), abs(vmin) + 1)
+
+    c_lo, c_hi = (0, 0)
+    if has_c:
+        c_lo, c_hi = get_log_range(max(linthresh, vmin), vmax + 1)
+
+    total_ticks = (a_hi - a_lo) + (c_hi - c_lo)
+    if has_b:
+        total_ticks += 1
+    stride = max(total_ticks // (numticks - 1), 1)
+
+    parts = []
+    if has_a:
+        decades = -1 * (base ** (np.arange(a_lo, a_hi, stride)[::-1]))
+        parts.append(np.outer(decades, _SYMLOG_SUBS).ravel())
+    if has_b:
+        parts.append(np.zeros(1))
+    if has_c:
+        decades = base ** np.arange(c_lo, c_hi, stride)
+        parts.append(np.outer(decades, _SYMLOG_SUBS).ravel())
+
+    if not parts:
+        return np.zeros(0)
+    return np.concatenate(parts)
+
+
+def format_log_ticks(values, vmin, vmax, linthresh=None, min_exponent=0, base=10.0):
+    """
+    Returns the labels of the ticks at *values* in scientific notation,
+    as :class:`matplotlib.ticker.LogFormatterSciNotation` used by
+    matplotlib's colorbar for log and symmetrical log norms.
+    """
+    values = np.asarray(values, dtype=float)
+    if vmin > vmax:
+        vmin, vmax = vmax, vmin
+
+    # Subset of coefficients to label
+    if linthresh is None and vmin <= 0:
+        sublabels = {1}
+    else:
+        if linthresh is not None:
+            numdec = 0
+            if vmin < -linthresh:
+                rhs = min(vmax, -linthresh)
+                numdec += math.log(vmin / rhs) / math.log(base)
+            if vmax > linthresh:
+                lhs = max(vmin, linthresh)
+                numdec += math.log(vmax / lhs) / math.log(base)
+        else:
+            numdec = abs(
+                math.log(vmax) / math.log(base) - math.log(vmin) / math.log(base)
+            )
+
+        if numdec > 1:
+            sublabels = {1}
+        elif numdec > 0.4:
+            c = np.logspace(0, 1, int(base) // 2 + 1, base=base)
+            sublabels = set(np.round(c))
+        else:
+            sublabels = set(np.arange(1, base + 1))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fx = np.log(np.abs(values)) / math.log(base)
+        is_decade = np.abs(fx - np.round(fx)) < 1e-10
+        exponents = np.where(is_decade, np.round(fx), np.floor(fx))
+        coeffs = np.round(np.abs(values) / base**exponents)
+
+    base_string = "%d" % base if base % 1 == 0.0 else "%s" % base
+
+    ticklabels = []
+    for value, f, decade, coeff in zip(values, fx, is_decade, coeffs):
+        if value == 0:
+            ticklabels.append(r"$\mathdefault{0}$")
+            continue
+        if coeff not in sublabels:
+            ticklabels.append("")
+            continue
+
+        sign_string = "-" if value < 0 else ""
+        if decade:
+            f = round(f)
+
+        if abs(f) < min_exponent:
+            label = r"$\mathdefault{%s%g}$" % (sign_string, abs(value))
+        elif not decade:
+            exponent = math.floor(f)
+            coeff = base**f / base**exponent
+            if abs(coeff - np.round(coeff)) < 1e-10:
+                coeff = round(coeff)
+            label = r"$\mathdefault{%s%g\times%s^{%d}}$" % (
+                sign_string,
+                coeff,
+                base_string,
+                exponent,
+            )
+        else:
+            label = r"$\mathdefault{%s%s^{%d}}$" % (sign_string, base_string, f)
+        ticklabels.append(label)
+
+    return ticklabels
+
+
+def format_linear_ticks(values, vmin, vmax):
+    """
+    Returns the labels and offset string of the ticks at *values*,
+    as :class:`matplotlib.ticker.ScalarFormatter`.
+    """
+    formatter = matplotlib.ticker.ScalarFormatter()
+    formatter.create_dummy_axis(minpos=vmin)
+    formatter.set_view_interval(vmin, vmax)
+    formatter.set_data_interval(vmin, vmax)
+    return formatter.format_ticks(values), formatter.get_offset()
+
+
+def _limit(numticks, default, minimum=2):
+    if numticks is None:
+        return default
+    return max(minimum, min(numticks, default))
+
+
+def limit_locator(locator, numticks):
+    """
+    Reduces the number of ticks of a matplotlib *locator* to at most
+    *numticks*, if the locator supports it.
+    The locator is left untouched if it already yields fewer ticks.
+    """
+    if isinstance(locator, matplotlib.ticker.MaxNLocator):
+        nbins = locator._nbins
+        if nbins == "auto":
+            nbins = DEFAULT_NUMTICKS
+        if numticks - 1 < nbins:
+            locator.set_params(nbins=max(1, numticks - 1))
+    elif isinstance(locator, matplotlib.ticker.LogLocator):
+        if locator.numticks == "auto" or numticks < locator.numticks:
+            locator.set_params(numticks=_limit(numticks, DEFAULT_NUMTICKS))
+    elif isinstance(locator, matplotlib.ticker.SymmetricalLogLocator):
+        if numticks < locator.numticks:
+            locator.set_params(numticks=max(2, numticks))
+    elif isinstance(locator, matplotlib.ticker.FixedLocator):
+        if locator.nbins is None or numticks < locator.nbins:
+            locator.nbins = max(1, numticks)
+
+
+def thin_ticks(ticks, ticklabels, numticks):
+    """
+    Returns the ticks and tick labels, keeping at most *numticks* labelled
+    ticks, evenly strided from the first one.
+    Unlabelled ticks are kept.
+    """
+    labelled = np.flatnonzero([bool(label) for label in ticklabels])
+    if len(labelled) <= numticks:
+        return ticks, ticklabels
+
+    stride = -(-len(labelled) // max(1, numticks))
+    keep = np.ones(len(ticklabels), dtype=bool)
+    keep[labelled] = False
+    keep[labelled[::stride]] = True
+
+    ticks = np.asarray(ticks)[keep]
+    ticklabels = [label for label, kept in zip(ticklabels, keep) if kept]
+    return ticks, ticklabels
+
+
+def find_visible_ticklabels(positions, sizes, sep=0.0):
+    """
+    Returns a boolean array of the tick labels to keep so that no two labels
+    overlap. Labels are kept greedily from the lowest position.
+
+    :arg positions: positions of the centers of the tick labels
+    :arg sizes: sizes of the tick labels along the colorbar
+    :arg sep: minimum separation between two tick labels
+    """
+    positions = np.asarray(positions, dtype=float)
+    sizes = np.asarray(sizes, dtype=float)
+    visible = np.zeros(len(positions), dtype=bool)
+    if not len(positions):
+        return visible
+
+    order = np.argsort(positions, kind="stable")
+    lows = positions[order] - sizes[order] / 2
+    highs = positions[order] + sizes[order] / 2
+
+    # Running maximum of the lower edges, so that the first label starting
+    # above a given position can be found with a binary search
+    lows = np.maximum.accumulate(lows)
+
+    kept = [0]
+    while True:
+        index = np.searchsorted(lows, highs[kept[-1]] + sep, side="left")
+        # Strictly after the last label kept, which may have no size
+        index = max(index, kept[-1] + 1)
+        if index >= len(lows):
+            break
+        kept.append(index)
+
+    visible[order[kept]] = True
+    return visible
+
+
+def _calculate(norm, N, ticks, ticklabels, numticks, rcparams):
+    # Boundaries and values of the color intervals
+    y = np.linspace(0, 1, N + 1)
+    boundaries = np.asarray(norm.inverse(y), dtype=float)
+    values = 0.5 * (boundaries[:-1] + boundaries[1:])
+    vmin = boundaries[0]
+    vmax = boundaries[-1]
+
+    # Positions of the color intervals
+    if type(norm) is matplotlib.colors.LogNorm:
+        norm_mesh = copy.copy(norm)
+        norm_mesh.vmin = vmin
+        norm_mesh.vmax = vmax
+        positions = np.asarray(norm_mesh.inverse(y), dtype=float)
+    else:
+        positions = y * (vmax - vmin) + vmin
+
+    # Ticks
+    if ticks:
+        tick_values = np.asarray(ticks, dtype=float)
+    elif type(norm) is matplotlib.colors.LogNorm:
+        tick_values = log_tick_values(
+            max(vmin, norm.vmin),
+            min(vmax, norm.vmax),
+            _limit(numticks, DEFAULT_NUMTICKS),
+        )
+    elif type(norm) is matplotlib.colors.SymLogNorm:
+        tick_values = symlog_tick_values(
+            vmin, vmax, norm.linthresh, _limit(numticks, DEFAULT_SYMLOG_NUMTICKS)
+        )
+    else:
+        tick_values = linear_tick_values(
+            max(vmin, norm.vmin),
+            min(vmax, norm.vmax),
+            _limit(numticks - 1 if numticks else None, DEFAULT_NUMTICKS, 1),
+            rcparams["axes.autolimit_mode"],
+        )
+
+    if not ticks and type(norm) is matplotlib.colors.LogNorm:
+        eps = 1e-10
+        tick_values = tick_values[
+            (tick_values <= vmax * (1 + eps)) & (tick_values >= vmin * (1 - eps))
+        ]
+    else:
+        eps = (vmax - vmin) * 1e-10
+        tick_values = tick_values[
+            (tick_values <= vmax + eps) & (tick_values >= vmin - eps)
+        ]
+
+    # Tick labels
+    offset_string = ""
+    if ticks and ticklabels:
+        ticklabels = [
+            ticklabels[i] if i < len(ticklabels) else ""
+            for i in range(len(tick_values))
+        ]
+    elif type(norm) in (matplotlib.colors.Normalize, matplotlib.colors.PowerNorm):
+        ticklabels, offset_string = format_linear_ticks(tick_values, vmin, vmax)
+    else:
+        linthresh = None
+        if type(norm) is matplotlib.colors.SymLogNorm:
+            linthresh = norm.linthresh
+        ticklabels = format_log_ticks(
+            tick_values,
+            vmin,
+            vmax,
+            linthresh,
+            rcparams["axes.formatter.min_exponent"],
+        )
+
+    # Tick positions, interpolated between the boundaries in normalized space
+    if len(tick_values):
+        boundaries_n = norm(boundaries, clip=False).filled()
+        ticks_n = norm(tick_values, clip=False).filled()
+        tick_positions = np.interp(ticks_n, boundaries_n, positions)
+    else:
+        tick_positions = np.zeros(0)
+
+    # Normalize
+    pmin = np.min(positions)
+    ptp = np.ptp(positions)
+    tick_positions = (tick_positions - pmin) / ptp
+    positions = (positions - pmin) / ptp
+
+    for array in (positions, values, tick_positions):
+        array.flags.writeable = False
+
+    return positions, values, tick_positions, list(ticklabels), offset_string
+
+
+def calculate_colorbar(norm, N, ticks=None, ticklabels=None, numticks=None):
+    """
+    Returns the positions and values of the color intervals, and the
+    positions, labels and offset string of the ticks of a colorbar.
+    The positions are normalized between 0 and 1.
+    Returns ``None`` if *norm* is not supported by the engine.
+
+    :arg norm: scaled :class:`Normalize <matplotlib.colors.Normalize>`,
+        :class:`LogNorm <matplotlib.colors.LogNorm>`,
+        :class:`SymLogNorm <matplotlib.colors.SymLogNorm>` or
+        :class:`PowerNorm <matplotlib.colors.PowerNorm>`
+    :arg N: number of colors of the colormap
+    :arg ticks: ticks location (default: automatic)
+    :arg ticklabels: a list of tick labels (same length as ``ticks`` argument)
+    :arg numticks: maximum number of ticks of the automatic locators
+        (default: same as matplotlib's colorbar)
+    """
+    from matplotlib import rcParams  # late import
+
+    if rcParams["_internal.classic_mode"]:
+        return None
+
+    key = _norm_key(norm)
+    if key is None:
+        return None
+
+    rcparams = dict((name, rcParams[name]) for name in RCPARAMS)
+    key += (
+        N,
+        tuple(ticks) if ticks else None,
+        tuple(ticklabels) if ticks and ticklabels else None,
+        numticks,
+        tuple((name, str(value)) for name, value in rcparams.items()),
+    )
+
+    result = _cache.get(key)
+    if result is None:
+        result = _calculate(norm, N, ticks, ticklabels, numticks, rcparams)
+        _cache.set(key, result)
+
+    positions, values, tick_positions, ticklabels, offset_string = result
+    return positions, values, tick_positions, list(ticklabels), offset_string
+
+
+def clear_cache():
+    """
+    Clears the cache of the tick engine.
+    """
+    _cache.clear()
+
+
+def get_cache_stats():
+    """
+    Returns the statistics of the cache of the tick engine.
+    """
+    return _cache.get_stats()
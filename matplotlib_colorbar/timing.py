@@ -0,0 +1,161 @@
+"""
+Opt-in timings of the phases of the draw of colorbars.
+
+When enabled with :func:`enable`, each draw records the time spent in each
+phase of :data:`PHASES`, in the :class:`DrawTimings` of the colorbar
+(:attr:`Colorbar.timings <matplotlib_colorbar.colorbar.Colorbar.timings>`)
+and in the registry aggregating all colorbars (:func:`get_registry`).
+When disabled (default), no time is measured.
+
+The phases are:
+    - ``config``: resolution of the parameters and shared caches
+    - ``geometry``: calculation of the colors and ticks of the colorbar
+    - ``segments``: construction of the colored segments and outline
+    - ``ticks``: creation of the tick lines and texts
+    - ``layout``: measure of the texts and placement of the boxes
+    - ``render``: draw of the artists by the renderer
+
+A phase whose result was cached takes (almost) no time.
+"""
+
+# Standard library modules.
+import threading
+import time
+
+# Third party modules.
+
+# Local modules.
+
+# Globals and constants variables.
+
+__all__ = [
+    "PHASES",
+    "DrawTimings",
+    "enable",
+    "disable",
+    "is_enabled",
+    "get_registry",
+    "start_timer",
+]
+
+#: Phases of the draw of a colorbar, in order
+PHASES = ("config", "geometry", "segments", "ticks", "layout", "render")
+
+_enabled = False
+
+
+class DrawTimings:
+    """
+    Timings of the phases of draws, in seconds.
+    Draws can be recorded from several threads.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.clear()
+
+    def record(self, times):
+        """
+        Records the timings of one draw.
+
+        :arg times: :class:`dict` of the time of each phase, in seconds
+        """
+        with self._lock:
+            self.ndraws += 1
+            self.last = dict(times)
+            for phase, seconds in times.items():
+                self._totals[phase] += seconds
+                self._minimums[phase] = min(self._minimums[phase], seconds)
+                self._maximums[phase] = max(self._maximums[phase], seconds)
+
+    def clear(self):
+        """
+        Removes all the recorded draws.
+        """
+        with self._lock:
+            self.ndraws = 0
+            self.last = None
+            self._totals = dict.fromkeys(PHASES, 0.0)
+            self._minimums = dict.fromkeys(PHASES, float("inf"))
+            self._maximums = dict.fromkeys(PHASES, 0.0)
+
+    def get_stats(self):
+        """
+        Returns a :class:`dict` with, for each phase, a :class:`dict` of the
+        ``total``, ``mean``, ``min`` and ``max`` time per draw, and the
+        number of draws recorded (``draws``).
+        """
+        with self._lock:
+            stats = {"draws": self.ndraws}
+            for phase in PHASES:
+                stats[phase] = {
+                    "total": self._totals[phase],
+                    "mean": self._totals[phase] / self.ndraws if self.ndraws else 0.0,
+                    "min": self._minimums[phase] if self.ndraws else 0.0,
+                    "max": self._maximums[phase],
+                }
+            return stats
+
+
+class _DrawTimer:
+    def __init__(self, timings):
+        self._timings = timings
+        self._times = dict.fromkeys(PHASES, 0.0)
+        self._last = time.perf_counter()
+
+    def mark(self, phase):
+        # Time since the previous mark, added to *phase*
+        now = time.perf_counter()
+        self._times[phase] += now - self._last
+        self._last = now
+
+    def stop(self):
+        self._timings.record(self._times)
+        _registry.record(self._times)
+
+
+_registry = DrawTimings()
+
+
+def enable():
+    """
+    Enables the timings of the draws of all colorbars.
+    """
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    """
+    Disables the timings of the draws (default).
+    The timings already recorded are kept.
+    """
+    global _enabled
+    _enabled = False
+
+
+def is_enabled():
+    """
+    Returns whether the draws are timed.
+    """
+    return _enabled
+
+
+def get_registry():
+    """
+    Returns the :class:`DrawTimings` of the draws of all colorbars.
+    """
+    return _registry
+
+
+def start_timer(colorbar):
+    """
+    Returns a timer of a draw of *colorbar*, started now, recording in the
+    timings of *colorbar* and in the registry once stopped, or ``None`` if
+    the timings are disabled.
+    The timer has a method ``mark(phase)``, adding the time since the
+    previous mark to *phase*, and a method ``stop()``.
+    """
+    if not _enabled:
+        return None
+    return _DrawTimer(colorbar.timings)
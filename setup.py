@@ -33,12 +33,13 @@ setup(
         "Intended Audience :: Science/Research",
         "License :: OSI Approved :: MIT License",
         "Operating System :: OS Independent",
-        "Programming Language :: Python :: 2",
         "Programming Language :: Python :: 3",
+        "Programming Language :: Python :: 3 :: Only",
         "Topic :: Scientific/Engineering :: Visualization",
     ],
     packages=find_packages(),
     package_data={},
+    python_requires=">=3.7",
     install_requires=["matplotlib"],
     zip_safe=True,
     cmdclass=versioneer.get_cmdclass(),
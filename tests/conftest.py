@@ -0,0 +1,44 @@
+""" """
+
+# Standard library modules.
+
+# Third party modules.
+import matplotlib.pyplot as plt
+
+import pytest
+
+# Local modules.
+
+# Globals and constants variables.
+
+pytest_plugins = ["matplotlib_colorbar.pytest_plugin"]
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--runslow", action="store_true", default=False, help="run slow tests"
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "slow: long-running test, see --runslow")
+
+
+@pytest.fixture
+def figure():
+    fig = plt.figure()
+
+    yield fig
+
+    plt.close()
+    del fig
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--runslow"):
+        return
+
+    skip_slow = pytest.mark.skip(reason="needs --runslow")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
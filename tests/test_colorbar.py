@@ -2,11 +2,17 @@
 """ """
 
 # Standard library modules.
+import io
+import pickle
+import tracemalloc
 
 # Third party modules.
 import matplotlib.pyplot as plt
 import matplotlib.cbook as cbook
+from matplotlib.backend_bases import MouseEvent
 import matplotlib.colors
+from matplotlib.cm import ScalarMappable
+from matplotlib.font_manager import FontProperties
 
 import numpy as np
 
@@ -14,21 +20,12 @@ import pytest
 
 # Local modules.
 from matplotlib_colorbar.colorbar import Colorbar
-
+from matplotlib_colorbar.spec import DEFAULT_SPEC
+from matplotlib_colorbar import diskcache, sharedcache
 
 # Globals and constants variables.
 
 
-@pytest.fixture
-def figure():
-    fig = plt.figure()
-
-    yield fig
-
-    plt.close()
-    del fig
-
-
 @pytest.fixture
 def colorbar(figure):
     ax = figure.add_subplot("111")
@@ -172,6 +169,469 @@ def test_colorbar_location(colorbar):
         colorbar.set_location("blah")
 
 
+def test_colorbar_location_best(figure):
+    ax = figure.add_subplot("111")
+
+    data = np.ma.masked_array(np.ones((10, 10)), mask=False)
+    data.mask[5:, :5] = True  # lower left
+    mappable = ax.imshow(data)
+
+    colorbar = Colorbar(mappable, location="best")
+    ax.add_artist(colorbar)
+    assert colorbar.get_location() == 0
+
+    figure.canvas.draw()
+    assert colorbar._best_location[1] == 3
+
+
+def test_colorbar_location_best_cache(figure, monkeypatch):
+    import matplotlib_colorbar.colorbar as module
+
+    calls = []
+
+    def calculate_occupancy(*args, **kwargs):
+        calls.append(args)
+        return original(*args, **kwargs)
+
+    original = module.calculate_occupancy
+    monkeypatch.setattr(module, "calculate_occupancy", calculate_occupancy)
+
+    ax = figure.add_subplot("111")
+    (line,) = ax.plot([0, 1, 2], [0, 1, 2])
+    mappable = ax.imshow(np.ma.masked_all((3, 3)))
+
+    colorbar = Colorbar(mappable, location="best")
+    ax.add_artist(colorbar)
+
+    figure.canvas.draw()
+    figure.canvas.draw()
+    assert len(calls) == 1
+
+    ax.set_xlim(0, 10)
+    figure.canvas.draw()
+    assert len(calls) == 2
+
+    line.set_data([0, 1], [2, 0])
+    figure.canvas.draw()
+    assert len(calls) == 3
+
+
+def test_colorbar_get_value_at(figure, colorbar):
+    assert colorbar.get_value_at(0, 0) is None
+
+    figure.canvas.draw()
+    x0, y0, x1, y1 = colorbar._hit_cache["bar_extent"]
+    xm = (x0 + x1) / 2
+
+    assert colorbar.get_value_at(xm, y0 + 0.1) == pytest.approx(1.0, abs=0.1)
+    assert colorbar.get_value_at(xm, y1 - 0.1) == pytest.approx(9.0, abs=0.1)
+    assert colorbar.get_value_at(xm, (y0 + y1) / 2) == pytest.approx(5.0, abs=0.1)
+    assert colorbar.get_value_at(x0 - 1, y0 + 0.1) is None
+    assert colorbar.get_value_at(xm, y1 + 1) is None
+
+
+def test_colorbar_get_value_at_horizontal(figure, colorbar):
+    colorbar.set_orientation("horizontal")
+    figure.canvas.draw()
+    x0, y0, x1, y1 = colorbar._hit_cache["bar_extent"]
+    ym = (y0 + y1) / 2
+
+    assert colorbar.get_value_at(x0 + 0.1, ym) == pytest.approx(1.0, abs=0.1)
+    assert colorbar.get_value_at(x1 - 0.1, ym) == pytest.approx(9.0, abs=0.1)
+
+
+def test_colorbar_contains(figure, colorbar):
+    figure.canvas.draw()
+    x0, y0, x1, y1 = colorbar._hit_cache["bar_extent"]
+
+    event = MouseEvent("motion_notify_event", figure.canvas, x0 + 1, y0 + 1)
+    inside, info = colorbar.contains(event)
+    assert inside
+    assert info["value"] == pytest.approx(1.0, abs=0.1)
+
+    event = MouseEvent("motion_notify_event", figure.canvas, 1, 1)
+    assert colorbar.contains(event) == (False, {})
+
+
+def test_colorbar_contains_ticklabel(figure, colorbar):
+    figure.canvas.draw()
+    extents = colorbar._hit_cache["ticklabel_extents"]
+    x0, y0, x1, y1 = extents[-1]
+
+    event = MouseEvent("motion_notify_event", figure.canvas, x1 - 1, (y0 + y1) / 2)
+    inside, info = colorbar.contains(event)
+    assert inside
+    assert info["ticklabel"] == colorbar._hit_cache["ticklabels"][-1]
+    assert info["value"] == pytest.approx(float(info["ticklabel"]), abs=0.1)
+
+
+def test_colorbar_pick(figure, colorbar):
+    events = []
+    figure.canvas.mpl_connect("pick_event", events.append)
+    colorbar.set_picker(True)
+    figure.canvas.draw()
+    x0, y0, x1, y1 = colorbar._hit_cache["bar_extent"]
+
+    event = MouseEvent("button_press_event", figure.canvas, x1 - 0.1, y1 - 0.1)
+    figure.pick(event)
+
+    assert len(events) == 1
+    assert events[0].artist is colorbar
+    assert events[0].value == pytest.approx(9.0, abs=0.1)
+
+
+def test_colorbar_invalidate(figure, colorbar):
+    figure.canvas.draw()
+    assert colorbar.get_geometry_stats() == {"computes": 1, "skipped": 0}
+
+    figure.canvas.draw()
+    assert colorbar.get_geometry_stats()["computes"] == 1
+
+    mappable = colorbar.mappable
+    for i in range(10):
+        mappable.set_clim(0, 10 + i)
+        mappable.set_cmap("magma")
+        mappable.norm.autoscale([0, 20 + i])
+    assert colorbar.stale
+    assert colorbar.get_geometry_stats() == {"computes": 1, "skipped": 19}
+
+    figure.canvas.draw()
+    assert colorbar.get_geometry_stats() == {"computes": 2, "skipped": 19}
+
+
+def test_colorbar_invalidate_norm(figure, colorbar):
+    figure.canvas.draw()
+
+    colorbar.mappable.norm.vmax = 100.0  # without notification
+    figure.canvas.draw()
+    assert colorbar.get_geometry_stats()["computes"] == 2
+
+
+def test_colorbar_set_mappable(figure, colorbar):
+    figure.canvas.draw()
+    previous = colorbar.mappable
+
+    colorbar.set_mappable(colorbar.axes.imshow(np.ones((2, 2))))
+    previous.set_clim(0, 100)
+    figure.canvas.draw()
+    assert colorbar.get_geometry_stats() == {"computes": 2, "skipped": 0}
+
+
+def test_colorbar_export(figure, colorbar):
+    colorbar.set_label("label")
+    exports = [("png", 100), ("png", 200), ("png", 300), ("pdf", 72), ("svg", 72)]
+
+    for format, dpi in exports:
+        figure.savefig(io.BytesIO(), format=format, dpi=dpi)
+    assert colorbar.get_geometry_stats()["computes"] == 1
+    assert colorbar.get_layout_stats() == {"builds": 1, "measures": 5}
+
+    for format, dpi in exports:
+        figure.savefig(io.BytesIO(), format=format, dpi=dpi)
+    assert colorbar.get_layout_stats() == {"builds": 1, "measures": 5}
+
+
+def test_colorbar_export_rebuild(figure, colorbar):
+    figure.canvas.draw()
+
+    colorbar.set_color("r")
+    figure.canvas.draw()
+    assert colorbar.get_layout_stats() == {"builds": 1, "measures": 1}
+
+    colorbar.set_label("label")
+    figure.canvas.draw()
+    assert colorbar.get_layout_stats() == {"builds": 2, "measures": 2}
+
+    colorbar.mappable.set_clim(0, 100)
+    figure.canvas.draw()
+    assert colorbar.get_layout_stats() == {"builds": 3, "measures": 3}
+
+
+def test_colorbar_theme(figure, colorbar):
+    colorbar.set_label("label")
+    figure.canvas.draw()
+    light = np.array(figure.canvas.buffer_rgba())
+
+    with colorbar.theme(color="w", box_color="k", box_alpha=0.5) as dark:
+        assert dark is colorbar
+        assert colorbar.get_color() == "w"
+        figure.canvas.draw()
+        pixels = np.array(figure.canvas.buffer_rgba())
+
+    assert colorbar.get_color() is None
+    assert colorbar.get_box_alpha() is None
+    assert colorbar.get_layout_stats() == {"builds": 1, "measures": 1}
+
+    figure.canvas.draw()
+    assert np.array_equal(np.array(figure.canvas.buffer_rgba()), light)
+
+    colorbar.remove()
+    expected = Colorbar(
+        colorbar.mappable, label="label", color="w", box_color="k", box_alpha=0.5
+    )
+    figure.axes[0].add_artist(expected)
+    figure.canvas.draw()
+    assert np.array_equal(np.array(figure.canvas.buffer_rgba()), pixels)
+
+
+def test_colorbar_fingerprint(figure, colorbar):
+    digest = colorbar.fingerprint()
+    assert colorbar.fingerprint() == digest
+
+    other = Colorbar(colorbar.mappable)
+    figure.axes[0].add_artist(other)
+    assert other.fingerprint() == digest
+
+    other.set_color("k")  # same as the default
+    assert other.fingerprint() == digest
+
+    other.set_label("label")
+    assert other.fingerprint() != digest
+
+
+@pytest.mark.parametrize(
+    "rc",
+    [
+        {"patch.linewidth": 4.0},
+        {"lines.linewidth": 5.0},
+        {"text.antialiased": False},
+        {"font.sans-serif": ["DejaVu Serif"]},
+    ],
+)
+def test_colorbar_fingerprint_rcparams(figure, colorbar, rc):
+    digest = colorbar.fingerprint()
+
+    with matplotlib.rc_context(rc):
+        assert colorbar.fingerprint() != digest
+
+    assert colorbar.fingerprint() == digest
+
+
+def test_colorbar_fingerprint_font_family(figure, colorbar):
+    colorbar.set_font_properties(FontProperties(family="serif"))
+    digest = colorbar.fingerprint()
+
+    with matplotlib.rc_context({"font.serif": ["DejaVu Sans"]}):
+        assert colorbar.fingerprint() != digest
+
+
+def test_colorbar_fingerprint_mappable(figure, colorbar):
+    digest = colorbar.fingerprint()
+
+    colorbar.mappable.set_clim(0, 100)
+    assert colorbar.fingerprint() != digest
+
+    colorbar.mappable.set_clim(1, 9)
+    assert colorbar.fingerprint() == digest
+
+    colorbar.mappable.set_cmap("magma")
+    assert colorbar.fingerprint() != digest
+
+
+def test_colorbar_fingerprint_unscaled(figure):
+    ax = figure.add_subplot("111")
+
+    colorbars = []
+    for vmax in [1.0, 1000.0]:
+        mappable = ScalarMappable()
+        mappable.set_array(np.linspace(0.0, vmax, 10))
+        colorbar = Colorbar(mappable)
+        ax.add_artist(colorbar)
+        colorbars.append(colorbar)
+
+    assert colorbars[0].fingerprint() is not None
+    assert colorbars[0].fingerprint() != colorbars[1].fingerprint()
+
+    colorbars[0].set_mappable(ScalarMappable())
+    assert colorbars[0].fingerprint() is None
+
+
+@pytest.fixture
+def disk_cache(tmpdir):
+    diskcache.set_cache_dir(str(tmpdir))
+    yield diskcache.get_cache()
+    diskcache.set_cache_dir(None)
+
+
+def test_colorbar_disk_cache(figure, colorbar, disk_cache):
+    colorbar.set_label("label")
+    figure.canvas.draw()
+    pixels = np.array(figure.canvas.buffer_rgba())
+    assert colorbar.get_geometry_stats()["computes"] == 1
+    assert disk_cache.get_stats()["writes"] == 3  # geometry, layout and raster
+
+    colorbar.remove()
+    other = Colorbar(colorbar.mappable, label="label")
+    figure.axes[0].add_artist(other)
+    figure.canvas.draw()
+
+    assert np.array_equal(np.array(figure.canvas.buffer_rgba()), pixels)
+    assert other.get_geometry_stats()["computes"] == 0
+    assert other.get_layout_stats()["builds"] == 0
+    assert disk_cache.get_stats()["hits"] == 2  # layout and raster
+
+    value = other.get_value_at(*colorbar._hit_cache["bar_extent"][2:])
+    assert value == pytest.approx(9.0, abs=0.1)
+    assert other._hit_cache["ticklabels"] == colorbar._hit_cache["ticklabels"]
+
+
+def test_colorbar_disk_cache_pixels(figure, colorbar, disk_cache):
+    colorbar.set_label("label")
+    figure.canvas.draw()
+    pixels = np.array(figure.canvas.buffer_rgba(), dtype=int)
+
+    diskcache.set_cache_dir(None)
+    figure.canvas.draw()
+    expected = np.array(figure.canvas.buffer_rgba(), dtype=int)
+
+    # Rendered separately, only antialiased pixels may differ slightly
+    assert np.abs(pixels - expected).max() <= 1
+
+
+@pytest.mark.parametrize(
+    "rc",
+    [
+        {"patch.linewidth": 4.0},
+        {"text.antialiased": False},
+        {"font.sans-serif": ["DejaVu Serif"]},
+    ],
+)
+def test_colorbar_disk_cache_rcparams(figure, colorbar, disk_cache, rc):
+    colorbar.set_label("label")
+    figure.canvas.draw()
+
+    with matplotlib.rc_context(rc):
+        colorbar.invalidate()
+        figure.canvas.draw()
+        pixels = np.array(figure.canvas.buffer_rgba(), dtype=int)
+
+        diskcache.set_cache_dir(None)
+        colorbar.invalidate()
+        figure.canvas.draw()
+        expected = np.array(figure.canvas.buffer_rgba(), dtype=int)
+
+    assert np.abs(pixels - expected).max() <= 1
+
+
+def test_colorbar_disk_cache_geometry(figure, colorbar, disk_cache):
+    figure.savefig(io.BytesIO(), format="svg")
+    assert colorbar.get_geometry_stats()["computes"] == 1
+    assert disk_cache.get_stats()["writes"] == 1  # no raster in vector formats
+
+    colorbar.invalidate()
+    figure.savefig(io.BytesIO(), format="svg")
+    assert colorbar.get_geometry_stats()["computes"] == 1
+
+
+def test_colorbar_shared_cache(figure, colorbar):
+    cache = sharedcache.SharedCache()
+    sharedcache.set_cache(cache)
+    try:
+        figure.canvas.draw()
+        pixels = np.array(figure.canvas.buffer_rgba())
+        assert colorbar.get_geometry_stats()["computes"] == 1
+
+        colorbar.remove()
+        other = Colorbar(colorbar.mappable)
+        figure.axes[0].add_artist(other)
+        figure.canvas.draw()
+
+        assert other.get_geometry_stats()["computes"] == 0
+        assert cache.get_stats()["hits"] == 1
+        assert np.array_equal(np.array(figure.canvas.buffer_rgba()), pixels)
+    finally:
+        sharedcache.set_cache(None)
+        cache.unlink()
+
+
+def test_colorbar_cache_unscaled(figure, disk_cache):
+    ax = figure.add_subplot("111")
+    cache = sharedcache.SharedCache()
+    sharedcache.set_cache(cache)
+    try:
+        mappable = ScalarMappable()
+        mappable.set_array(np.linspace(0.0, 1.0, 10))
+        colorbar = Colorbar(mappable)
+        ax.add_artist(colorbar)
+        assert not mappable.norm.scaled()
+        figure.canvas.draw()
+
+        assert colorbar.get_geometry_stats()["computes"] == 1
+        assert disk_cache.get_stats()["writes"] == 0
+        assert cache.get_stats()["writes"] == 0
+    finally:
+        sharedcache.set_cache(None)
+        cache.unlink()
+
+
+def test_colorbar_pickle(figure, colorbar):
+    colorbar.set_label("label")
+    figure.canvas.draw()
+    pixels = np.array(figure.canvas.buffer_rgba())
+
+    other_figure = pickle.loads(pickle.dumps(figure))
+    other = other_figure.axes[0].artists[0]
+    assert other.mappable is other_figure.axes[0].images[0]
+    assert other.get_geometry_stats()["computes"] == 0
+
+    other_figure.canvas.draw()
+    assert np.array_equal(np.array(other_figure.canvas.buffer_rgba()), pixels)
+
+    # Still invalidated by its mappable
+    other.mappable.set_clim(0, 100)
+    other_figure.canvas.draw()
+    assert other.get_geometry_stats()["computes"] == 2
+    plt.close(other_figure)
+
+
+def test_colorbar_pickle_mappable(figure):
+    data = np.random.RandomState(0).uniform(1.0, 5.0, (200, 200))
+    mappable = ScalarMappable(cmap="viridis")
+    mappable.set_array(data)
+    colorbar = Colorbar(mappable, label="label")
+
+    assert len(pickle.dumps(colorbar)) < data.nbytes / 10
+
+    other = pickle.loads(pickle.dumps(colorbar))
+    assert other.get_label() == "label"
+    assert other.mappable.get_cmap().name == "viridis"
+
+    figure.add_subplot("111").add_artist(other)
+    figure.canvas.draw()
+    assert other.mappable.norm.vmin == pytest.approx(data.min())
+    assert other.mappable.norm.vmax == pytest.approx(data.max())
+
+
+def test_colorbar_spec(colorbar):
+    assert colorbar._spec is DEFAULT_SPEC
+
+    colorbar.set_color("r")
+    assert colorbar._spec is not DEFAULT_SPEC
+    assert colorbar.get_color() == "r"
+    assert DEFAULT_SPEC.color is None
+
+    other = Colorbar(colorbar.mappable, location="lower left")
+    assert other._spec is not colorbar._spec
+    assert other.get_location() == 3
+    assert other.get_color() is None
+
+
+def test_colorbar_memory(colorbar):
+    count = 1000
+    Colorbar(colorbar.mappable)  # warm up
+
+    tracemalloc.start()
+    try:
+        before, _peak = tracemalloc.get_traced_memory()
+        colorbars = [Colorbar(colorbar.mappable) for _ in range(count)]
+        after, _peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert len(colorbars[0].__dict__) <= 30  # shared keys
+    assert (after - before) / count < 2000
+
+
 def test_colorbar_pad(colorbar):
     assert colorbar.get_pad() is None
     assert colorbar.pad is None
@@ -275,9 +735,7 @@ def test_colorbar_ticklabels(colorbar):
 
     colorbar.ticks = [0.0, 1.0]
     with pytest.raises(ValueError):
-        colorbar.set_ticklabels(
-            ["one label",]
-        )
+        colorbar.set_ticklabels(["one label"])
 
 
 def test_colorbar_ticklocation(colorbar):
@@ -321,6 +779,73 @@ def test_colorbar_ticklocation(colorbar):
         colorbar.set_ticklocation("top")
 
 
+def test_colorbar_numticks(colorbar):
+    font_properties = colorbar.get_font_properties()
+    ticks = np.linspace(0.0, 0.2, 11)
+    ticklabels = ["{:.1f}".format(tick) for tick in np.linspace(0.0, 1.0, 11)]
+    geometry = (None, None, ticks, ticklabels, "")
+
+    numticks = colorbar._calculate_numticks("vertical", 0.2, geometry, font_properties)
+    assert 2 <= numticks < 11
+
+    geometry = (None, None, ticks * 5.0, ticklabels, "")
+    numticks = colorbar._calculate_numticks("vertical", 1.0, geometry, font_properties)
+    assert numticks is None  # already fit
+
+    geometry = (None, None, ticks[::10], ticklabels[::10], "")  # 0.0 and 1.0
+    numticks = colorbar._calculate_numticks("vertical", 0.2, geometry, font_properties)
+    assert numticks is None
+
+
+def test_colorbar_numticks_draw(figure, colorbar):
+    colorbar.set_length_fraction(0.05)
+    figure.canvas.draw()
+    ticklabels = colorbar._geometry[1][3]
+    assert 2 <= len([label for label in ticklabels if label]) < 5
+
+    # Unchanged when the labels fit
+    colorbar.set_length_fraction(0.5)
+    figure.canvas.draw()
+    expected = colorbar._calculate_colorbar(0.5, colorbar.mappable)[3]
+    assert list(colorbar._geometry[1][3]) == list(expected)
+
+
+def test_colorbar_ticklabel_thinning(colorbar):
+    assert colorbar.get_ticklabel_thinning() is None
+    assert colorbar.ticklabel_thinning is None
+
+    colorbar.set_ticklabel_thinning(True)
+    assert colorbar.get_ticklabel_thinning()
+    assert colorbar.ticklabel_thinning
+
+    colorbar.ticklabel_thinning = False
+    assert not colorbar.get_ticklabel_thinning()
+    assert not colorbar.ticklabel_thinning
+
+
+def test_colorbar_ticklabel_thinning_draw(colorbar):
+    ticks = list(np.linspace(1.0, 9.0, 1000))
+    colorbar.set_ticks(ticks)
+    colorbar.set_ticklabels(["%.3f" % tick for tick in ticks])
+    colorbar.set_ticklabel_thinning(True)
+    plt.draw()
+
+    positions = np.linspace(0.0, 0.2, 1000)
+    ticklabels = colorbar._thin_ticklabels(
+        "vertical", positions, colorbar.ticklabels, "", colorbar.font_properties
+    )
+    assert 2 <= sum(1 for ticklabel in ticklabels if ticklabel) < 20
+
+
+def test_colorbar_ticklabel_thinning_blank(colorbar):
+    colorbar.set_ticks([2.0, 5.0, 8.0])
+    colorbar.set_ticklabels(["a", " ", ""])
+    colorbar.set_ticklabel_thinning(True)
+    plt.draw()
+
+    assert colorbar._hit_cache["ticklabels"][:2] == ["a", " "]
+
+
 def test_colorbar_set_visible(colorbar):
     colorbar.set_visible(False)
     plt.draw()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+""" """
+
+# Standard library modules.
+import os
+import threading
+
+# Third party modules.
+import numpy as np
+
+import pytest
+
+# Local modules.
+from matplotlib_colorbar.diskcache import DiskCache, set_cache_dir, get_cache
+
+# Globals and constants variables.
+
+
+@pytest.fixture
+def cache(tmpdir):
+    return DiskCache(str(tmpdir.join("cache")))
+
+
+def test_disk_cache_array(cache):
+    assert cache.get_array("a") is None
+
+    cache.set_array("a", np.arange(10))
+    array = cache.get_array("a")
+    assert isinstance(array, np.memmap)
+    assert not array.flags.writeable
+    assert np.array_equal(array, np.arange(10))
+
+    stats = cache.get_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["writes"] == 1
+    assert stats["size"] > 0
+
+
+def test_disk_cache_arrays(cache):
+    assert cache.get_arrays(("a", 1)) is None
+
+    cache.set_arrays(("a", 1), x=np.ones(3), label="text")
+    arrays = cache.get_arrays(("a", 1))
+    assert np.array_equal(arrays["x"], np.ones(3))
+    assert str(arrays["label"]) == "text"
+
+
+def test_disk_cache_persistent(cache):
+    cache.set_array("a", np.arange(10))
+
+    other = DiskCache(cache.dirpath)
+    assert np.array_equal(other.get_array("a"), np.arange(10))
+
+
+def test_disk_cache_eviction(cache):
+    array = np.zeros(1000)
+    for index, key in enumerate("abc"):
+        cache.set_array(key, array)
+        filepath = cache._get_path(key, ".npy")
+        os.utime(filepath, (index, index))  # distinct access times
+
+    cache.get_array("a")  # most recently used
+    cache.maxsize = 2 * os.path.getsize(filepath)
+    cache.evict()
+
+    assert cache.get_array("a") is not None
+    assert cache.get_array("b") is None
+    assert cache.get_array("c") is not None
+    assert cache.get_stats()["evictions"] == 1
+
+
+def test_disk_cache_concurrent_writes(cache):
+    errors = []
+
+    def _work(value):
+        for _ in range(20):
+            cache.set_array("a", np.full(10000, value))
+            array = cache.get_array("a")
+            if array is not None and len(set(np.unique(array))) != 1:
+                errors.append(array)
+
+    threads = [threading.Thread(target=_work, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert not [name for name in os.listdir(cache.dirpath) if name.endswith(".tmp")]
+
+
+def test_disk_cache_clear(cache):
+    cache.set_array("a", np.arange(10))
+    cache.clear()
+    assert cache.get_stats()["size"] == 0
+    assert cache.get_array("a") is None
+
+
+def test_set_cache_dir(tmpdir):
+    set_cache_dir(str(tmpdir))
+    try:
+        assert get_cache().dirpath == str(tmpdir)
+    finally:
+        set_cache_dir(None)
+    assert get_cache() is None
@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+""" """
+
+# Standard library modules.
+
+# Third party modules.
+import matplotlib.pyplot as plt
+from matplotlib.colors import (
+    Normalize,
+    LogNorm,
+    SymLogNorm,
+    PowerNorm,
+    BoundaryNorm,
+)
+
+import numpy as np
+
+import pytest
+
+# Local modules.
+from matplotlib_colorbar.colorbar import Colorbar
+from matplotlib_colorbar import colorbar as colorbar_module
+from matplotlib_colorbar.equivalence import compare, assert_equivalent
+
+# Globals and constants variables.
+NORMS = {
+    "linear": (lambda cmap: Normalize(), (0.0, 1.0)),
+    "log": (lambda cmap: LogNorm(), (1.0, 1e4)),
+    "symlog": (lambda cmap: SymLogNorm(linthresh=1.0), (-100.0, 100.0)),
+    "power": (lambda cmap: PowerNorm(gamma=0.5), (0.0, 50.0)),
+    "boundary": (
+        lambda cmap: BoundaryNorm(np.linspace(0.0, 1.0, cmap.N + 1), cmap.N),
+        (0.0, 1.0),
+    ),
+}
+
+
+def create_colorbar(figure, norm, cmap, orientation):
+    create_norm, (vmin, vmax) = NORMS[norm]
+    cmap = plt.get_cmap(*cmap)
+
+    ax = figure.add_subplot("111")
+    data = np.linspace(vmin, vmax, 100).reshape(10, 10)
+    mappable = ax.imshow(data, cmap=cmap, norm=create_norm(cmap))
+
+    colorbar = Colorbar(mappable, orientation=orientation, label="label")
+    ax.add_artist(colorbar)
+    return colorbar
+
+
+@pytest.mark.parametrize("orientation", ["vertical", "horizontal"])
+@pytest.mark.parametrize("cmap", [("viridis",), ("RdBu", 8)])
+@pytest.mark.parametrize("norm", sorted(NORMS))
+def test_equivalence(figure, colorbar_equivalence, norm, cmap, orientation):
+    colorbar = create_colorbar(figure, norm, cmap, orientation)
+    report = colorbar_equivalence(colorbar, repeat=1)
+
+    assert report.rms == 0.0
+    assert report.speedup > 0.0
+
+
+def test_equivalence_restores_fast_engines(figure):
+    colorbar = create_colorbar(figure, "log", ("viridis",), "vertical")
+    geometry = colorbar._calculate_geometry(
+        0.2, colorbar.mappable, None, None, "vertical", colorbar.font_properties
+    )
+    compare(colorbar, repeat=1)
+
+    assert not colorbar_module._use_reference()
+    assert colorbar._geometry[0][-1] is False  # drawn with the fast engines
+    assert colorbar._geometry[1][3] == geometry[3]
+
+
+def test_equivalence_ticklabels(figure, monkeypatch):
+    colorbar = create_colorbar(figure, "log", ("viridis",), "vertical")
+
+    def calculate_colorbar(*args):
+        result = list(calculate_colorbar_original(*args))
+        result[3] = ["x"] * len(result[3])
+        return result
+
+    calculate_colorbar_original = colorbar_module.calculate_colorbar
+    monkeypatch.setattr(colorbar_module, "calculate_colorbar", calculate_colorbar)
+
+    with pytest.raises(AssertionError, match="Tick labels differ"):
+        assert_equivalent(colorbar, repeat=1)
+
+
+def test_equivalence_pixels(figure, monkeypatch):
+    colorbar = create_colorbar(figure, "linear", ("viridis",), "vertical")
+
+    def calculate_colorbar(norm, *args):
+        result = list(calculate_colorbar_original(norm, *args))
+        result[1] = result[1][::-1]  # reversed colors
+        return result
+
+    calculate_colorbar_original = colorbar_module.calculate_colorbar
+    monkeypatch.setattr(colorbar_module, "calculate_colorbar", calculate_colorbar)
+
+    report = compare(colorbar, repeat=1)
+    assert report.rms > 0.0
+    assert report.errors == ["Pixels differ: RMS {:.3f} > 0.000".format(report.rms)]
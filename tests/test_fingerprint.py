@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+""" """
+
+# Standard library modules.
+import os
+import subprocess
+import sys
+
+# Third party modules.
+import matplotlib.pyplot as plt
+import matplotlib.colors
+
+import numpy as np
+
+import pytest
+
+# Local modules.
+from matplotlib_colorbar import fingerprint
+from matplotlib_colorbar.fingerprint import (
+    canonicalize,
+    hash_colormap,
+    hash_norm,
+    calculate_fingerprint,
+)
+
+# Globals and constants variables.
+
+SPEC = {"label": "x", "ticks": [0.0, 0.5, 1.0], "norm": ("LogNorm", (("vmin", 1),))}
+
+
+def test_canonicalize():
+    assert canonicalize([1, np.float32(0.5), (True, None, "a")]) == (
+        1,
+        0.5,
+        (True, None, "a"),
+    )
+    assert canonicalize({"b": 1, "a": np.int64(2)}) == (("a", 2), ("b", 1))
+
+
+def test_canonicalize_array():
+    value = canonicalize(np.arange(4.0))
+    assert value[:3] == ("array", "<f8", (4,))
+    assert canonicalize(np.arange(4.0)[::-1][::-1]) == value
+    assert canonicalize(np.arange(4)) != value
+
+
+def test_canonicalize_unsupported():
+    with pytest.raises(TypeError):
+        canonicalize(object())
+
+
+def test_hash_colormap():
+    cmap = matplotlib.colors.ListedColormap(["r", "g", "b"])
+    digest = hash_colormap(cmap)
+    assert hash_colormap(cmap) == digest
+    assert id(cmap) in fingerprint._colormap_hashes
+
+    assert hash_colormap(matplotlib.colors.ListedColormap(["r", "g", "b"])) == digest
+    assert hash_colormap(matplotlib.colors.ListedColormap(["r", "g", "k"])) != digest
+
+    cmap.set_under("k")
+    assert hash_colormap(cmap) != digest
+
+
+def test_hash_colormap_release():
+    cmap = matplotlib.colors.ListedColormap(["r", "g", "b"])
+    hash_colormap(cmap)
+    key = id(cmap)
+
+    del cmap
+    assert key not in fingerprint._colormap_hashes
+
+
+def test_hash_norm():
+    norm = matplotlib.colors.LogNorm(vmin=1.0, vmax=10.0)
+    assert hash_norm(norm) == hash_norm(matplotlib.colors.LogNorm(1.0, 10.0))
+    assert hash_norm(norm) != hash_norm(matplotlib.colors.LogNorm(1.0, 100.0))
+    assert hash_norm(norm) != hash_norm(matplotlib.colors.Normalize(1.0, 10.0))
+
+    norm = matplotlib.colors.BoundaryNorm([0, 1, 5], 2)
+    assert hash_norm(norm) != hash_norm(matplotlib.colors.BoundaryNorm([0, 2, 5], 2))
+
+
+def test_hash_norm_unscaled():
+    norm = matplotlib.colors.Normalize()
+    assert hash_norm(norm) is None
+    assert hash_norm(norm, np.array([0.0, 1.0])) == hash_norm(
+        matplotlib.colors.Normalize(0.0, 1.0)
+    )
+    assert hash_norm(norm, np.array([0.0, 1.0])) != hash_norm(
+        norm, np.array([0.0, 1000.0])
+    )
+    assert not norm.scaled()
+
+
+def test_calculate_fingerprint():
+    digest = calculate_fingerprint(SPEC)
+    assert len(digest) == 64
+    assert calculate_fingerprint(dict(SPEC)) == digest
+    assert calculate_fingerprint(dict(SPEC, label="y")) != digest
+
+
+def test_calculate_fingerprint_processes():
+    code = (
+        "from matplotlib_colorbar.fingerprint import calculate_fingerprint;"
+        "print(calculate_fingerprint({!r}))".format(SPEC)
+    )
+    env = dict(os.environ, PYTHONHASHSEED="1")
+    env["PYTHONPATH"] = os.pathsep.join(sys.path)
+    output = subprocess.check_output([sys.executable, "-c", code], env=env)
+
+    assert output.decode("ascii").strip() == calculate_fingerprint(SPEC)
@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+""" """
+
+# Standard library modules.
+
+# Third party modules.
+import matplotlib.colors
+from matplotlib.backend_bases import MouseEvent
+
+import numpy as np
+
+import pytest
+
+# Local modules.
+from matplotlib_colorbar.colorbar import Colorbar
+from matplotlib_colorbar.interactive import ClimDragger
+
+# Globals and constants variables.
+
+
+@pytest.fixture
+def colorbar(figure):
+    ax = figure.add_subplot("111")
+
+    data = np.linspace(0.0, 100.0, 10000).reshape(100, 100)
+    mappable = ax.imshow(data)
+
+    colorbar = Colorbar(mappable, length_fraction=0.8)
+    ax.add_artist(colorbar)
+
+    figure.canvas.draw()
+    return colorbar
+
+
+@pytest.fixture
+def dragger(colorbar):
+    dragger = ClimDragger(colorbar)
+    dragger.connect()
+
+    yield dragger
+
+    dragger.disconnect()
+
+
+def send(figure, name, x, y):  # coordinates are truncated to whole pixels
+    event = MouseEvent(name, figure.canvas, x, y, button=1)
+    figure.canvas.callbacks.process(name, event)
+
+
+def test_clim_dragger_vmax(figure, colorbar, dragger):
+    x0, y0, x1, y1 = colorbar._hit_cache["bar_extent"]
+    xm = (x0 + x1) / 2
+
+    send(figure, "button_press_event", xm, y1 - 1)
+    assert dragger.is_dragging()
+    send(figure, "motion_notify_event", xm, (y0 + y1) / 2)
+    send(figure, "button_release_event", xm, (y0 + y1) / 2)
+    assert not dragger.is_dragging()
+
+    vmin, vmax = colorbar.mappable.get_clim()
+    assert vmin == pytest.approx(0.0)
+    assert vmax == pytest.approx(50.0, abs=1.0)
+
+
+def test_clim_dragger_vmin(figure, colorbar, dragger):
+    x0, y0, x1, y1 = colorbar._hit_cache["bar_extent"]
+    xm = (x0 + x1) / 2
+
+    send(figure, "button_press_event", xm, y0 + 1)
+    send(figure, "button_release_event", xm, y0 + (y1 - y0) / 4)
+
+    vmin, vmax = colorbar.mappable.get_clim()
+    assert vmin == pytest.approx(25.0, abs=1.0)
+    assert vmax == pytest.approx(100.0)
+
+
+def test_clim_dragger_outside(figure, colorbar, dragger):
+    send(figure, "button_press_event", 1, 1)
+    assert not dragger.is_dragging()
+
+    send(figure, "button_release_event", 1, 1)
+    assert colorbar.mappable.get_clim() == pytest.approx((0.0, 100.0))
+    assert dragger.nupdates == 0
+
+
+def test_clim_dragger_debounce(figure, colorbar, dragger):
+    dragger._clock = lambda: 0.0  # all events within the same frame
+    x0, y0, x1, y1 = colorbar._hit_cache["bar_extent"]
+    xm = (x0 + x1) / 2
+
+    send(figure, "button_press_event", xm, y1 - 1)
+    for y in np.linspace(y1 - 2, (y0 + y1) / 2, 20):
+        send(figure, "motion_notify_event", xm, y)
+    assert dragger.nupdates == 1
+
+    send(figure, "button_release_event", xm, (y0 + y1) / 2)
+    assert dragger.nupdates == 2
+    assert colorbar.mappable.get_clim()[1] == pytest.approx(50.0, abs=1.0)
+
+
+def test_clim_dragger_restore(figure, colorbar, dragger):
+    x0, y0, x1, y1 = colorbar._hit_cache["bar_extent"]
+    xm = (x0 + x1) / 2
+
+    send(figure, "button_press_event", xm, y1 - 1)
+    assert not colorbar.mappable.get_visible()
+    assert colorbar.get_animated()
+
+    send(figure, "button_release_event", xm, y1 - 5)
+    assert colorbar.mappable.get_visible()
+    assert not colorbar.get_animated()
+
+
+@pytest.mark.parametrize(
+    "norm",
+    [
+        matplotlib.colors.LogNorm(1.0, 100.0),
+        matplotlib.colors.PowerNorm(0.5, 1.0, 100.0),
+        matplotlib.colors.SymLogNorm(10.0, vmin=1.0, vmax=100.0),
+    ],
+)
+def test_clim_dragger_norm(figure, norm):
+    ax = figure.add_subplot("111")
+
+    data = np.linspace(1.0, 100.0, 10000).reshape(100, 100)
+    mappable = ax.imshow(data, norm=norm)
+
+    colorbar = Colorbar(mappable, length_fraction=0.8)
+    ax.add_artist(colorbar)
+    figure.canvas.draw()
+
+    dragger = ClimDragger(colorbar)
+    dragger.connect()
+
+    x0, y0, x1, y1 = colorbar._hit_cache["bar_extent"]
+    xm = (x0 + x1) / 2
+    y = int(y0 + (y1 - y0) * 0.75)
+    expected = colorbar.get_value_at(xm, y)
+
+    send(figure, "button_press_event", xm, y1 - 1)
+    send(figure, "button_release_event", xm, y)
+    dragger.disconnect()
+
+    vmin, vmax = colorbar.mappable.get_clim()
+    assert vmin == pytest.approx(1.0)
+    assert vmax == pytest.approx(expected, rel=0.02)
@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+""" """
+
+# Standard library modules.
+
+# Third party modules.
+from matplotlib.offsetbox import AnchoredOffsetbox, AuxTransformBox, VPacker, HPacker
+from matplotlib.patches import Rectangle
+from matplotlib.transforms import IdentityTransform
+
+import numpy as np
+
+import pytest
+
+# Local modules.
+from matplotlib_colorbar.layout import (
+    calculate_layout,
+    calculate_occupancy,
+    find_best_location,
+)
+
+# Globals and constants variables.
+
+SIZES = [[(30.0, 120.0)], [(30.0, 120.0), (12.5, 47.0)], [(8.0, 5.0), (60.0, 11.0)]]
+
+
+@pytest.mark.parametrize("loc", range(1, 11))
+@pytest.mark.parametrize("vertical", [True, False])
+@pytest.mark.parametrize("sizes", SIZES)
+def test_calculate_layout(figure, loc, vertical, sizes):
+    ax = figure.add_subplot(111)
+    renderer = figure.canvas.get_renderer()
+
+    children = []
+    for width, height in sizes:
+        child = AuxTransformBox(IdentityTransform())
+        child.add_artist(Rectangle((0, 0), width, height))
+        children.append(child)
+
+    packer = VPacker if vertical else HPacker
+    child = packer(children=children, align="center", pad=0, sep=4)
+    box = AnchoredOffsetbox(loc=loc, pad=0.3, borderpad=0.5, child=child)
+    box.axes = ax
+    box.set_figure(figure)
+    box.draw(renderer)
+
+    fontsize = renderer.points_to_pixels(box.prop.get_size_in_points())
+    frame, corners = calculate_layout(
+        sizes,
+        vertical,
+        loc,
+        0.3 * fontsize,
+        0.5 * fontsize,
+        4 * renderer.points_to_pixels(1.0),
+        ax.bbox,
+    )
+
+    expected = box.get_window_extent(renderer)
+    assert frame.bounds == pytest.approx(expected.bounds)
+
+    for corner, child in zip(corners, children):
+        assert corner == pytest.approx(child.get_offset())
+
+
+def test_calculate_occupancy(figure):
+    ax = figure.add_subplot(111)
+    ax.plot([0.1, 0.2, 0.9], [0.1, 0.15, 0.9], "o")
+    ax.add_patch(Rectangle((0.05, 0.55), 0.4, 0.4))
+    ax.set_xlim(0, 1)
+    ax.set_ylim(0, 1)
+
+    occupancy = calculate_occupancy(ax, gridsize=4)
+
+    expected = np.zeros((4, 4))
+    expected[0, 0] += 2  # points
+    expected[3, 3] += 1  # point
+    expected[2:, :2] += 1  # patch
+    assert occupancy == pytest.approx(expected)
+
+
+def test_calculate_occupancy_image(figure):
+    ax = figure.add_subplot(111)
+    data = np.ma.masked_array(np.ones((4, 4)), mask=False)
+    data.mask[:2, :] = True  # top half, with origin upper
+    ax.imshow(data)
+
+    occupancy = calculate_occupancy(ax, gridsize=8)
+
+    assert occupancy[:4].sum() == 32
+    assert occupancy[4:].sum() == 0
+
+
+@pytest.mark.parametrize("vertical", [True, False])
+def test_find_best_location(figure, vertical):
+    ax = figure.add_subplot(111)
+    occupancy = np.ones((8, 8))
+
+    sizes = [(20.0, 40.0)]
+    assert find_best_location(sizes, vertical, 2, 2, 4, ax.bbox, occupancy) == 1
+
+    occupancy[:4, :4] = 0  # lower left
+    assert find_best_location(sizes, vertical, 2, 2, 4, ax.bbox, occupancy) == 3
+
+    occupancy[:] = 1
+    occupancy[:, 3:5] = 0  # center column
+    assert find_best_location(sizes, vertical, 2, 2, 4, ax.bbox, occupancy) == 8
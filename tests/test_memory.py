@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+""" """
+
+# Standard library modules.
+import gc
+import sys
+import tracemalloc
+import weakref
+
+# Third party modules.
+import matplotlib.colors
+from matplotlib.cm import ScalarMappable
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import RendererAgg
+
+import numpy as np
+
+import pytest
+
+# Local modules.
+from matplotlib_colorbar.colorbar import Colorbar
+
+# Globals and constants variables.
+
+
+def _render_figures(colorbars, renderer, data, start, stop, alive):
+    for index in range(start, stop):
+        colorbar = colorbars[index % len(colorbars)]
+
+        figure = Figure()
+        ax = figure.add_axes([0.0, 0.0, 1.0, 1.0])
+        mappable = ax.imshow(data.copy())
+        colorbar.set_mappable(mappable)
+        ax.add_artist(colorbar)
+        colorbar.draw(renderer)
+
+        # Closed, the colorbar being kept for later
+        colorbar.remove()
+        alive.add(mappable)
+
+
+@pytest.mark.parametrize("count", [200, pytest.param(10000, marks=pytest.mark.slow)])
+def test_weak_mappable_leak(count):
+    renderer = RendererAgg(200, 200, 72)
+    data = np.random.RandomState(0).uniform(0.0, 1.0, (64, 64))
+    colorbars = [Colorbar(weak_mappable=True, label="label") for _ in range(20)]
+    alive = weakref.WeakSet()
+
+    warmup = max(count // 10, 100)
+    _render_figures(colorbars, renderer, data, 0, warmup, alive)
+    gc.collect()
+    blocks = sys.getallocatedblocks()
+
+    _render_figures(colorbars, renderer, data, warmup, count, alive)
+    gc.collect()
+
+    assert len(alive) == 0
+    assert sys.getallocatedblocks() - blocks < 2000
+
+    # Still drawn from the norm and colormap of their last mappable
+    figure = Figure()
+    ax = figure.add_axes([0.0, 0.0, 1.0, 1.0])
+    ax.add_artist(colorbars[0])
+    colorbars[0].draw(renderer)
+    assert colorbars[0].get_geometry_stats()["computes"] == count // 20
+
+
+def test_strong_mappable():
+    renderer = RendererAgg(200, 200, 72)
+    data = np.zeros((4, 4))
+    colorbars = [Colorbar() for _ in range(2)]
+    alive = weakref.WeakSet()
+
+    _render_figures(colorbars, renderer, data, 0, 10, alive)
+    gc.collect()
+
+    assert len(alive) == 2
+
+
+@pytest.mark.parametrize(
+    "norm",
+    [
+        matplotlib.colors.Normalize(0.0, 1.0),
+        matplotlib.colors.BoundaryNorm([0, 1, 5], 2),
+    ],
+)
+def test_calculate_colorbar_dummy_references(norm):
+    mappable = ScalarMappable(norm=norm)
+    alive = weakref.WeakSet([mappable])
+    colorbar = Colorbar()
+
+    gc.disable()
+    try:
+        colorbar._calculate_colorbar_dummy(0.5, mappable)
+        assert mappable.colorbar is None
+        assert not mappable.callbacksSM.callbacks.get("changed")
+
+        del mappable
+        assert len(alive) == 0
+    finally:
+        gc.enable()
+
+
+class _CollectionCounter:
+    def __init__(self):
+        self.counts = [0, 0, 0]
+
+    def __call__(self, phase, info):
+        if phase == "start":
+            self.counts[info["generation"]] += 1
+
+
+@pytest.mark.parametrize("count", [1000, pytest.param(100000, marks=pytest.mark.slow)])
+def test_draw_memory(count):
+    figure = Figure()
+    ax = figure.add_axes([0.0, 0.0, 1.0, 1.0])
+    norm = matplotlib.colors.BoundaryNorm([0.0, 0.2, 0.5, 1.0], 256)
+    mappable = ax.imshow(np.random.RandomState(0).uniform(size=(8, 8)), norm=norm)
+    colorbar = Colorbar(mappable)
+    ax.add_artist(colorbar)
+    renderer = RendererAgg(200, 200, 72)
+
+    def draw(count):
+        for index in range(count):
+            if index % 10 == 0:  # from a dummy matplotlib colorbar
+                colorbar.invalidate()
+            colorbar.draw(renderer)
+
+    draw(100)
+    gc.collect()
+
+    counter = _CollectionCounter()
+    gc.callbacks.append(counter)
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        draw(count)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+        gc.callbacks.remove(counter)
+
+    assert colorbar.get_geometry_stats()["computes"] == (100 + count) // 10
+    assert peak - start < 4e6
+    assert sum(counter.counts) < count // 6
+    assert counter.counts[2] <= count // 1000
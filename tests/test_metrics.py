@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+""" """
+
+# Standard library modules.
+import logging
+
+# Third party modules.
+import numpy as np
+
+import pytest
+
+# Local modules.
+from matplotlib_colorbar.colorbar import Colorbar
+from matplotlib_colorbar import diskcache, metrics
+
+# Globals and constants variables.
+
+
+@pytest.fixture
+def colorbar(figure):
+    ax = figure.add_subplot("111")
+    mappable = ax.imshow(np.linspace(0.0, 1.0, 100).reshape(10, 10))
+
+    colorbar = Colorbar(mappable, label="label")
+    ax.add_artist(colorbar)
+    return colorbar
+
+
+@pytest.fixture(autouse=True)
+def cleared():
+    metrics.clear()
+    yield
+    metrics.set_slow_draw_hook(None)
+    metrics.clear()
+
+
+def test_metrics_counters(figure, colorbar):
+    figure.canvas.draw()
+    figure.canvas.draw()
+
+    colorbar.invalidate()
+    colorbar.invalidate()
+    figure.canvas.draw()
+
+    colorbar.set_label("other")
+    figure.canvas.draw()
+
+    values = metrics.get_metrics()
+    assert values["draws"] == 4
+    assert values["raster_hits"] == 0
+    assert values["geometry_misses"] == 2
+    assert values["geometry_hits"] == 2
+    assert values["artist_rebuilds"] == 3  # first draw, new geometry, new label
+    assert values["text_metric_misses"] == 3
+    assert values["text_metric_hits"] == 1
+    assert values["skipped_recomputes"] == 1
+    assert sum(values["draw_times"].values()) == 4
+
+
+def test_metrics_raster(figure, colorbar, tmpdir):
+    diskcache.set_cache_dir(str(tmpdir))
+    try:
+        figure.canvas.draw()
+        colorbar.invalidate()
+        figure.canvas.draw()
+    finally:
+        diskcache.set_cache_dir(None)
+
+    values = metrics.get_metrics()
+    assert values["draws"] == 2
+    assert values["raster_hits"] == 1
+    assert values["geometry_misses"] == 1
+
+
+def test_metrics_clear(figure, colorbar):
+    figure.canvas.draw()
+    metrics.clear()
+
+    values = metrics.get_metrics()
+    assert all(values[name] == 0 for name in metrics.COUNTERS)
+    assert not any(values["draw_times"].values())
+
+
+def test_metrics_histogram(figure):
+    metrics.record_draw(None, 0.0005)
+    metrics.record_draw(None, 0.001)
+    metrics.record_draw(None, 0.015)
+    metrics.record_draw(None, 10.0)
+
+    draw_times = metrics.get_metrics()["draw_times"]
+    assert list(draw_times) == list(metrics.DRAW_TIME_BUCKETS) + [float("inf")]
+    assert draw_times[0.001] == 2
+    assert draw_times[0.02] == 1
+    assert draw_times[float("inf")] == 1
+
+
+def test_slow_draw_hook(figure, colorbar):
+    slow = []
+    metrics.set_slow_draw_hook(0.0, lambda *args: slow.append(args))
+    figure.canvas.draw()
+
+    assert len(slow) == 1
+    assert slow[0][0] is colorbar
+    assert slow[0][1] > 0.0
+
+    metrics.set_slow_draw_hook(60.0, lambda *args: slow.append(args))
+    figure.canvas.draw()
+    assert len(slow) == 1
+
+
+def test_slow_draw_hook_logging(figure, colorbar, caplog):
+    metrics.set_slow_draw_hook(0.0)
+    with caplog.at_level(logging.WARNING, logger="matplotlib_colorbar.metrics"):
+        figure.canvas.draw()
+
+    assert len(caplog.records) == 1
+    assert "label" in caplog.records[0].getMessage()
+
+
+def test_slow_draw_hook_invalid():
+    with pytest.raises(ValueError):
+        metrics.set_slow_draw_hook(-1.0)
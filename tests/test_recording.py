@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+""" """
+
+# Standard library modules.
+import io
+
+# Third party modules.
+import matplotlib.pyplot as plt
+
+import numpy as np
+
+import pytest
+
+# Local modules.
+from matplotlib_colorbar.colorbar import Colorbar
+from matplotlib_colorbar.recording import RecordingRenderer
+from matplotlib_colorbar import diskcache
+
+# Globals and constants variables.
+
+
+def create_colorbar(figure, ncolors, **kwargs):
+    ax = figure.add_subplot("111")
+    cmap = plt.get_cmap("viridis", ncolors)
+    mappable = ax.imshow(np.linspace(0.0, 1.0, 100).reshape(10, 10), cmap=cmap)
+
+    colorbar = Colorbar(mappable, **kwargs)
+    ax.add_artist(colorbar)
+    return colorbar
+
+
+def record(colorbar, format):
+    # Only the primitives of the colorbar, not of the rest of the figure
+    recorders = []
+    draw = colorbar.draw
+
+    def recording_draw(renderer, *args, **kwargs):
+        with RecordingRenderer(renderer) as recorder:
+            draw(renderer, *args, **kwargs)
+        recorders.append(recorder)
+
+    colorbar.draw = recording_draw
+    try:
+        colorbar.figure.savefig(io.BytesIO(), format=format)
+    finally:
+        del colorbar.draw
+
+    return recorders[-1].get_stats()
+
+
+def test_recording_renderer_restore(figure):
+    renderer = figure.canvas.get_renderer()
+    draw_path = renderer.draw_path
+    draw_image = renderer.__dict__["draw_image"]  # bound by RendererAgg
+
+    with RecordingRenderer(renderer) as recorder:
+        assert renderer.draw_path != draw_path
+        figure.canvas.figure.patch.draw(renderer)
+
+    assert recorder.get_stats()["draw_path"] == 1
+    assert "draw_path" not in renderer.__dict__
+    assert renderer.__dict__["draw_image"] is draw_image
+
+
+@pytest.mark.parametrize("format", ["png", "pdf", "svg"])
+@pytest.mark.parametrize("ncolors", [8, 65536])
+@pytest.mark.parametrize("label", [None, "label"])
+def test_recording_vector(figure, format, ncolors, label):
+    colorbar = create_colorbar(figure, ncolors, label=label)
+    stats = record(colorbar, format)
+    nticklabels = len(colorbar._hit_cache["ticklabels"])
+
+    assert stats["draw_path"] <= 2  # frame and outline
+    assert stats["draw_path_collection"] <= 2  # colors and tick lines
+    assert stats["draw_image"] == 0
+    assert stats["draw_markers"] == 0
+    assert stats["draw_text"] <= nticklabels + 2  # offset string and label
+    assert stats["vertex_bytes"] <= ncolors * 5 * 16 + 2048
+
+
+def test_recording_frameon(figure):
+    colorbar = create_colorbar(figure, 256, frameon=False)
+    assert record(colorbar, "png")["draw_path"] <= 1
+
+
+def test_recording_raster(figure, tmpdir):
+    colorbar = create_colorbar(figure, 256, label="label")
+    diskcache.set_cache_dir(str(tmpdir))
+    try:
+        record(colorbar, "png")
+        colorbar.invalidate()
+        stats = record(colorbar, "png")
+    finally:
+        diskcache.set_cache_dir(None)
+
+    assert stats["draw_image"] == 1
+    assert stats["vertex_bytes"] == 0
+    assert sum(stats.values()) == 1
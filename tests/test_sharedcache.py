@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+""" """
+
+# Standard library modules.
+import multiprocessing
+import pickle
+
+# Third party modules.
+import numpy as np
+
+import pytest
+
+# Local modules.
+from matplotlib_colorbar.sharedcache import SharedCache, set_cache, get_cache
+
+# Globals and constants variables.
+
+
+@pytest.fixture
+def cache():
+    cache = SharedCache()
+    yield cache
+    cache.unlink()
+
+
+def _read(cache, queue):
+    arrays = cache.get_arrays("a")
+    queue.put({key: value.tolist() for key, value in arrays.items()})
+    cache.set_arrays("b", y=np.ones(3))
+
+
+def test_shared_cache_arrays(cache):
+    assert cache.get_arrays("a") is None
+
+    cache.set_arrays("a", x=np.arange(5.0), labels=np.array(["1", "10"]), s="off")
+    arrays = cache.get_arrays("a")
+    assert np.array_equal(arrays["x"], np.arange(5.0))
+    assert arrays["labels"].tolist() == ["1", "10"]
+    assert str(arrays["s"]) == "off"
+
+    assert cache.get_stats() == {"hits": 1, "misses": 1, "writes": 1, "size": 1}
+
+
+def test_shared_cache_views(cache):
+    cache.set_arrays("a", x=np.arange(5.0))
+    array = cache.get_arrays("a")["x"]
+
+    assert not array.flags.writeable
+    assert not array.flags.owndata
+    assert np.shares_memory(array, cache.get_arrays("a")["x"])
+
+
+def test_shared_cache_existing(cache):
+    cache.set_arrays("a", x=np.zeros(3))
+
+    other = SharedCache(cache.namespace)
+    other.set_arrays("a", x=np.ones(3))  # already stored
+    assert np.array_equal(other.get_arrays("a")["x"], np.zeros(3))
+    assert other.get_stats()["writes"] == 0
+
+
+def test_shared_cache_incomplete(cache):
+    cache.set_arrays("a", x=np.zeros(3))
+    cache._segments[cache._get_name("a")].buf[0] = 0  # being written
+
+    other = SharedCache(cache.namespace)
+    assert other.get_arrays("a") is None
+
+
+def test_shared_cache_close(cache):
+    cache.set_arrays("a", x=np.arange(3.0))
+    cache.set_arrays("b", y=np.ones(3))
+    array = cache.get_arrays("a")["x"]
+
+    cache.close()
+    assert cache.get_stats()["size"] == 1  # array still in use
+    assert np.array_equal(array, np.arange(3.0))
+
+    del array
+    cache.close()
+    assert cache.get_stats()["size"] == 0
+
+
+def test_shared_cache_pickle(cache):
+    cache.set_arrays("a", x=np.zeros(3))
+
+    other = pickle.loads(pickle.dumps(cache))
+    assert other.namespace == cache.namespace
+    assert np.array_equal(other.get_arrays("a")["x"], np.zeros(3))
+
+
+def test_shared_cache_processes(cache):
+    cache.set_arrays("a", x=np.arange(5.0))
+
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    process = context.Process(target=_read, args=(cache, queue))
+    process.start()
+    assert queue.get(timeout=60) == {"x": [0.0, 1.0, 2.0, 3.0, 4.0]}
+    process.join()
+
+    # Kept after the worker exits
+    assert np.array_equal(cache.get_arrays("b")["y"], np.ones(3))
+
+
+def test_shared_cache_unlink(cache):
+    cache.set_arrays("a", x=np.zeros(3))
+    cache.unlink()
+
+    assert SharedCache(cache.namespace).get_arrays("a") is None
+
+
+def test_set_cache(cache):
+    set_cache(cache)
+    try:
+        assert get_cache() is cache
+    finally:
+        set_cache(None)
+    assert get_cache() is None
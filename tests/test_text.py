@@ -0,0 +1,207 @@
+#!/usr/bin/env python
+""" """
+
+# Standard library modules.
+import io
+import os
+
+# Third party modules.
+import matplotlib.pyplot as plt
+from matplotlib.font_manager import FontProperties
+
+import numpy as np
+
+import pytest
+
+# Local modules.
+from matplotlib_colorbar import text
+
+# Globals and constants variables.
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    text.clear_cache()
+    yield
+    text.clear_cache()
+
+
+def test_estimate_text_extents():
+    font_properties = FontProperties(size=10)
+    widths, heights, descents = text.estimate_text_extents(
+        ["0.0", "0.5", "100.0"], font_properties
+    )
+
+    assert widths.shape == (3,)
+    assert widths[0] == pytest.approx(widths[1])
+    assert widths[2] > widths[0]
+    assert heights[0] > 0.0
+    assert descents[0] >= 0.0
+
+
+def test_estimate_text_extents_mathtext():
+    font_properties = FontProperties(size=10)
+    widths, heights, _descents = text.estimate_text_extents(
+        [r"$\mathdefault{10^{2}}$"], font_properties
+    )
+    assert widths[0] > 0.0
+    assert heights[0] > 0.0
+
+
+def test_estimate_text_extents_font_size():
+    widths_small, _, _ = text.estimate_text_extents(["0.5"], FontProperties(size=10))
+    widths_large, _, _ = text.estimate_text_extents(["0.5"], FontProperties(size=20))
+    assert widths_large[0] == pytest.approx(2 * widths_small[0], rel=1e-2)
+
+
+def test_estimate_text_extents_cache():
+    font_properties = FontProperties(size=10)
+    text.estimate_text_extents(["0.0", "0.5", "0.0"], font_properties)
+    text.estimate_text_extents(["0.0"], FontProperties(size=10))
+
+    stats = text.get_cache_stats()["estimates"]
+    assert stats["misses"] == 2
+    assert stats["hits"] == 1
+    assert stats["size"] == 2
+
+
+def test_estimate_text_extents_empty():
+    widths, heights, descents = text.estimate_text_extents([], FontProperties())
+    assert len(widths) == len(heights) == len(descents) == 0
+
+
+def test_cached_text(figure):
+    renderer = figure.canvas.get_renderer()
+
+    text1 = text.CachedText(0.1, 0.2, "0.5", figure=figure)
+    text2 = text.CachedText(0.6, 0.7, "0.5", figure=figure)
+    bbox1 = text1.get_window_extent(renderer)
+    bbox2 = text2.get_window_extent(renderer)
+
+    assert bbox1.width == pytest.approx(bbox2.width)
+    assert bbox1.height == pytest.approx(bbox2.height)
+    assert bbox1.x0 != pytest.approx(bbox2.x0)
+
+    stats = text.get_cache_stats()["layouts"]
+    assert stats["misses"] == 1
+    assert stats["hits"] == 1
+
+
+def test_cached_text_dpi(figure):
+    renderer = figure.canvas.get_renderer()
+    width = (
+        text.CachedText(0, 0, "0.5", figure=figure).get_window_extent(renderer).width
+    )
+
+    figure.set_dpi(figure.get_dpi() * 2)
+    renderer = figure.canvas.get_renderer()
+    width2 = (
+        text.CachedText(0, 0, "0.5", figure=figure).get_window_extent(renderer).width
+    )
+
+    assert width2 == pytest.approx(2 * width, rel=0.1)
+    assert text.get_cache_stats()["layouts"]["misses"] == 2
+
+
+def test_renderer_key(figure):
+    from matplotlib.backends.backend_pdf import RendererPdf
+    from matplotlib.backends.backend_svg import RendererSVG
+    from matplotlib.backends.backend_mixed import MixedModeRenderer
+
+    pdf = MixedModeRenderer(figure, 1, 1, 72, RendererPdf(None, 72, 1, 1))
+    svg = MixedModeRenderer(figure, 1, 1, 72, RendererSVG(1, 1, io.StringIO()))
+    assert text.renderer_key(pdf) != text.renderer_key(svg)
+
+    key = text.renderer_key(figure.canvas.get_renderer())
+    figure.set_dpi(figure.get_dpi() * 2)
+    assert text.renderer_key(figure.canvas.get_renderer()) != key
+
+
+def test_cached_text_rendering_mathtext(figure):
+    ax = figure.add_subplot(111)
+    ax.text(0.5, 0.5, r"$\alpha^2$")
+
+    with text.cached_text_rendering(figure.canvas.get_renderer()):
+        figure.canvas.draw()
+    stats = text.get_cache_stats()["mathtext"]
+    assert stats["misses"] > 0
+
+    figure.savefig(io.BytesIO(), format="png")
+    with text.cached_text_rendering(figure.canvas.get_renderer()):
+        figure.canvas.draw()
+    assert text.get_cache_stats()["mathtext"]["misses"] == stats["misses"]
+    assert text.get_cache_stats()["mathtext"]["hits"] > stats["hits"]
+
+
+def test_cached_text_rendering_mathtext_fontset(figure):
+    ax = figure.add_subplot(111)
+    ax.text(0.5, 0.5, r"$\beta^2$")
+
+    with text.cached_text_rendering(figure.canvas.get_renderer()):
+        figure.canvas.draw()
+    misses = text.get_cache_stats()["mathtext"]["misses"]
+
+    with plt.rc_context({"mathtext.fontset": "stix"}):
+        with text.cached_text_rendering(figure.canvas.get_renderer()):
+            figure.canvas.draw()
+    assert text.get_cache_stats()["mathtext"]["misses"] > misses
+
+
+def test_cached_text_rendering_restore(figure):
+    renderer = figure.canvas.get_renderer()
+    parser = renderer.mathtext_parser
+
+    with text.cached_text_rendering(renderer):
+        assert renderer.mathtext_parser is not parser
+
+    assert renderer.mathtext_parser is parser
+
+
+class DummyTexManager:
+    def __init__(self):
+        self.calls = 0
+
+    def get_font_config(self):
+        return "serif"
+
+    def get_custom_preamble(self):
+        return ""
+
+    def get_grey(self, tex, fontsize=None, dpi=None):
+        self.calls += 1
+        return np.full((2, 3), 0.5)
+
+
+def test_cached_tex_manager_disk(tmpdir):
+    text.set_tex_cache_dir(str(tmpdir))
+    try:
+        texmanager = DummyTexManager()
+        proxy = text._CachedTexManager(texmanager)
+
+        grey = proxy.get_grey("abc", 10, 72)
+        assert grey.shape == (2, 3)
+        assert texmanager.calls == 1
+        assert len(os.listdir(str(tmpdir))) == 1
+
+        proxy.get_grey("abc", 10, 72)
+        assert texmanager.calls == 1
+
+        text.clear_cache()
+        grey = proxy.get_grey("abc", 10, 72)
+        assert texmanager.calls == 1
+        assert grey == pytest.approx(np.full((2, 3), 0.5))
+    finally:
+        text.set_tex_cache_dir(None)
+
+
+def test_cached_text_rendering_nested(figure):
+    renderer = figure.canvas.get_renderer()
+    parser = renderer.mathtext_parser
+
+    with text.cached_text_rendering(renderer):
+        proxy = renderer.mathtext_parser
+        with text.cached_text_rendering(renderer):
+            assert renderer.mathtext_parser is proxy
+        assert renderer.mathtext_parser is proxy
+
+    assert renderer.mathtext_parser is parser
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+""" """
+
+# Standard library modules.
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Third party modules.
+import matplotlib.colors
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+import numpy as np
+
+import pytest
+
+# Local modules.
+from matplotlib_colorbar.cache import LRUCache
+from matplotlib_colorbar.colorbar import Colorbar
+from matplotlib_colorbar import text, ticker
+
+# Globals and constants variables.
+
+NORMS = [
+    lambda: matplotlib.colors.Normalize(),
+    lambda: matplotlib.colors.LogNorm(1.0, 1000.0),
+    lambda: matplotlib.colors.PowerNorm(0.5),
+    lambda: matplotlib.colors.BoundaryNorm([1, 10, 100, 500, 1000], 256),
+]
+
+
+def _render(index):
+    figure = Figure(figsize=(3, 2), dpi=72)
+    FigureCanvasAgg(figure)
+    ax = figure.add_subplot(111)
+
+    data = np.random.RandomState(index).uniform(1.0, 1000.0, (16, 16))
+    norm = NORMS[index % len(NORMS)]()
+    mappable = ax.imshow(data, norm=norm)
+    label = r"$\alpha_{}$".format(index % 3)
+    ax.add_artist(Colorbar(mappable, label=label, length_fraction=0.8))
+
+    figure.canvas.draw()
+    return np.array(figure.canvas.buffer_rgba())
+
+
+@pytest.fixture
+def switchinterval():
+    # Threads switched as often as possible
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+@pytest.mark.parametrize("nthreads", [2, 8])
+def test_concurrent_draw(switchinterval, nthreads):
+    count = 32
+    expected = [_render(index) for index in range(count)]
+
+    text.clear_cache()
+    ticker.clear_cache()
+    with ThreadPoolExecutor(nthreads) as executor:
+        pixels = list(executor.map(_render, range(count)))
+
+    for index in range(count):
+        assert np.array_equal(pixels[index], expected[index]), index
+
+
+def test_lru_cache_threads(switchinterval):
+    cache = LRUCache(maxsize=4)
+
+    def work(seed):
+        for index in range(10000):
+            key = (seed + index) % 16
+            if cache.get(key) is None:
+                cache.set(key, index)
+
+    threads = [threading.Thread(target=work, args=(seed,)) for seed in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = cache.get_stats()
+    assert stats["hits"] + stats["misses"] == 80000
+    assert stats["size"] == 4
@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+""" """
+
+# Standard library modules.
+
+# Third party modules.
+import matplotlib.colors
+import matplotlib.ticker
+
+import numpy as np
+
+import pytest
+
+# Local modules.
+from matplotlib_colorbar.colorbar import Colorbar
+from matplotlib_colorbar import ticker
+
+# Globals and constants variables.
+
+NORMS = [
+    lambda: matplotlib.colors.Normalize(vmin=0.0, vmax=1.0),
+    lambda: matplotlib.colors.Normalize(vmin=-3.5, vmax=1234.0),
+    lambda: matplotlib.colors.LogNorm(vmin=1e-3, vmax=1e4),
+    lambda: matplotlib.colors.LogNorm(vmin=2.0, vmax=30.0),
+    lambda: matplotlib.colors.SymLogNorm(1.0, vmin=-1e3, vmax=1e5, base=10),
+    lambda: matplotlib.colors.SymLogNorm(0.1, vmin=0.5, vmax=4.0, base=10),
+    lambda: matplotlib.colors.PowerNorm(0.5, vmin=0.0, vmax=1.0),
+    lambda: matplotlib.colors.PowerNorm(2.0, vmin=-1250.0, vmax=3700.0),
+]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    ticker.clear_cache()
+    yield
+    ticker.clear_cache()
+
+
+def _create_mappable(figure, norm):
+    ax = figure.add_subplot(111)
+    return ax.imshow(np.zeros((2, 2)), norm=norm)
+
+
+@pytest.mark.parametrize("create_norm", NORMS)
+@pytest.mark.parametrize(
+    "ticks,ticklabels",
+    [(None, None), ([1.0, 2.0, 3.0], None), ([1.0, 3.0], ["low", "high"])],
+)
+def test_calculate_colorbar(figure, create_norm, ticks, ticklabels):
+    mappable = _create_mappable(figure, create_norm())
+    colorbar = Colorbar(mappable)
+
+    expected = colorbar._calculate_colorbar_dummy(0.2, mappable, ticks, ticklabels)
+    actual = colorbar._calculate_colorbar(0.2, mappable, ticks, ticklabels)
+
+    np.testing.assert_array_equal(actual[0], expected[0])
+    np.testing.assert_array_equal(actual[1], expected[1])
+    np.testing.assert_array_equal(actual[2], expected[2])
+    assert actual[3] == list(expected[3])
+    assert actual[4] == expected[4]
+
+
+def test_calculate_colorbar_unsupported_norm():
+    norm = matplotlib.colors.BoundaryNorm([0.0, 0.5, 1.0], 256)
+    assert ticker.calculate_colorbar(norm, 256) is None
+
+
+def test_calculate_colorbar_unscaled_norm():
+    norm = matplotlib.colors.LogNorm()
+    assert ticker.calculate_colorbar(norm, 256) is None
+
+
+def test_calculate_colorbar_cache():
+    norm = matplotlib.colors.LogNorm(vmin=1e-3, vmax=1e4)
+    ticker.calculate_colorbar(norm, 256)
+    ticker.calculate_colorbar(matplotlib.colors.LogNorm(vmin=1e-3, vmax=1e4), 256)
+
+    stats = ticker.get_cache_stats()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 1
+
+    norm.vmax = 1e5
+    ticker.calculate_colorbar(norm, 256)
+    assert ticker.get_cache_stats()["misses"] == 2
+
+
+def test_log_tick_values():
+    ticks = ticker.log_tick_values(1e-3, 1e4)
+    np.testing.assert_allclose(ticks, 10.0 ** np.arange(-3, 5))
+
+
+def test_format_log_ticks():
+    labels = ticker.format_log_ticks([0.01, 1.0, 100.0], 0.01, 100.0)
+    assert labels == [
+        r"$\mathdefault{10^{-2}}$",
+        r"$\mathdefault{10^{0}}$",
+        r"$\mathdefault{10^{2}}$",
+    ]
+
+
+@pytest.mark.parametrize("create_norm", NORMS)
+def test_calculate_colorbar_numticks(figure, create_norm):
+    mappable = _create_mappable(figure, create_norm())
+    colorbar = Colorbar(mappable)
+
+    expected = colorbar._calculate_colorbar_dummy(0.2, mappable, numticks=3)
+    actual = colorbar._calculate_colorbar(0.2, mappable, numticks=3)
+
+    np.testing.assert_array_equal(actual[2], expected[2])
+    assert actual[3] == list(expected[3])
+
+
+def test_limit_locator():
+    locator = matplotlib.ticker.MaxNLocator(nbins="auto")
+    ticker.limit_locator(locator, 3)
+    assert len(locator.tick_values(0.0, 1.0)) <= 3
+
+    locator = matplotlib.ticker.LogLocator()
+    ticker.limit_locator(locator, 3)
+    ticks = locator.tick_values(1e-3, 1e4)
+    assert np.count_nonzero((ticks >= 1e-3) & (ticks <= 1e4)) <= 3
+
+
+def test_thin_ticks():
+    ticks, ticklabels = ticker.thin_ticks(
+        np.arange(6), ["0", "", "2", "3", "4", "5"], 3
+    )
+    np.testing.assert_array_equal(ticks, [0, 1, 3, 5])
+    assert ticklabels == ["0", "", "3", "5"]
+
+
+def test_thin_ticks_below_numticks():
+    ticks, ticklabels = ticker.thin_ticks(np.arange(3), ["0", "1", "2"], 3)
+    np.testing.assert_array_equal(ticks, [0, 1, 2])
+    assert ticklabels == ["0", "1", "2"]
+
+
+def test_find_visible_ticklabels():
+    visible = ticker.find_visible_ticklabels([0.0, 1.0, 2.0, 3.0, 4.0], [1.5] * 5)
+    np.testing.assert_array_equal(visible, [True, False, True, False, True])
+
+
+def test_find_visible_ticklabels_unsorted():
+    visible = ticker.find_visible_ticklabels([4.0, 0.0, 0.5, 2.0], [1.0] * 4)
+    np.testing.assert_array_equal(visible, [True, True, False, True])
+
+
+def test_find_visible_ticklabels_empty_size():
+    visible = ticker.find_visible_ticklabels([0.0, 5.0], [0.0, 0.0])
+    np.testing.assert_array_equal(visible, [True, True])
+
+    visible = ticker.find_visible_ticklabels([0.0, 0.0, 5.0], [0.0, 0.0, 1.0])
+    np.testing.assert_array_equal(visible, [True, True, True])
+
+
+def test_find_visible_ticklabels_many():
+    random = np.random.RandomState(0)
+    positions = random.uniform(0.0, 100.0, 5000)
+    sizes = random.uniform(0.5, 2.0, 5000)
+
+    visible = ticker.find_visible_ticklabels(positions, sizes)
+
+    order = np.argsort(positions[visible])
+    lows = (positions[visible] - sizes[visible] / 2)[order]
+    highs = (positions[visible] + sizes[visible] / 2)[order]
+    assert np.all(lows[1:] >= highs[:-1])
+    assert visible.sum() > 30
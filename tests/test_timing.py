@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+""" """
+
+# Standard library modules.
+import time
+
+# Third party modules.
+import numpy as np
+
+import pytest
+
+# Local modules.
+from matplotlib_colorbar.colorbar import Colorbar
+from matplotlib_colorbar import diskcache, timing
+
+# Globals and constants variables.
+
+
+@pytest.fixture
+def colorbar(figure):
+    ax = figure.add_subplot("111")
+    mappable = ax.imshow(np.linspace(0.0, 1.0, 100).reshape(10, 10))
+
+    colorbar = Colorbar(mappable, label="label")
+    ax.add_artist(colorbar)
+    return colorbar
+
+
+@pytest.fixture
+def enabled():
+    timing.get_registry().clear()
+    timing.enable()
+    yield
+    timing.disable()
+    timing.get_registry().clear()
+
+
+def test_timing_disabled(figure, colorbar):
+    figure.canvas.draw()
+    assert not timing.is_enabled()
+    assert colorbar._timings is None
+    assert timing.get_registry().get_stats()["draws"] == 0
+
+
+def test_timing(figure, colorbar, enabled):
+    start = time.perf_counter()
+    figure.canvas.draw()
+    figure.canvas.draw()
+    elapsed = time.perf_counter() - start
+
+    stats = colorbar.timings.get_stats()
+    assert stats["draws"] == 2
+    assert set(colorbar.timings.last) == set(timing.PHASES)
+    assert sum(stats[phase]["total"] for phase in timing.PHASES) < elapsed
+
+    for phase in timing.PHASES:
+        assert 0.0 <= stats[phase]["min"] <= stats[phase]["mean"]
+        assert stats[phase]["mean"] <= stats[phase]["max"]
+
+    # Geometry and artists cached at the second draw
+    first = stats["geometry"]["max"] + stats["segments"]["max"]
+    assert stats["geometry"]["min"] + stats["segments"]["min"] < first
+
+    assert timing.get_registry().get_stats() == stats
+
+
+def test_timing_registry(figure, colorbar, enabled):
+    other = Colorbar(colorbar.mappable, location="lower left")
+    figure.axes[0].add_artist(other)
+    figure.canvas.draw()
+
+    assert colorbar.timings.get_stats()["draws"] == 1
+    assert other.timings.get_stats()["draws"] == 1
+    assert timing.get_registry().get_stats()["draws"] == 2
+
+    timing.disable()
+    figure.canvas.draw()
+    assert timing.get_registry().get_stats()["draws"] == 2
+
+
+def test_timing_cached_raster(figure, colorbar, enabled, tmpdir):
+    diskcache.set_cache_dir(str(tmpdir))
+    try:
+        figure.canvas.draw()
+        colorbar.invalidate()
+        figure.canvas.draw()
+    finally:
+        diskcache.set_cache_dir(None)
+
+    last = colorbar.timings.last
+    assert last["render"] > 0.0
+    assert last["geometry"] == last["segments"] == last["layout"] == 0.0